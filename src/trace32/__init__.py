@@ -8,9 +8,20 @@
 """
 from . import errors as T32Error
 
-from ._trace32 import DeviceType, T32
+from ._async import AsyncT32
+from ._broker import BrokerStats, RequestBroker
+from ._cache import BreakpointCache, MemoryCache, RegisterCache
+from ._fdx import FdxChannel, FdxStats
+from ._fleet import Fleet, FleetResult
+from ._image import Image, ImageRegion
+from ._notify import NotificationDispatcher
+from ._remote import RemoteApi
+from ._session import T32Session
+from ._simulator import PowerViewSimulator
+from ._symbols import SymbolCache, SymbolTable
+from ._trace32 import Breakpoint, BreakpointImpl, BreakpointType, BufferSyncStatus, BundleEntry, DeviceType, NotifyEvent, RegisterSet, T32, TraceField, TraceState, TransferStats, WaitResult
 
-__all__ = ['DeviceType', 'T32', 'T32Error']
+__all__ = ['AsyncT32', 'Breakpoint', 'BreakpointCache', 'BreakpointImpl', 'BreakpointType', 'BrokerStats', 'BufferSyncStatus', 'BundleEntry', 'DeviceType', 'FdxChannel', 'FdxStats', 'Fleet', 'FleetResult', 'Image', 'ImageRegion', 'MemoryCache', 'NotificationDispatcher', 'NotifyEvent', 'PowerViewSimulator', 'RegisterCache', 'RegisterSet', 'RemoteApi', 'RequestBroker', 'SymbolCache', 'SymbolTable', 'T32', 'T32Error', 'T32Session', 'TraceField', 'TraceState', 'TransferStats', 'WaitResult']
 
 
 
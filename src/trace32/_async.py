@@ -0,0 +1,147 @@
+"""
+@文件: _async.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: asyncio 客户端, 在专用 I/O 线程上串行执行 T32 调用, 不阻塞事件循环
+@许可: MIT License
+@版本: Version 1.0
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable
+
+from ._trace32 import T32
+
+# 区分 "未指定超时" 与 "不超时 (None)"
+_DEFAULT = object()
+
+
+def _awaitable(func: Callable) -> Callable:
+    """把 T32 的同步函数包装为在 I/O 线程上执行的协程方法, 额外接受关键字参数 timeout"""
+
+    @functools.wraps(func)
+    async def method(self, *args, timeout=_DEFAULT, **kwargs):
+        return await self.call(func, *args, timeout=timeout, **kwargs)
+
+    return method
+
+
+def _async_iterator(func: Callable) -> Callable:
+    """把 T32 的生成器函数包装为异步迭代器, 每一步都在 I/O 线程上执行"""
+
+    @functools.wraps(func)
+    def method(self, *args, timeout=_DEFAULT, **kwargs) -> AsyncIterator:
+        return self._iterate(func, args, kwargs, timeout)
+
+    return method
+
+
+class AsyncT32:
+    """
+    T32 的 asyncio 版本
+
+    所有调用提交到一个专用的 I/O 线程上按提交顺序串行执行, 任意多个协程可以同时排队而不阻塞事件循环。
+    每个方法都接受关键字参数 timeout (秒, None 表示不超时, 默认为构造时的 timeout), 超时抛出 TimeoutError。
+
+    取消或超时的调用如果尚未开始执行, 会从队列中移除; 已经开始的调用无法中断 (UDP 往返会继续完成),
+    其结果被丢弃。同一进程中不应再在其他线程直接调用 T32 的函数。
+
+    :param timeout: 默认的单次调用超时时间, 单位秒
+    """
+
+    def __init__(self, timeout: float = None):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncT32")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """停止 I/O 线程, 尚未开始的调用被取消"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def call(self, func: Callable, *args, timeout=_DEFAULT, **kwargs):
+        """
+        在 I/O 线程上执行任意函数并等待结果
+
+        :param func: 要执行的函数, 如 T32.read_pp
+        :param args: 位置参数
+        :param timeout: 超时时间, 单位秒
+        :param kwargs: 关键字参数
+        :return: 函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        return await asyncio.wait_for(future, self.timeout if timeout is _DEFAULT else timeout)
+
+    async def _iterate(self, func: Callable, args: tuple, kwargs: dict, timeout) -> AsyncIterator:
+        iterator = await self.call(func, *args, timeout=timeout, **kwargs)
+        end = object()
+        try:
+            while (item := await self.call(next, iterator, end, timeout=timeout)) is not end:
+                yield item
+        finally:
+            # 生成器也只能在 I/O 线程上关闭; 不等待结果, 以免在取消时阻塞
+            try:
+                self._executor.submit(getattr(iterator, "close", lambda: None))
+            except RuntimeError:
+                # 客户端已关闭, I/O 线程不再接受任务, 生成器在被回收时关闭
+                pass
+
+    # --------------------------------------------------------------------------
+    # note 基础与执行控制
+    # --------------------------------------------------------------------------
+    init = _awaitable(T32.init)
+    exit = _awaitable(T32.exit)
+    ping = _awaitable(T32.ping)
+    nop = _awaitable(T32.nop)
+    cmd = _awaitable(T32.cmd)
+    cmd_f = _awaitable(T32.cmd_f)
+    stop = _awaitable(T32.stop)
+    get_practice_state = _awaitable(T32.get_practice_state)
+    eval_get = _awaitable(T32.eval_get)
+    eval_get_string = _awaitable(T32.eval_get_string)
+    get_message = _awaitable(T32.get_message)
+    go = _awaitable(T32.go)
+    break_target = _awaitable(T32.break_target)
+    step = _awaitable(T32.step)
+    reset_cpu = _awaitable(T32.reset_cpu)
+    get_cpu_info = _awaitable(T32.get_cpu_info)
+    get_state = _awaitable(T32.get_state)
+    read_pp = _awaitable(T32.read_pp)
+    read_registers = _awaitable(T32.read_registers)
+    write_registers = _awaitable(T32.write_registers)
+    set_breakpoints = _awaitable(T32.set_breakpoints)
+    clear_breakpoints = _awaitable(T32.clear_breakpoints)
+    list_breakpoints = _awaitable(T32.list_breakpoints)
+
+    # --------------------------------------------------------------------------
+    # note 内存与变量
+    # --------------------------------------------------------------------------
+    read_memory = _awaitable(T32.read_memory)
+    read_memory_into = _awaitable(T32.read_memory_into)
+    write_memory = _awaitable(T32.write_memory)
+    write_memory_buffer = _awaitable(T32.write_memory_buffer)
+    dump_memory = _awaitable(T32.dump_memory)
+    checksum_memory = _awaitable(T32.checksum_memory)
+    read_memory_bundle = _awaitable(T32.read_memory_bundle)
+    write_memory_bundle = _awaitable(T32.write_memory_bundle)
+    read_variable_value = _awaitable(T32.read_variable_value)
+    read_variable_string = _awaitable(T32.read_variable_string)
+    write_variable_value = _awaitable(T32.write_variable_value)
+    read_variables = _awaitable(T32.read_variables)
+    write_variables = _awaitable(T32.write_variables)
+
+    # --------------------------------------------------------------------------
+    # note 符号与窗口
+    # --------------------------------------------------------------------------
+    get_symbol = _awaitable(T32.get_symbol)
+    lookup_symbol = _awaitable(T32.lookup_symbol)
+    symbolize = _awaitable(T32.symbolize)
+    get_window_content = _awaitable(T32.get_window_content)
+    iter_window_content = _async_iterator(T32.iter_window_content)
+    iter_window_rows = _async_iterator(T32.iter_window_rows)
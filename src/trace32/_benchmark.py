@@ -0,0 +1,190 @@
+"""
+@文件: _benchmark.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: Remote API 调用延迟与吞吐量的基准测试 (t32-bench)
+@许可: MIT License
+@版本: Version 1.0
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+from . import _trace32
+from ._simulator import PowerViewSimulator
+from ._trace32 import T32
+
+NOP_EX_LENGTHS = (0, 16, 128, 252, 1024, 4096)
+MEMORY_BLOCK_SIZES = (4, 64, 256, 1024, 2048, 8192, 65536)
+
+BENCH_ADDRESS = 0x1000
+BENCH_SYMBOL = "bench_counter"
+BENCH_WINDOW = "Register.view"
+
+
+class _NullBackend:
+    """所有函数立即返回 0 的后端, 用于测量 python 端封装 (ctypes 转换, 错误映射) 的开销"""
+
+    def __getattr__(self, name):
+        return lambda *args: 0
+
+
+def _measure(func, iterations: int, warmup: int) -> list[int]:
+    """执行 func 并返回每次调用的耗时, 单位纳秒"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    return samples
+
+
+def _summary(samples: list[int]) -> dict:
+    samples = sorted(samples)
+    return {
+        "mean_us": statistics.fmean(samples) / 1000,
+        "median_us": statistics.median(samples) / 1000,
+        "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))] / 1000,
+        "min_us": samples[0] / 1000,
+        "max_us": samples[-1] / 1000,
+        "stdev_us": statistics.pstdev(samples) / 1000,
+    }
+
+
+def _cases(packlen: int):
+    """
+    生成基准测试用例
+
+    :return: (名称, 参数, 每次调用传输的字节数, 调用函数) 的序列
+    """
+    yield "nop", {}, 0, T32.nop
+    for length in NOP_EX_LENGTHS:
+        yield "nop_ex", {"length": length}, length, lambda n=length: T32.nop_ex(n, 0)
+    for size in MEMORY_BLOCK_SIZES:
+        yield "read_memory", {"size": size}, size, lambda n=size: T32.read_memory(BENCH_ADDRESS, 0, n)
+    into = bytearray(max(MEMORY_BLOCK_SIZES))
+    for size in MEMORY_BLOCK_SIZES:
+        view = memoryview(into)[:size]
+        yield "read_memory_into", {"size": size}, size, lambda v=view: T32.read_memory_into(BENCH_ADDRESS, 0, v)
+    for size in MEMORY_BLOCK_SIZES:
+        content = b"\xa5" * size
+        yield "write_memory", {"size": size}, size, lambda c=content: T32.write_memory(BENCH_ADDRESS, 0, c)
+    yield "read_variable_value", {"symbol": BENCH_SYMBOL}, 8, lambda: T32.read_variable_value(BENCH_SYMBOL)
+    yield "cmd", {"command": "PRINT"}, 0, lambda: T32.cmd("PRINT")
+    yield "get_symbol", {"symbol": BENCH_SYMBOL}, 12, lambda: T32.get_symbol(BENCH_SYMBOL)
+
+    try:
+        window_bytes = len(T32.get_window_content(BENCH_WINDOW, "csv", packlen).encode("GBK"))
+    except Exception:
+        window_bytes = 0
+    yield "get_window_content", {"command": BENCH_WINDOW, "chunk": packlen}, window_bytes, \
+        lambda: T32.get_window_content(BENCH_WINDOW, "csv", packlen)
+
+
+def run_benchmarks(iterations: int = 200, warmup: int = 20, packlen: int = 1024, overhead: bool = True) -> list[dict]:
+    """
+    对当前连接执行所有基准测试
+
+    :param iterations: 每个用例的调用次数
+    :param warmup: 每个用例正式计时前的预热次数
+    :param packlen: get_window_content 每次读取的字节数
+    :param overhead: 是否额外测量 python 端的封装开销, 并从总耗时中分离出传输耗时
+    :return: 每个用例的结果
+    """
+    results = []
+    for name, params, nbytes, func in _cases(packlen):
+        result = {"name": name, "params": params, "iterations": iterations, "bytes": nbytes}
+        try:
+            result |= _summary(_measure(func, iterations, warmup))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            results.append(result)
+            continue
+        if nbytes:
+            result["bytes_per_sec"] = nbytes / (result["mean_us"] / 1e6)
+        results.append(result)
+
+    if overhead:
+        backend = _trace32.__t32__
+        T32.set_backend(_NullBackend())
+        try:
+            for result, (_, _, _, func) in zip(results, _cases(packlen)):
+                if "error" in result:
+                    continue
+                result["overhead_us"] = statistics.median(_measure(func, iterations, warmup)) / 1000
+                result["wire_us"] = max(result["median_us"] - result["overhead_us"], 0.0)
+        finally:
+            T32.set_backend(backend)
+    return results
+
+
+def _prepare_simulator(sim: PowerViewSimulator, packlen: int) -> None:
+    sim.add_symbol(BENCH_SYMBOL, 0x20000000, 4, 0x12345678)
+    sim.add_window(BENCH_WINDOW, "\n".join(f"R{i},{i:#010x}" for i in range(packlen // 4)))
+
+
+def main(argv: list[str] = None) -> int:
+    """t32-bench 命令行入口"""
+    parser = argparse.ArgumentParser(prog="t32-bench", description="TRACE32 Remote API latency/throughput benchmark")
+    parser.add_argument("--node", default="localhost", help="PowerView host (default: localhost)")
+    parser.add_argument("--port", type=int, default=20000, help="PowerView Remote API port (default: 20000)")
+    parser.add_argument("--packlen", type=int, default=1024, help="window content chunk size")
+    parser.add_argument("--backend", choices=("auto", "dll", "python"), default="auto")
+    parser.add_argument("--simulator", action="store_true", help="benchmark against a local PowerView simulator")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulator latency per reply in seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulator packet loss probability")
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--no-overhead", action="store_true", help="skip measuring python-side overhead")
+    parser.add_argument("-o", "--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    T32.set_backend(args.backend)
+    sim = None
+    if args.simulator:
+        sim = PowerViewSimulator(latency=args.latency, loss=args.loss).start()
+        _prepare_simulator(sim, args.packlen)
+        args.node, args.port = sim.host, sim.port
+
+    try:
+        T32.config("NODE", args.node)
+        T32.config("PORT", str(args.port))
+        T32.init()
+        try:
+            results = run_benchmarks(args.iterations, args.warmup, args.packlen, not args.no_overhead)
+        finally:
+            T32.exit()
+    finally:
+        if sim is not None:
+            sim.stop()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "backend": T32.get_backend(),
+            "target": "simulator" if sim else f"{args.node}:{args.port}",
+            "simulator": {"latency": args.latency, "loss": args.loss} if sim else None,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+@文件: _broker.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 请求代理, 由单个 I/O 线程独占连接, 合并并发的读请求
+@许可: MIT License
+@版本: Version 1.0
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable
+
+from ._remote import EMU_CBMAXDATASIZE
+from ._trace32 import T32
+from .errors import T32TransferMemoryBundleObjTransferFailedError
+
+# 内存包中单个区域的上限, 留出报文头和参数的空间
+_BUNDLE_REGION_LIMIT = EMU_CBMAXDATASIZE - 64
+
+# 请求类型
+_CALL, _MEMORY, _VARIABLE = range(3)
+
+
+@dataclass
+class BrokerStats:
+    """
+    请求代理的统计信息
+
+    :param requests: 收到的请求数
+    :param transfers: 实际调用 T32 的次数
+    :param batches: I/O 线程处理的批次数
+    """
+    requests: int = 0
+    transfers: int = 0
+    batches: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """被合并掉的请求数"""
+        return self.requests - self.transfers
+
+
+class RequestBroker:
+    """
+    线程安全的请求代理
+
+    Remote API 的请求缓冲区和报文序号是全局的, 多个线程同时调用 T32 会互相破坏报文。RequestBroker 在一个专用的
+    I/O 线程上独占连接, 任意线程通过队列提交请求并等待结果。
+
+    I/O 线程每次取出队列中积压的全部请求 (以及 window 秒内新到达的请求) 作为一批处理: 批中连续的读请求会被合并,
+
+    - read_memory: 相同访问类型下重叠或相邻的区域合并为一次读取, 多个不相连的区域通过一次内存包传输读取
+    - read_variable_value: 同名变量只读取一次
+
+    然后按区间把结果分发给每个等待者。其他调用 (写内存, 命令等) 按提交顺序执行, 读请求不会越过它们被合并,
+    因此每个线程看到的读写顺序与提交顺序一致。
+
+    :param window: 收到第一个请求后额外等待合并的时间, 单位秒; 为 0 时只合并 I/O 期间积压的请求
+    """
+
+    def __init__(self, window: float = 0.0):
+        self.window = window
+        self.stats = BrokerStats()
+        self._queue = queue.SimpleQueue()
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="RequestBroker", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """处理完已提交的请求后停止 I/O 线程"""
+        if self._running:
+            self._running = False
+            self._queue.put(None)
+            self._thread.join()
+
+    # --------------------------------------------------------------------------
+    # note 提交请求
+    # --------------------------------------------------------------------------
+    def _submit(self, kind: int, key: tuple) -> Future:
+        if not self._running:
+            raise RuntimeError("RequestBroker 已关闭")
+        future = Future()
+        self._queue.put((kind, key, future))
+        return future
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        在 I/O 线程上执行任意函数
+
+        :param func: 要执行的函数, 如 T32.write_memory
+        :return: 函数返回值的 Future
+        """
+        return self._submit(_CALL, (func, args, kwargs))
+
+    def call(self, func: Callable, *args, timeout: float = None, **kwargs):
+        """在 I/O 线程上执行任意函数并等待结果"""
+        return self.submit(func, *args, **kwargs).result(timeout)
+
+    def submit_read_memory(self, address: int, access: int, size: int) -> Future:
+        """read_memory 的异步版本, 返回 bytes 的 Future"""
+        return self._submit(_MEMORY, (access, address, size))
+
+    def read_memory(self, address: int, access: int, size: int, timeout: float = None) -> bytes:
+        """
+        读取内存, 与其他线程同时发出的重叠或相邻的读取合并
+
+        :param address: 字节地址
+        :param access: 访问类型
+        :param size: 要读取的字节数
+        :param timeout: 最长等待时间, 单位秒
+        :return: 读取的字节数据
+        """
+        return self.submit_read_memory(address, access, size).result(timeout)
+
+    def submit_read_variable_value(self, symbol: str) -> Future:
+        """read_variable_value 的异步版本, 返回整数值的 Future"""
+        return self._submit(_VARIABLE, (symbol,))
+
+    def read_variable_value(self, symbol: str, timeout: float = None) -> int:
+        """
+        读取变量的整数值, 与其他线程同时发出的同名读取合并
+
+        :param symbol: 符号名
+        :param timeout: 最长等待时间, 单位秒
+        :return: 变量的整数值
+        """
+        return self.submit_read_variable_value(symbol).result(timeout)
+
+    # --------------------------------------------------------------------------
+    # note I/O 线程
+    # --------------------------------------------------------------------------
+    def _collect(self) -> list:
+        """阻塞等待第一个请求, 然后取出积压的请求和 window 内到达的请求"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while batch[-1] is not None:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _serve(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = self._collect()
+            if batch[-1] is None:
+                batch.pop()
+                stopping = True
+            # 丢弃已被取消的请求
+            batch = [request for request in batch if request[2].set_running_or_notify_cancel()]
+            self.stats.requests += len(batch)
+            self.stats.batches += 1
+
+            # 按顺序切分: 连续的读请求合并处理, 其他调用单独执行
+            run = []
+            for request in batch:
+                if request[0] == _CALL:
+                    self._flush(run)
+                    run = []
+                    self._execute(request)
+                else:
+                    run.append(request)
+            self._flush(run)
+
+    def _execute(self, request: tuple) -> None:
+        _, (func, args, kwargs), future = request
+        self.stats.transfers += 1
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _flush(self, run: list) -> None:
+        variables, memory = {}, {}
+        for kind, key, future in run:
+            if kind == _VARIABLE:
+                variables.setdefault(key[0], []).append(future)
+            else:
+                access, address, size = key
+                memory.setdefault(access, []).append((address, size, future))
+
+        for symbol, futures in variables.items():
+            self.stats.transfers += 1
+            try:
+                value = T32.read_variable_value(symbol)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future in futures:
+                    future.set_result(value)
+
+        for access, reads in memory.items():
+            self._read_spans(access, self._merge(reads))
+
+    @staticmethod
+    def _merge(reads: list) -> list:
+        """把读请求按地址合并为互不相连的区间 [起始, 结束, [(地址, 长度, Future)]]"""
+        spans = []
+        for address, size, future in sorted(reads, key=lambda read: read[0]):
+            if spans and address <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], address + size)
+                spans[-1][2].append((address, size, future))
+            else:
+                spans.append([address, address + size, [(address, size, future)]])
+        return spans
+
+    def _read_spans(self, access: int, spans: list) -> None:
+        # 多个不相连的小区间通过一次内存包传输读取; 内存包只支持访问类型字符串, 因此仅用于默认访问类型
+        if access == 0 and len(spans) > 1 and all(end - start <= _BUNDLE_REGION_LIMIT for start, end, _ in spans):
+            try:
+                entries = T32.read_memory_bundle([(start, end - start) for start, end, _ in spans])
+            except Exception as e:
+                entries = [e] * len(spans)
+            self.stats.transfers += 1
+        else:
+            entries = []
+            for start, end, _ in spans:
+                try:
+                    entries.append(T32.read_memory(start, access, end - start))
+                except Exception as e:
+                    entries.append(e)
+                self.stats.transfers += 1
+
+        for (start, end, reads), entry in zip(spans, entries):
+            if not isinstance(entry, (bytes, Exception)):
+                entry = entry.data if entry.ok else T32TransferMemoryBundleObjTransferFailedError(
+                    f"读取 {start:#x}-{end:#x} 失败"
+                )
+            if isinstance(entry, Exception) and len(reads) > 1:
+                # 合并后的区间可能包含某个请求相邻的不可访问区域, 逐个重试以免牵连其他请求
+                self._read_each(access, reads)
+                continue
+            for address, size, future in reads:
+                if isinstance(entry, Exception):
+                    future.set_exception(entry)
+                else:
+                    future.set_result(entry[address - start:address - start + size])
+
+    def _read_each(self, access: int, reads: list) -> None:
+        """逐个执行读请求并分发结果"""
+        for address, size, future in reads:
+            self.stats.transfers += 1
+            try:
+                future.set_result(T32.read_memory(address, access, size))
+            except Exception as e:
+                future.set_exception(e)
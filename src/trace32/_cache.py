@@ -0,0 +1,385 @@
+"""
+@文件: _cache.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 目标状态的本地缓存, 在目标停止期间避免重复读取寄存器和内存, 以及断点表的本地镜像
+@许可: MIT License
+@版本: Version 1.0
+"""
+import dataclasses
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Sequence
+
+# T32_GetState 的 "目标正在运行" 状态
+_RUNNING = 3
+
+# 可能修改断点表的命令: Break.*, Var.Break.*, DO 脚本
+_BREAKPOINT_COMMAND = re.compile(
+    r"^\s*(?:[a-z]::)?(?:b(?:r(?:e(?:ak?)?)?)?\.|v(?:ar)?\.b(?:r(?:e(?:ak?)?)?)?\.|do\s)",
+    re.IGNORECASE,
+)
+
+
+class RegisterCache:
+    """
+    以停止纪元 (halt epoch) 为键的寄存器缓存
+
+    目标停止期间寄存器的值不会变化, 同一次停止中重复读取同一个寄存器只需第一次与调试器通信。
+    每当目标可能运行或寄存器可能改变 (go, step, break_target, reset_cpu, 写寄存器, cmd) 时纪元加一并清空缓存。
+
+    只有确认目标处于停止状态时才使用缓存: 状态未知时 (刚连接, go 或 cmd 之后) 先查询一次状态,
+    目标正在运行时直接读取而不缓存。通过 TRACE32 界面等 API 以外的方式改变目标状态后需要手动调用 invalidate()。
+
+    :param probe: 查询目标状态的函数, 如 T32.get_state
+    """
+
+    def __init__(self, probe: Callable[[], int]):
+        self._probe = probe
+        self.enabled = True
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self._halted = False
+        self._values = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def halted(self) -> bool:
+        """是否已确认目标处于停止状态"""
+        return self._halted
+
+    def invalidate(self, still_halted: bool = False) -> int:
+        """
+        使缓存失效, 开始新的纪元
+
+        :param still_halted: 目标仍保持停止 (如单步, 写寄存器之后), 不必重新确认状态
+        :return: 新的纪元
+        """
+        with self._lock:
+            self.epoch += 1
+            self._values.clear()
+            self._halted = self._halted and still_halted
+            return self.epoch
+
+    def halt_epoch(self) -> int | None:
+        """
+        当前的停止纪元, 目标状态未知时先查询一次状态
+
+        :return: 纪元, 目标正在运行时为 None
+        """
+        with self._lock:
+            if self._halted or self._probe() != _RUNNING:
+                return self.epoch
+            return None
+
+    def observe(self, state: int) -> None:
+        """
+        根据查询到的目标状态更新缓存: 目标运行时停止缓存, 进入新的停止状态时开始新的纪元
+
+        :param state: T32_GetState 返回的状态
+        """
+        with self._lock:
+            if state == _RUNNING:
+                if self._halted:
+                    self.invalidate()
+            elif not self._halted:
+                self.invalidate()
+                self._halted = True
+
+    def get(self, keys: Sequence[Hashable], read: Callable[[], Sequence[int]]) -> list[int]:
+        """
+        获取一组寄存器的值, 有任何一个未缓存时调用 read() 一次读取全部
+
+        :param keys: 寄存器的键 (如 (大写的寄存器名, 位宽)), 同一寄存器以不同位宽读取时分别缓存
+        :param read: 按 keys 的顺序读取全部寄存器的函数
+        :return: 与 keys 顺序一致的值
+        """
+        with self._lock:
+            if self.enabled and self.halt_epoch() is not None:
+                if all(key in self._values for key in keys):
+                    self.hits += len(keys)
+                    return [self._values[key] for key in keys]
+            epoch = self.epoch
+            values = list(read())
+            self.misses += len(keys)
+            if self.enabled and self._halted and self.epoch == epoch:
+                self._values.update(zip(keys, values))
+            return values
+
+
+class MemoryCache:
+    """
+    按页缓存的目标内存
+
+    读取时以页为单位从调试器预取整页并按 LRU 淘汰, 之后落在已缓存页内的读取不再与调试器通信;
+    写入时同时更新已缓存的页 (write-through)。缓存只在目标停止期间有效, 停止纪元改变 (go, step, cmd 等,
+    见 RegisterCache) 时全部丢弃, 目标正在运行时直接读取。
+
+    外设寄存器, DMA 缓冲区等会自行变化的区域应通过 add_uncacheable 标记, 与其重叠的读取总是直接访问调试器。
+
+    :param halt_epoch: 返回当前停止纪元的函数, 目标运行时返回 None (见 RegisterCache.halt_epoch)
+    :param page_size: 页大小 (字节), 须为 2 的幂
+    :param max_pages: 最多缓存的页数
+    """
+
+    def __init__(self, halt_epoch: Callable[[], int | None], page_size: int = 0x1000, max_pages: int = 1024):
+        self._halt_epoch = halt_epoch
+        self._enabled = False
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._epoch = None
+        self._pages = OrderedDict()
+        self._uncacheable = []
+        self._lock = threading.RLock()
+        self.configure(page_size, max_pages)
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用; 关闭期间的写入不会更新缓存, 因此重新启用时丢弃全部缓存页"""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        with self._lock:
+            if enabled and not self._enabled:
+                self._pages.clear()
+            self._enabled = bool(enabled)
+
+    def configure(self, page_size: int = None, max_pages: int = None) -> None:
+        """
+        修改页大小或容量, 修改页大小时清空缓存
+
+        :param page_size: 页大小 (字节), 须为 2 的幂
+        :param max_pages: 最多缓存的页数
+        """
+        with self._lock:
+            if page_size is not None:
+                if page_size <= 0 or page_size & (page_size - 1):
+                    raise ValueError(f"页大小必须为 2 的幂, 而不是 {page_size}")
+                self.page_size = page_size
+                self._pages.clear()
+            if max_pages is not None:
+                if max_pages <= 0:
+                    raise ValueError("max_pages 必须大于 0")
+                self.max_pages = max_pages
+                while len(self._pages) > self.max_pages:
+                    self._pages.popitem(last=False)
+
+    def add_uncacheable(self, address: int, size: int) -> None:
+        """
+        把 [address, address + size) 标记为不可缓存, 并丢弃与其重叠的缓存页
+
+        :param address: 起始地址
+        :param size: 字节数
+        """
+        with self._lock:
+            self._uncacheable.append((address, address + size))
+            self.invalidate(address, size)
+
+    def clear_uncacheable(self) -> None:
+        """取消全部不可缓存区域"""
+        with self._lock:
+            self._uncacheable.clear()
+
+    def cacheable(self, address: int, size: int) -> bool:
+        """[address, address + size) 是否不与任何不可缓存区域重叠"""
+        end = address + size
+        return all(end <= start or address >= stop for start, stop in self._uncacheable)
+
+    def invalidate(self, address: int = None, size: int = None) -> None:
+        """
+        丢弃缓存页
+
+        :param address: 起始地址, 默认丢弃全部
+        :param size: 字节数
+        """
+        with self._lock:
+            if address is None:
+                self._pages.clear()
+                return
+            first, last = address // self.page_size, (address + max(size, 1) - 1) // self.page_size
+            for key in [key for key in self._pages if first <= key[1] <= last]:
+                del self._pages[key]
+
+    def _valid(self) -> bool:
+        """目标处于停止状态时返回 True, 停止纪元改变时清空缓存"""
+        epoch = self._halt_epoch()
+        if epoch != self._epoch:
+            self._pages.clear()
+            self._epoch = epoch
+        return epoch is not None
+
+    def read(self, address: int, access: int, size: int, fetch: Callable[[int, int, int], bytes]) -> bytes:
+        """
+        读取内存, 未缓存的页通过 fetch 整页读取
+
+        :param address: 字节地址
+        :param access: 访问类型
+        :param size: 字节数
+        :param fetch: 直接读取内存的函数 fetch(address, access, size) -> bytes
+        :return: 数据
+        """
+        with self._lock:
+            if not self._enabled or size <= 0 or not self.cacheable(address, size) or not self._valid():
+                self.bypassed += 1
+                return fetch(address, access, size)
+
+            page_size = self.page_size
+            first, last = address // page_size, (address + size - 1) // page_size
+            pages, missing = {}, []
+            for number in range(first, last + 1):
+                if (page := self._pages.get((access, number))) is not None:
+                    self._pages.move_to_end((access, number))
+                    pages[number] = page
+                else:
+                    missing.append(number)
+
+            # 连续的缺页一次读取; 整页读取失败 (如页内有不可访问的部分) 时退回到只读取请求的范围
+            runs = []
+            for number in missing:
+                if runs and runs[-1][1] == number:
+                    runs[-1][1] += 1
+                else:
+                    runs.append([number, number + 1])
+            try:
+                for start, stop in runs:
+                    data = fetch(start * page_size, access, (stop - start) * page_size)
+                    for number in range(start, stop):
+                        offset = (number - start) * page_size
+                        pages[number] = data[offset:offset + page_size]
+            except Exception:
+                self.bypassed += 1
+                return fetch(address, access, size)
+
+            self.hits += len(pages) - len(missing)
+            self.misses += len(missing)
+            for number in missing:
+                self._pages[access, number] = pages[number]
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+            offset = address - first * page_size
+            return b"".join(pages[number] for number in range(first, last + 1))[offset:offset + size]
+
+    def write(self, address: int, access: int, data) -> None:
+        """
+        写入调试器成功后更新已缓存的页; 以其他访问类型缓存的同一地址的页被丢弃
+
+        :param address: 字节地址
+        :param access: 访问类型
+        :param data: 写入的数据
+        """
+        with self._lock:
+            data = memoryview(data).cast("B")
+            if not self._enabled or not self._pages or not data.nbytes:
+                return
+            page_size, end = self.page_size, address + data.nbytes
+            first, last = address // page_size, (end - 1) // page_size
+            for key in [key for key in self._pages if first <= key[1] <= last]:
+                if key[0] != access:
+                    del self._pages[key]
+                    continue
+                number = key[1]
+                start, stop = max(address, number * page_size), min(end, (number + 1) * page_size)
+                page = bytearray(self._pages[key])
+                page[start - number * page_size:stop - number * page_size] = data[start - address:stop - address]
+                self._pages[key] = bytes(page)
+
+
+class BreakpointCache:
+    """
+    断点表的本地镜像
+
+    第一次列出断点时 (或失效后) 从调试器完整读取一次断点表, 之后通过本库设置和清除断点时同步更新镜像,
+    列出断点不再与调试器通信。执行可能修改断点的命令 (Break.*, Var.Break.*, DO 脚本) 后自动失效;
+    通过 TRACE32 界面修改断点后需要手动调用 invalidate(), 也可以在断点配置变化的通知中调用。
+
+    断点按地址索引, 与调试器的断点表一致, 同一地址上先后设置的不同类型合并为一个断点 (类型按位或),
+    其余属性取最近一次设置的值; 清除时只去掉被清除的类型。
+
+    :param load: 从调试器读取完整断点表的函数, 返回带 address 与 type 属性的断点对象 (dataclass)
+    """
+
+    def __init__(self, load: Callable[[], Iterable]):
+        self._load = load
+        self.valid = False
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self) -> None:
+        """丢弃镜像, 下次列出时重新读取"""
+        with self._lock:
+            self.valid = False
+            self._entries.clear()
+
+    def check_command(self, command: str) -> bool:
+        """
+        命令可能修改断点表时使镜像失效
+
+        :param command: 执行的 TRACE32 命令
+        :return: 是否失效
+        """
+        if _BREAKPOINT_COMMAND.match(command):
+            self.invalidate()
+            return True
+        return False
+
+    def list(self) -> list:
+        """
+        全部断点, 按地址排序
+
+        :return: 断点对象列表
+        """
+        with self._lock:
+            if self.valid:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._entries = {breakpoint.address: breakpoint for breakpoint in self._load()}
+                self.valid = True
+            return [self._entries[address] for address in sorted(self._entries)]
+
+    def get(self, address: int):
+        """
+        地址处的断点
+
+        :param address: 地址
+        :return: 断点对象, 没有断点时为 None
+        """
+        with self._lock:
+            if not self.valid:
+                self.list()
+            return self._entries.get(address)
+
+    def update(self, breakpoints: Iterable) -> None:
+        """记录已设置到调试器的断点, 与同一地址上已有断点的类型合并"""
+        with self._lock:
+            for breakpoint in breakpoints:
+                if (entry := self._entries.get(breakpoint.address)) is not None:
+                    breakpoint = dataclasses.replace(breakpoint, type=entry.type | breakpoint.type)
+                self._entries[breakpoint.address] = breakpoint
+
+    def remove(self, breakpoints: Iterable) -> None:
+        """记录已从调试器清除的断点, 同一地址上未被清除的类型保留"""
+        with self._lock:
+            for breakpoint in breakpoints:
+                if (entry := self._entries.get(breakpoint.address)) is None:
+                    continue
+                if remaining := entry.type & ~breakpoint.type:
+                    self._entries[breakpoint.address] = dataclasses.replace(entry, type=type(entry.type)(remaining))
+                else:
+                    del self._entries[breakpoint.address]
@@ -0,0 +1,259 @@
+"""
+@文件: _fdx.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: FDX 通道的后台接收, 以环形缓冲区缓存目标发来的数据流
+@许可: MIT License
+@版本: Version 1.0
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+
+from ._remote import LINE_SBLOCK
+from ._trace32 import T32
+
+
+@dataclass
+class FdxStats:
+    """
+    FDX 通道的接收统计
+
+    :param received: 从目标接收的字节数 (含丢弃的部分)
+    :param packets: 接收的数据包数
+    :param dropped: 因环形缓冲区满而丢弃的字节数 (overflow="drop", 或 overflow="block" 时关闭通道仍未写入的数据包)
+    :param stalls: 因环形缓冲区满而暂停接收的次数 (仅 overflow="block")
+    :param high_water: 环形缓冲区的最高占用字节数
+    :param elapsed: 自打开通道以来的时间, 单位秒
+    """
+    received: int
+    packets: int
+    dropped: int
+    stalls: int
+    high_water: int
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """平均接收速率, 单位 字节/秒"""
+        return self.received / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class FdxChannel:
+    """
+    以后台线程持续接收的 FDX 通道 (目标 -> 主机)
+
+    后台线程不断轮询通道, 把收到的数据包写入预先分配的环形缓冲区, 读取方 (阻塞迭代器, readinto,
+    asyncio) 的停顿不会影响接收。环形缓冲区满时:
+
+    - overflow="block": 已取出的数据包等到有足够空间时再写入, 期间暂停接收, 其余数据留在目标的 FDX 缓冲区中,
+      由目标端反压, 不丢数据
+    - overflow="drop": 继续接收并丢弃新的数据包, 计入 stats.dropped
+
+    使用 dll 后端时 Remote API 本身不是线程安全的, 接收期间不应在其他线程调用 T32 的函数;
+    python 后端 (RemoteApi) 的每次调用都是互斥的, 可以同时使用。
+
+    :param name: 目标程序中 FDX 缓冲区的符号名
+    :param width: 元素宽度 (字节)
+    :param capacity: 环形缓冲区大小 (字节), 至少为 LINE_SBLOCK
+    :param overflow: 环形缓冲区满时的处理方式 block | drop
+    :param poll_interval: 通道空闲时两次轮询之间的最长间隔, 单位秒
+    """
+
+    def __init__(self, name: str, width: int = 1, capacity: int = 1 << 22, overflow: str = "block",
+                 poll_interval: float = 0.001):
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"overflow 必须为 block 或 drop, 而不是 {overflow}")
+        if capacity < LINE_SBLOCK:
+            raise ValueError(f"环形缓冲区至少需要 {LINE_SBLOCK} 字节")
+        self.name = name
+        self.width = width
+        self.overflow = overflow
+        self.poll_interval = poll_interval
+        self.channel = T32.fdx_open(name, "r")
+
+        self._ring = bytearray(capacity)
+        self._capacity = capacity
+        self._head = 0
+        self._tail = 0
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._error = None
+        self._done = False
+        self._running = True
+
+        self._received = self._packets = self._dropped = self._stalls = self._high_water = 0
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._receive_loop, name=f"FdxChannel-{name}", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        """环形缓冲区中尚未读取的字节数"""
+        return self._tail - self._head
+
+    @property
+    def closed(self) -> bool:
+        return not self._running
+
+    @property
+    def stats(self) -> FdxStats:
+        with self._cond:
+            return FdxStats(
+                self._received, self._packets, self._dropped, self._stalls, self._high_water,
+                time.perf_counter() - self._start,
+            )
+
+    def close(self) -> None:
+        """停止后台接收并关闭通道, 已接收的数据仍可以读取 (接收或关闭时的错误在读完数据后由读取函数抛出)"""
+        if not self._running:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+
+    # --------------------------------------------------------------------------
+    # note 后台接收
+    # --------------------------------------------------------------------------
+    def _receive_loop(self) -> None:
+        scratch = bytearray(LINE_SBLOCK)
+        delay = 0.0
+        try:
+            while self._running:
+                size = T32.fdx_receive(self.channel, scratch, self.width, wait=False)
+                if size == 0:
+                    # 通道空闲时逐渐放慢轮询, 有数据后立即恢复
+                    time.sleep(delay)
+                    delay = min(max(delay * 2, 50e-6), self.poll_interval)
+                    continue
+                delay = 0.0
+                self._store(memoryview(scratch)[:size])
+        except Exception as e:
+            self._error = e
+        finally:
+            try:
+                T32.fdx_close(self.channel)
+            except Exception as e:
+                self._error = self._error or e
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+                self._wake_async()
+
+    def _store(self, data: memoryview) -> None:
+        size = len(data)
+        with self._cond:
+            self._received += size
+            self._packets += 1
+            if self.overflow == "block" and self._capacity - (self._tail - self._head) < size:
+                # 数据包的大小只有接收后才知道 (接收缓冲区更小时会被截断), 因此先接收再等待读取方腾出空间,
+                # 这样环形缓冲区可以被完全填满
+                self._stalls += 1
+                self._cond.wait_for(lambda: not self._running or self._capacity - (self._tail - self._head) >= size)
+            if self._capacity - (self._tail - self._head) < size:
+                self._dropped += size
+                return
+            start = self._tail % self._capacity
+            first = min(size, self._capacity - start)
+            self._ring[start:start + first] = data[:first]
+            self._ring[:size - first] = data[first:]
+            self._tail += size
+            self._high_water = max(self._high_water, self._tail - self._head)
+            self._cond.notify_all()
+            self._wake_async()
+
+    def _wake_async(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass
+
+    # --------------------------------------------------------------------------
+    # note 读取
+    # --------------------------------------------------------------------------
+    def _take(self, view: memoryview) -> int:
+        """从环形缓冲区取出数据到 view 中, 调用方须持有 self._cond"""
+        size = min(self._tail - self._head, len(view))
+        if size == 0:
+            if self._error is not None:
+                raise self._error
+            return 0
+        start = self._head % self._capacity
+        first = min(size, self._capacity - start)
+        view[:first] = self._ring[start:start + first]
+        view[first:size] = self._ring[:size - first]
+        self._head += size
+        self._cond.notify_all()
+        return size
+
+    def _read(self, size: int) -> bytes:
+        buffer = bytearray(self._tail - self._head if size < 0 else min(size, self._tail - self._head))
+        return bytes(buffer[:self._take(memoryview(buffer))])
+
+    def readinto(self, buf, timeout: float = None) -> int:
+        """
+        把已接收的数据读入 buf, 没有数据时等待
+
+        :param buf: 可写且连续的 buffer 协议对象
+        :param timeout: 最长等待时间, 单位秒, None 表示一直等待
+        :return: 读取的字节数, 超时或通道关闭且数据已读完时为 0
+        """
+        view = memoryview(buf).cast("B")
+        with self._cond:
+            self._cond.wait_for(lambda: self._tail > self._head or self._done, timeout)
+            return self._take(view)
+
+    def read(self, size: int = -1, timeout: float = None) -> bytes:
+        """
+        读取已接收的数据, 没有数据时等待
+
+        :param size: 最多读取的字节数, 负数表示读取全部已接收的数据
+        :param timeout: 最长等待时间, 单位秒, None 表示一直等待
+        :return: 数据, 超时或通道关闭且数据已读完时为空
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._tail > self._head or self._done, timeout)
+            return self._read(size)
+
+    def __iter__(self):
+        """阻塞迭代, 每次返回当前已接收的全部数据, 通道关闭且数据读完后结束"""
+        while chunk := self.read():
+            yield chunk
+
+    async def aread(self, size: int = -1) -> bytes:
+        """
+        read() 的 asyncio 版本, 等待期间不占用事件循环
+
+        :param size: 最多读取的字节数, 负数表示读取全部已接收的数据
+        :return: 数据, 通道关闭且数据已读完时为空
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._tail > self._head or self._done:
+                    return self._read(size)
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            await future
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if chunk := await self.aread():
+            return chunk
+        raise StopAsyncIteration
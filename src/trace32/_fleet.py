@@ -0,0 +1,174 @@
+"""
+@文件: _fleet.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 在多个 TRACE32 实例上并行执行同一个函数, 每个目标一个独立的进程
+@许可: MIT License
+@版本: Version 1.0
+"""
+import multiprocessing
+import pickle
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Any, Callable, Iterator
+
+from ._trace32 import T32
+
+
+@dataclass
+class FleetResult:
+    """
+    单个目标的执行结果
+
+    :param endpoint: (主机, 端口)
+    :param value: 函数的返回值
+    :param error: 失败时的异常 (超时为 TimeoutError, 进程崩溃为 RuntimeError)
+    :param traceback: 失败时工作进程中的调用栈
+    :param elapsed: 从启动工作进程到得到结果的时间, 单位秒
+    """
+    endpoint: tuple[str, int]
+    value: Any = None
+    error: BaseException | None = None
+    traceback: str = ""
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _worker(conn, func: Callable, endpoint: tuple[str, int], args: tuple, kwargs: dict,
+            backend: str | None, packlen: int) -> None:
+    """工作进程: 连接 endpoint, 执行 func, 通过 conn 发回 (成功, 返回值或异常, 调用栈)"""
+    try:
+        if backend is not None:
+            T32.set_backend(backend)
+        host, port = endpoint
+        T32.config("NODE", host)
+        T32.config("PORT", str(port))
+        T32.config("PACKLEN", str(packlen))
+        T32.init()
+        try:
+            message = (True, func(endpoint, *args, **kwargs), "")
+        finally:
+            try:
+                T32.exit()
+            except Exception:
+                pass
+    except BaseException as e:
+        message = (False, e, traceback.format_exc())
+    try:
+        # 能 pickle 但不能还原的对象 (如构造参数与 args 不一致的异常) 会使主进程的 recv() 失败, 发送前先检查往返
+        pickle.loads(pickle.dumps(message))
+        conn.send(message)
+    except Exception as e:
+        ok, value, tb = message
+        error = value if not ok else e
+        conn.send((False, RuntimeError(f"{type(error).__name__}: {error}"), tb or traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class Fleet:
+    """
+    TRACE32 实例集群的执行器
+
+    对每个 (主机, 端口) 启动一个独立的工作进程 (C 库使用全局状态, 不能用线程), 在其中连接对应的 PowerView,
+    调用 func(endpoint, *args, **kwargs) 后断开。最多同时运行 workers 个进程, 结果按完成顺序返回。
+    单个目标超时会被强制结束, 抛出异常或进程崩溃只影响该目标的结果。
+
+    func 及其参数和返回值需要可以 pickle (如模块级函数)。
+
+    :param endpoints: (主机, 端口) 序列, 不能有重复
+    :param workers: 最多同时运行的进程数, 默认为目标数
+    :param packlen: UDP 最大包长度
+    :param backend: 工作进程使用的后端 dll | python | auto, 默认按环境变量 T32_BACKEND
+    :param context: multiprocessing 启动方式, 默认 spawn (不继承父进程的连接和线程)
+    """
+
+    def __init__(self, endpoints, workers: int = None, packlen: int = 1024, backend: str = None,
+                 context: str = "spawn"):
+        self.endpoints = [(host, int(port)) for host, port in endpoints]
+        # 结果以 endpoint 区分, 同一目标也不应同时被两个进程连接
+        if duplicates := sorted({endpoint for endpoint in self.endpoints if self.endpoints.count(endpoint) > 1}):
+            raise ValueError(f"重复的目标: {', '.join(f'{host}:{port}' for host, port in duplicates)}")
+        self.workers = workers or max(len(self.endpoints), 1)
+        self.packlen = packlen
+        self.backend = backend
+        self._context = multiprocessing.get_context(context)
+
+    def map(self, func: Callable, *args, timeout: float = None, **kwargs) -> Iterator[FleetResult]:
+        """
+        在所有目标上执行 func, 按完成顺序逐个返回结果
+
+        :param func: 在工作进程中执行的函数, 第一个参数为 (主机, 端口)
+        :param args: 其他位置参数
+        :param timeout: 单个目标的最长执行时间 (含连接), 单位秒
+        :param kwargs: 其他关键字参数
+        :return: 结果的迭代器
+        """
+        pending = deque(self.endpoints)
+        running = {}
+        try:
+            while pending or running:
+                while pending and len(running) < self.workers:
+                    endpoint = pending.popleft()
+                    receiver, sender = self._context.Pipe(duplex=False)
+                    process = self._context.Process(
+                        target=_worker, name=f"Fleet-{endpoint[0]}:{endpoint[1]}", daemon=True,
+                        args=(sender, func, endpoint, args, kwargs, self.backend, self.packlen),
+                    )
+                    process.start()
+                    sender.close()
+                    running[receiver] = (endpoint, process, time.perf_counter())
+
+                now = time.perf_counter()
+                wait_time = None
+                if timeout is not None:
+                    wait_time = max(min(start + timeout for _, _, start in running.values()) - now, 0)
+                ready = wait(list(running) + [process.sentinel for _, process, _ in running.values()], wait_time)
+
+                now = time.perf_counter()
+                for receiver, (endpoint, process, start) in list(running.items()):
+                    result = None
+                    if receiver in ready or process.sentinel in ready:
+                        result = self._collect(receiver, endpoint, process)
+                    elif timeout is not None and now - start >= timeout:
+                        process.terminate()
+                        result = FleetResult(endpoint, error=TimeoutError(f"{endpoint[0]}:{endpoint[1]} 超过 {timeout} 秒"))
+                    if result is not None:
+                        process.join()
+                        receiver.close()
+                        del running[receiver]
+                        result.elapsed = now - start
+                        yield result
+        finally:
+            for receiver, (_, process, _) in running.items():
+                process.terminate()
+                process.join()
+                receiver.close()
+
+    @staticmethod
+    def _collect(receiver, endpoint: tuple[str, int], process) -> FleetResult:
+        try:
+            ok, value, tb = receiver.recv()
+        except (EOFError, OSError):
+            process.join()
+            return FleetResult(endpoint, error=RuntimeError(f"工作进程异常退出, 退出码 {process.exitcode}"))
+        except Exception as e:
+            return FleetResult(endpoint, error=RuntimeError(f"无法还原工作进程的结果: {type(e).__name__}: {e}"))
+        if ok:
+            return FleetResult(endpoint, value)
+        return FleetResult(endpoint, error=value, traceback=tb)
+
+    def run(self, func: Callable, *args, timeout: float = None, **kwargs) -> list[FleetResult]:
+        """
+        在所有目标上执行 func, 等待全部完成
+
+        :return: 与 endpoints 顺序一致的结果
+        """
+        results = {result.endpoint: result for result in self.map(func, *args, timeout=timeout, **kwargs)}
+        return [results[endpoint] for endpoint in self.endpoints]
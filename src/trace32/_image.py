@@ -0,0 +1,230 @@
+"""
+@文件: _image.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 程序镜像加载器, 解析 bin / Intel HEX / S-record / ELF 文件并批量下载到目标, 由调试器计算校验和验证
+@许可: MIT License
+@版本: Version 1.0
+"""
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from ._trace32 import T32, TransferStats
+from .errors import T32VerifyError
+
+_HEX_EXTENSIONS = {".hex", ".ihex", ".ihx", ".h86"}
+_SREC_EXTENSIONS = {".srec", ".s19", ".s28", ".s37", ".mot", ".mhx"}
+
+# ELF 程序头中可加载段的类型
+_PT_LOAD = 1
+
+
+@dataclass
+class ImageRegion:
+    """
+    镜像中一段连续的数据
+
+    :param address: 起始地址
+    :param data: 数据
+    """
+    address: int
+    data: bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def end(self) -> int:
+        """结束地址 (不含)"""
+        return self.address + len(self.data)
+
+
+class Image:
+    """
+    待下载到目标的程序镜像
+
+    构造时把各个数据片段按地址排序并合并为尽可能少的连续区域 (首尾相接的片段合并为一个区域),
+    下载时每个区域通过 write_memory_buffer 一次写入, 大区域在 API 内部以流水线方式发送。
+
+    下载后默认逐个区域让调试器计算 CRC-32 (见 T32.checksum_memory) 并与本地计算的结果比较,
+    每个区域只需一次命令往返, 不必读回全部数据。
+
+    :param segments: (地址, 数据) 序列; 重叠的片段内容必须一致, 否则抛出 ValueError
+    """
+
+    def __init__(self, segments: Iterable[tuple[int, bytes]]):
+        merged = []
+        for address, data in sorted(((int(address), bytes(data)) for address, data in segments if data),
+                                    key=lambda segment: segment[0]):
+            if merged and address <= merged[-1][0] + len(merged[-1][1]):
+                start, buffer = merged[-1]
+                offset = address - start
+                overlap = buffer[offset:offset + len(data)]
+                if overlap != data[:len(overlap)]:
+                    raise ValueError(f"片段 {address:#x} 与 {start:#x} 开始的数据重叠且内容不同")
+                buffer += data[len(overlap):]
+            else:
+                merged.append((address, bytearray(data)))
+        self.regions: list[ImageRegion] = [ImageRegion(address, bytes(buffer)) for address, buffer in merged]
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def __iter__(self) -> Iterator[ImageRegion]:
+        return iter(self.regions)
+
+    @property
+    def size(self) -> int:
+        """全部区域的总字节数"""
+        return sum(region.size for region in self.regions)
+
+    # --------------------------------------------------------------------------
+    # note 解析
+    # --------------------------------------------------------------------------
+    @classmethod
+    def open(cls, path: str, format: str = None, base: int = 0) -> "Image":
+        """
+        读取镜像文件
+
+        :param path: 文件路径
+        :param format: bin | hex | srec | elf, 默认按文件内容和扩展名判断
+        :param base: bin 文件的加载地址
+        :return: 镜像
+        """
+        with open(path, "rb") as f:
+            content = f.read()
+        if format is None:
+            extension = os.path.splitext(path)[1].lower()
+            if content[:4] == b"\x7fELF":
+                format = "elf"
+            elif extension in _HEX_EXTENSIONS:
+                format = "hex"
+            elif extension in _SREC_EXTENSIONS:
+                format = "srec"
+            else:
+                format = "bin"
+        parsers: dict[str, Callable[[bytes], Iterator[tuple[int, bytes]]]] = {
+            "bin": lambda data: iter([(base, data)]),
+            "hex": parse_intel_hex,
+            "srec": parse_srecord,
+            "elf": parse_elf,
+        }
+        if format not in parsers:
+            raise ValueError(f"不支持的镜像格式 {format}")
+        return cls(parsers[format](content))
+
+    # --------------------------------------------------------------------------
+    # note 下载与校验
+    # --------------------------------------------------------------------------
+    def download(self, access: int = 0, verify: bool = True, memory_class: str = None,
+                 chunk_size: int = 0x10000, progress: Callable[[int, int], None] = None) -> TransferStats:
+        """
+        把镜像写入目标内存
+
+        :param access: 写入使用的访问类型
+        :param verify: 写入后由调试器计算每个区域的校验和并比较, 不一致时抛出 T32VerifyError
+        :param memory_class: 校验时使用的访问类型字符串, 如 "D" | "P", 默认不指定
+        :param chunk_size: 每次调用 T32_WriteMemory 写入的最大字节数
+        :param progress: 进度回调 progress(已写入的字节数, 总字节数), 每写完一个区域调用一次
+        :return: 写入的传输统计 (不含校验)
+        """
+        total, done, chunks, start = self.size, 0, 0, time.perf_counter()
+        for region in self.regions:
+            chunks += T32.write_memory_buffer(region.address, access, region.data, chunk_size).chunks
+            done += region.size
+            if progress is not None:
+                progress(done, total)
+        stats = TransferStats(total, time.perf_counter() - start, chunks)
+        if verify:
+            self.verify(memory_class)
+        return stats
+
+    def verify(self, memory_class: str = None) -> None:
+        """
+        由调试器计算每个区域的 CRC-32 并与镜像比较
+
+        :param memory_class: 访问类型字符串, 如 "D" | "P", 默认不指定
+        """
+        for region in self.regions:
+            expected = zlib.crc32(region.data)
+            actual = T32.checksum_memory(region.address, region.size, memory_class)
+            if actual != expected:
+                raise T32VerifyError(
+                    f"区域 {region.address:#x}--{region.end - 1:#x} 校验和不一致: 目标 {actual:#010x}, 镜像 {expected:#010x}"
+                )
+
+
+def parse_intel_hex(content: bytes) -> Iterator[tuple[int, bytes]]:
+    """
+    解析 Intel HEX 文件, 返回 (地址, 数据) 片段
+
+    支持数据 (00), 结束 (01), 扩展段地址 (02) 和扩展线性地址 (04) 记录, 起始地址记录 (03, 05) 被忽略。
+    """
+    upper = 0
+    for number, line in enumerate(content.decode("ascii").splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith(":"):
+            raise ValueError(f"第 {number} 行不是 Intel HEX 记录")
+        record = bytes.fromhex(line[1:])
+        if len(record) < 5 or len(record) != record[0] + 5 or sum(record) & 0xFF:
+            raise ValueError(f"第 {number} 行长度或校验和错误")
+        length, offset, kind = record[0], int.from_bytes(record[1:3], "big"), record[3]
+        data = record[4:4 + length]
+        if kind == 0x00:
+            yield upper + offset, data
+        elif kind == 0x01:
+            return
+        elif kind == 0x02:
+            upper = int.from_bytes(data, "big") << 4
+        elif kind == 0x04:
+            upper = int.from_bytes(data, "big") << 16
+
+
+def parse_srecord(content: bytes) -> Iterator[tuple[int, bytes]]:
+    """解析 Motorola S-record 文件, 返回 S1/S2/S3 数据记录的 (地址, 数据) 片段"""
+    for number, line in enumerate(content.decode("ascii").splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) < 4 or line[0] not in "Ss":
+            raise ValueError(f"第 {number} 行不是 S-record 记录")
+        record = bytes.fromhex(line[2:])
+        if len(record) != record[0] + 1 or (sum(record) & 0xFF) != 0xFF:
+            raise ValueError(f"第 {number} 行长度或校验和错误")
+        width = {"1": 2, "2": 3, "3": 4}.get(line[1])
+        if width is not None:
+            yield int.from_bytes(record[1:1 + width], "big"), record[1 + width:-1]
+
+
+def parse_elf(content: bytes) -> Iterator[tuple[int, bytes]]:
+    """
+    解析 ELF 文件, 返回可加载段 (PT_LOAD) 的 (物理地址, 文件中的数据) 片段
+
+    段在文件中没有数据的部分 (如 .bss) 不会下载。
+    """
+    if content[:4] != b"\x7fELF":
+        raise ValueError("不是 ELF 文件")
+    is64, order = content[4] == 2, "<" if content[5] == 1 else ">"
+    if is64:
+        phoff, = struct.unpack_from(order + "Q", content, 0x20)
+        phentsize, phnum = struct.unpack_from(order + "HH", content, 0x36)
+        header = struct.Struct(order + "IIQQQQQQ")
+    else:
+        phoff, = struct.unpack_from(order + "I", content, 0x1C)
+        phentsize, phnum = struct.unpack_from(order + "HH", content, 0x2A)
+        header = struct.Struct(order + "IIIIIIII")
+    for index in range(phnum):
+        fields = header.unpack_from(content, phoff + index * phentsize)
+        if is64:
+            kind, _, offset, _, paddr, filesz = fields[:6]
+        else:
+            kind, offset, _, paddr, filesz = fields[:5]
+        if kind == _PT_LOAD and filesz:
+            yield paddr, content[offset:offset + filesz]
@@ -0,0 +1,154 @@
+"""
+@文件: _notify.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 通知分发器, 在后台监听 Remote API 的 socket, 收到通知后立即调用注册的回调
+@许可: MIT License
+@版本: Version 1.0
+"""
+import select
+import sys
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from ._trace32 import NotifyEvent, T32
+
+
+class NotificationDispatcher:
+    """
+    TRACE32 通知分发器
+
+    为停止 (break), 源码编辑 (edit), 断点配置变化, PRACTICE ON 事件等通知注册回调, 每类通知可以注册多个回调。
+    start() 启动后台线程, 在 get_socket_handle() 返回的 socket 上等待数据, 收到通知后立即调用
+    check_state_notify() 分发, 无需轮询 get_state()。请求/应答过程中夹带收到的通知由 notification_pending()
+    发现, 最迟在 interval 秒后分发。
+
+    回调在监听线程上执行, 回调中抛出的异常只打印出来 (sys.__excepthook__), 不会断开连接, 也不影响后续通知。
+    使用 dll 后端时 Remote API 不是线程安全的, 此时不要调用 start(), 而应在调用 T32 的线程中定期调用 poll()。
+
+    :param interval: 监听线程两次检查本地通知队列的最长间隔, 单位秒
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self._callbacks = defaultdict(list)
+        self._events = defaultdict(list)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self._socket = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # --------------------------------------------------------------------------
+    # note 回调注册
+    # --------------------------------------------------------------------------
+    def on_break(self, callback: Callable[[int, int], None]) -> Callable:
+        """目标停止时调用 callback(pc, reason), 可用作装饰器"""
+        return self._register(NotifyEvent.BREAK, callback, lambda _, pc, reason: (pc, reason))
+
+    def on_edit(self, callback: Callable[[int, str], None]) -> Callable:
+        """在 TRACE32 中请求编辑源码时调用 callback(line, file), 可用作装饰器"""
+        return self._register(NotifyEvent.EDIT, callback, lambda _, line, file: (line, file.decode("GBK")))
+
+    def on_breakpoint_config(self, callback: Callable[[], None]) -> Callable:
+        """断点配置变化时调用 callback(), 可用作装饰器"""
+        return self._register(NotifyEvent.BREAKPOINT_CONFIG, callback, lambda _: ())
+
+    def on_error(self, callback: Callable[[int, str], None]) -> Callable:
+        """TRACE32 报告错误时调用 callback(code, message), 可用作装饰器"""
+        return self._register(NotifyEvent.ERROR, callback, lambda _, code, msg: (code, msg.decode("GBK")))
+
+    def on_event(self, name: str, callback: Callable[[], None] = None) -> Callable:
+        """
+        PRACTICE ON 事件 name 发生时调用 callback(), 可用作装饰器 @dispatcher.on_event("name")
+
+        :param name: 事件名
+        :param callback: 回调函数
+        """
+        if callback is None:
+            return lambda func: self.on_event(name, func)
+        with self._lock:
+            callbacks = self._events[name]
+            if not callbacks:
+                T32.notify_event_enable(name, lambda _: self._fire(self._events[name], ()))
+            callbacks.append(callback)
+        return callback
+
+    def remove(self, callback: Callable) -> None:
+        """注销回调, 某类通知没有回调后停用该通知"""
+        with self._lock:
+            for event, callbacks in list(self._callbacks.items()):
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                    if not callbacks:
+                        T32.notify_state_enable(event, None)
+            for name, callbacks in list(self._events.items()):
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                    if not callbacks:
+                        T32.notify_event_enable(name, None)
+
+    def _register(self, event: NotifyEvent, callback: Callable, convert: Callable) -> Callable:
+        with self._lock:
+            callbacks = self._callbacks[event]
+            if not callbacks:
+                T32.notify_state_enable(event, lambda *args: self._fire(self._callbacks[event], convert(*args)))
+            callbacks.append(callback)
+        return callback
+
+    @staticmethod
+    def _fire(callbacks: list, args: tuple) -> None:
+        for callback in list(callbacks):
+            try:
+                callback(*args)
+            except Exception:
+                sys.__excepthook__(*sys.exc_info())
+
+    # --------------------------------------------------------------------------
+    # note 监听
+    # --------------------------------------------------------------------------
+    def poll(self, timeout: float = 0.0) -> bool:
+        """
+        等待 socket 可读最多 timeout 秒, 有通知时分发
+
+        :param timeout: 最长等待时间, 单位秒
+        :return: 是否进行了分发
+        """
+        if self._socket is None:
+            self._socket = T32.get_socket_handle()
+        readable = select.select((self._socket,), (), (), timeout)[0]
+        if readable or T32.notification_pending():
+            T32.check_state_notify()
+            return True
+        return False
+
+    def start(self) -> "NotificationDispatcher":
+        """启动后台监听线程"""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._listen, name="NotificationDispatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止后台监听线程 (已注册的回调保留)"""
+        if self._thread is not None:
+            self._running = False
+            self._thread.join()
+            self._thread = None
+
+    def _listen(self) -> None:
+        while self._running:
+            try:
+                self.poll(self.interval)
+            except (OSError, ValueError):
+                # 连接已关闭
+                break
+            except Exception:
+                sys.__excepthook__(*sys.exc_info())
@@ -0,0 +1,2026 @@
+"""
+@文件: _remote.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 纯 python 实现的 Remote API (hlinknet.c + hremote.c 的移植), 可替代 t32api 动态库
+@许可: MIT License
+@版本: Version 1.0
+"""
+import select
+import socket
+import struct
+import threading
+import weakref
+from collections import deque
+from ctypes import *
+from functools import wraps
+
+# ============================================================================
+# note 协议常量 (见 capi/src/t32.h, hremote.c, hlinknet.c)
+# ============================================================================
+PCKLEN_MAX = 0x4000
+T32_PCKLEN_MAX = 1472
+LINE_MSIZE = 16384 + 256
+LINE_SBLOCK = 4096
+MAX_PACKET_SIZE = 2048
+EMU_CBMAXDATASIZE = 0x3C00
+MAXRETRY = 5
+# hremote.c 的 T32_GetBreakpointList 在请求中固定要求 0x77 (119) 个断点, 调试器一次最多返回这么多个,
+# 更多的断点只能通过断点对象接口 (T32_ReadBreakpointObjByIndex) 读取
+BREAKPOINT_LIST_MAX = 0x77
+
+T32_MSG_LHANDLE = 0x10
+T32_MSG_LRETRY = 0x08
+
+T32_API_RECEIVE = 0x01
+T32_API_SYNCREQUEST = 0x02
+T32_API_CONNECTREQUEST = 0x03
+T32_API_DISCONNECT = 0x04
+T32_API_SYNCRETRY = 0x05
+T32_API_NOTIFICATION = 0x06
+T32_API_HANDSHAKE = 0x07
+T32_API_TRANSMIT = 0x11
+T32_API_SYNCACKN = 0x12
+T32_API_CONNECTACKN = 0x13
+T32_API_SYNCBACK = 0x22
+T32_API_CONNECTNACK = 0x23
+T32_API_CONNECTACKN_DEVICE = 0x53
+
+MAGIC = b"TRACE32\0"
+
+RAPI_CMD_NOP = 0x70
+RAPI_CMD_ATTACH = 0x71
+RAPI_CMD_EXECUTE_PRACTICE = 0x72
+RAPI_CMD_PING = 0x73
+RAPI_CMD_DEVICE_SPECIFIC = 0x74
+RAPI_CMD_CMDWINDOW = 0x75
+RAPI_CMD_GETMSG = 0x76
+RAPI_CMD_EDITNOTIFY = 0x78
+RAPI_CMD_TERMINATE = 0x79
+
+RAPI_DSCMD_GETSTATE = 0x10
+RAPI_DSCMD_RESET = 0x11
+RAPI_DSCMD_STATE_SETNOTIFIER = 0x12
+RAPI_DSCMD_GETCPUINFO = 0x13
+RAPI_DSCMD_EVAL_GETVALUE = 0x14
+RAPI_DSCMD_MEMORY_GETMAP = 0x16
+RAPI_DSCMD_EVAL_GETSTRING = 0x17
+RAPI_DSCMD_EVENT_SETNOTIFIER = 0x18
+RAPI_DSCMD_GETLASTERRMSG = 0x19
+RAPI_DSCMD_REGISTER_READ = 0x20
+RAPI_DSCMD_REGISTER_WRITE = 0x21
+RAPI_DSCMD_REGISTER_PC_READ = 0x22
+RAPI_DSCMD_REGISTER_READBYNAME = 0x23
+RAPI_DSCMD_REGISTER_WRITEBYNAME = 0x24
+RAPI_DSCMD_REGISTERSET_OBJ_READ = 0x29
+RAPI_DSCMD_REGISTERSET_OBJ_WRITE = 0x2A
+RAPI_DSCMD_MEMORY_READ = 0x30
+RAPI_DSCMD_MEMORY_WRITE = 0x31
+RAPI_DSCMD_MEMORY_WRITEPIPE = 0x32
+RAPI_DSCMD_MEMORY_ACCESS_SET = 0x34
+RAPI_DSCMD_BUNDLE_OBJ_TRANSFER = 0x38
+RAPI_DSCMD_BREAKPOINT_GET = 0x40
+RAPI_DSCMD_BREAKPOINT_SET = 0x41
+RAPI_DSCMD_BREAKPOINT_CLEAR = 0x42
+RAPI_DSCMD_BREAKPOINT_OBJ_READ = 0x44
+RAPI_DSCMD_BREAKPOINT_OBJ_WRITE = 0x45
+RAPI_DSCMD_BREAKPOINT_OBJ_QUERY = 0x46
+RAPI_DSCMD_STEP_SINGLE = 0x50
+RAPI_DSCMD_GO = 0x51
+RAPI_DSCMD_BREAK = 0x52
+RAPI_DSCMD_MODE_SET = 0x53
+RAPI_DSCMD_STEP_MODE = 0x54
+RAPI_DSCMD_SOURCE_GETFILE = 0x60
+RAPI_DSCMD_SOURCE_GETSELECTED = 0x61
+RAPI_DSCMD_SYMBOL_GET = 0x62
+RAPI_DSCMD_TRIGGER_MESSAGE_GET = 0x63
+RAPI_DSCMD_BREAKPOINT_LIST = 0x64
+RAPI_DSCMD_VARIABLE_READVALUE = 0x65
+RAPI_DSCMD_VARIABLE_READSTRING = 0x66
+RAPI_DSCMD_SYMBOL_GETBYADDRESS = 0x67
+RAPI_DSCMD_VARIABLE_WRITEVALUE = 0x69
+RAPI_DSCMD_WINDOW_CONTENT = 0x70
+RAPI_DSCMD_ANALYZER_STATE = 0x80
+RAPI_DSCMD_ANALYZER_READ = 0x81
+RAPI_DSCMD_TRACE_STATE = 0x82
+RAPI_DSCMD_TRACE_READ = 0x83
+RAPI_DSCMD_API_LOCK = 0x94
+RAPI_DSCMD_API_UNLOCK = 0x95
+RAPI_DSCMD_FDX_RESOLVE = 0xA0
+RAPI_DSCMD_FDX_OPEN = 0xA1
+RAPI_DSCMD_FDX_RECEIVEPOLL = 0xA2
+RAPI_DSCMD_FDX_RECEIVE = 0xA3
+RAPI_DSCMD_FDX_TRANSMITPOLL = 0xA4
+RAPI_DSCMD_FDX_TRANSMIT = 0xA5
+RAPI_DSCMD_FDX_CLOSE = 0xA6
+
+T32_E_BREAK = 0x00
+T32_E_EDIT = 0x01
+T32_E_BREAKPOINTCONFIG = 0x02
+T32_E_ONEVENT = 0x03
+T32_E_RTSTRIGGER = 0x04
+T32_E_ERROR = 0x05
+T32_MAX_EVENTS = 6
+
+T32_OK = 0
+T32_ERR_COM_RECEIVE_FAIL = -1
+T32_ERR_COM_TRANSMIT_FAIL = -2
+T32_ERR_COM_PARA_FAIL = -3
+T32_ERR_COM_SEQ_FAIL = -4
+T32_ERR_NOTIFY_MAX_EVENT = -5
+T32_ERR_STD_INVALID = 10
+T32_ERR_FN1 = 90
+T32_ERR_FN2 = 91
+T32_ERR_FN3 = 92
+T32_ERR_FN4 = 93
+T32_ERR_GETRAM_INTERNAL = 0x1000
+T32_ERR_READREGBYNAME_NOTFOUND = 0x1010
+T32_ERR_READREGBYNAME_FAILED = 0x1011
+T32_ERR_WRITEREGBYNAME_NOTFOUND = 0x1020
+T32_ERR_WRITEREGBYNAME_FAILED = 0x1021
+T32_ERR_READREGOBJ_MAXCORE = 0x1031
+T32_ERR_READREGOBJ_NOTFOUND = 0x1032
+T32_ERR_READREGSETOBJ_PARAFAIL = 0x1033
+T32_ERR_READREGSETOBJ_NUMREGS = 0x1034
+T32_ERR_WRITEREGOBJ_PARAFAIL = 0x1040
+T32_ERR_WRITEREGOBJ_MAXCORE = 0x1041
+T32_ERR_WRITEREGOBJ_NOTFOUND = 0x1042
+T32_ERR_WRITEREGOBJ_FAILED = 0x1043
+T32_ERR_SETBP_FAILED = 0x1050
+T32_ERR_TRANSFERMEMOBJ_PARAFAIL = 0x1071
+T32_ERR_TRANSFERMEMOBJ_TRANSFERFAIL = 0x1072
+T32_ERR_READVAR_ALLOC = 0x1080
+T32_ERR_READVAR_ACCESS = 0x1081
+T32_ERR_READBPOBJ_PARAFAIL = 0x1091
+T32_ERR_READBPOBJ_NOTFOUND = 0x1092
+T32_ERR_WRITEBPOBJ_FAILED = 0x10A1
+
+API_REVISION = 100142
+
+T32_ADDRTYPE_COMMON = 1
+T32_ADDRTYPE_A32 = 2
+T32_ADDRTYPE_A64 = 3
+
+T32_REGTYPE_R32 = 2
+T32_REGTYPE_R64 = 3
+# 各寄存器类型的值的字节数 (R32, R64, R128, R256, R512)
+T32_REGTYPE_SIZES = {2: 4, 3: 8, 4: 16, 5: 32, 6: 64}
+T32_MAX_REGNAME = 15
+T32_MAX_REGISTERS = 200
+T32_INVALID_REGID = 0xFFFFFFFF
+
+T32_BP_TYPE_PROGRAM = 0x01
+T32_BP_TYPE_READ = 0x02
+T32_BP_TYPE_WRITE = 0x04
+T32_BP_TYPE_RW = 0x06
+T32_BP_IMPL_AUTO = 0x00
+T32_BP_IMPL_SOFT = 0x01
+T32_BP_IMPL_ONCHIP = 0x02
+T32_BP_IMPL_HARD = 0x04
+T32_BP_IMPL_MARK = 0x08
+
+T32_BUFFER_NOTSYNCHED = 0
+T32_BUFFER_READ = 1
+T32_BUFFER_WRITTEN = 2
+T32_BUFFER_ERROR = 3
+
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+I32 = struct.Struct("<i")
+
+# T32_OUTBUFFER / T32_INBUFFER 在各自缓冲区中的偏移, 前面留出消息头和包头的位置
+OUT = 13 + 4
+IN = 13
+
+_DISCONNECT = bytes([T32_API_DISCONNECT, 0, 0, 0, 0, 0, 0, 0]) + MAGIC
+_HANDSHAKE = bytes([T32_API_HANDSHAKE, 0, 0, 0, 0, 0, 0, 0]) + MAGIC
+
+
+# ============================================================================
+# note ctypes 参数适配
+# ============================================================================
+def _int(arg) -> int:
+    """取得整形参数, 兼容 python int 与 c_uint32 等 ctypes 简单类型"""
+    return arg if isinstance(arg, int) else arg.value
+
+
+def _bytes(arg) -> bytes:
+    """取得字符串参数, 兼容 bytes, str 与 c_char_p / create_string_buffer"""
+    if isinstance(arg, bytes):
+        return arg.split(b"\0", 1)[0]
+    if isinstance(arg, str):
+        return arg.encode("GBK")
+    return arg.value
+
+
+def _address(ptr) -> int | None:
+    """取得指针参数指向的地址, 兼容 byref(), ctypes 数组与整数地址"""
+    if ptr is None:
+        return None
+    if isinstance(ptr, int):
+        return ptr
+    return cast(ptr, c_void_p).value
+
+
+def _store(ptr, ctype, value) -> None:
+    """向输出指针写入一个 ctypes 标量, 相当于 C 中的 *ptr = value"""
+    if ptr is not None:
+        memmove(ptr, byref(ctype(value)), sizeof(ctype))
+
+
+def _store_string(ptr, value: bytes, limit: int = None) -> None:
+    """向输出 char* 写入以 0 结尾的字符串"""
+    if ptr is None:
+        return
+    if limit is not None and len(value) >= limit:
+        value = value[:max(limit - 1, 0)]
+    memmove(ptr, value + b"\0", len(value) + 1)
+
+
+def _weak(obj) -> weakref.ref | None:
+    """obj 的弱引用, 不支持弱引用的参数 (整数地址, byref()) 返回 None"""
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        return None
+
+
+def _not_implemented(*args) -> int:
+    return T32_ERR_STD_INVALID
+
+
+# 纯 python 后端尚未移植的函数 (直接访问, JTAG/DAP/I2C, Lua), 调用时返回 T32_ERR_STD_INVALID
+_NOT_PORTED = frozenset({
+    "T32_ParamFromUint32",
+    "T32_BundledAccessAlloc", "T32_BundledAccessExecute", "T32_BundledAccessFree",
+    "T32_DirectAccessRelease", "T32_DirectAccessResetAll", "T32_DirectAccessSetInfo", "T32_DirectAccessGetInfo",
+    "T32_DirectAccessGetTimestamp", "T32_DirectAccessUserSignal", "T32_DirectAccessExecuteLua",
+    "T32_TAPAccessSetInfo", "T32_TAPAccessSetInfo2", "T32_TAPAccessShiftRaw", "T32_TAPAccessShiftIR",
+    "T32_TAPAccessShiftDR", "T32_TAPAccessJTAGResetWithTMS", "T32_TAPAccessJTAGResetWithTRST",
+    "T32_TAPAccessSetShiftPattern", "T32_TAPAccessDirect",
+    "T32_DAPAccessScan", "T32_DAPAccessInitSWD", "T32_DAPAPAccessReadWrite", "T32_I2CAccess",
+    "T32_ExecuteLua",
+})
+
+
+def _locked(func):
+    """同一连接上的调用串行执行, 不同连接之间互不影响"""
+
+    @wraps(func)
+    def wrapper(self, *args):
+        with self._lock:
+            return func(self, *args)
+
+    return wrapper
+
+
+# ============================================================================
+# note 链路层 (hlinknet.c)
+# ============================================================================
+class Line:
+    """
+    hlinknet.c 中 LineStruct 与 LINE_* 函数的移植
+
+    与 C 版本不同, 所有状态 (socket, 包序号, 消息 id, 同步位, 通知队列) 都保存在实例中,
+    因此每个 Line 都是一条独立的连接。返回值约定与 C 版本保持一致。
+    """
+
+    def __init__(self):
+        self.node_name = "localhost"
+        self.host_port = 0
+        self.receive_port = 0
+        self.transmit_port = 20000
+        self.packet_size = 1024
+        self.poll_time_sec = 5.0
+        self.receive_toggle_bit = -1
+        self.message_id = 0
+        self.line_up = False
+        self.receive_seq = 0
+        self.transmit_seq = 0
+        self.last_receive_seq = 0
+        self.last_transmit_seq = 0
+        self.last_transmit = None
+        self.last_transmit_size = 0
+        self.transmit_counter = 0
+        self.error_message = ""
+        self.notifications = deque()
+        self.sock = None
+        self.address = None
+
+    def next_message_id(self) -> int:
+        self.message_id = (self.message_id + 1) & 0xFF
+        return self.message_id
+
+    def config(self, line: str) -> int:
+        """
+        LINE_LineConfig, 按 "KEY=value" 设置一个参数
+
+        :return: 1 成功 | -1 失败
+        """
+        key, sep, value = line.partition("=")
+        if not sep:
+            return -1
+        if key == "NODE":
+            self.node_name = value
+            return 1
+        if key not in ("PORT", "HOSTPORT", "PACKLEN", "TIMEOUT") or not value.isdigit():
+            return -1
+        match key:
+            case "PORT":
+                self.transmit_port = int(value)
+            case "HOSTPORT":
+                self.host_port = int(value)
+            case "PACKLEN":
+                self.packet_size = int(value)
+            case "TIMEOUT":
+                self.poll_time_sec = float(value)
+        return 1
+
+    def init(self) -> int:
+        """
+        LINE_LineInit, 建立与 TRACE32 的连接
+
+        :return: 0 已连接 | 1 新建连接 | -1 失败 (原因见 error_message)
+        """
+        if self.line_up:
+            return 0
+        try:
+            remote_ip = socket.gethostbyname(self.node_name)
+        except OSError:
+            self.error_message = f"node name ({self.node_name}) unknown"
+            return -1
+
+        try:
+            if self.sock is None:
+                self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self.sock.bind(("", self.host_port))
+                self.receive_port = self.sock.getsockname()[1]
+            self.address = (remote_ip, self.transmit_port)
+
+            for opt in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+                if self.sock.getsockopt(socket.SOL_SOCKET, opt) < PCKLEN_MAX:
+                    self.sock.setsockopt(socket.SOL_SOCKET, opt, PCKLEN_MAX)
+            val = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+            if 0 < val < self.packet_size:
+                self.packet_size = val
+        except OSError:
+            self.error_message = "cannot create socket"
+            self._close()
+            return -1
+
+        for _ in range(10):
+            j = self._connection()
+            if j == 0:
+                continue
+            if j == 1:
+                self.line_up = True
+                return 1
+            self.error_message = "TRACE32 access refused"
+            break
+        else:
+            self.error_message = "TRACE32 not responding"
+
+        self._close()
+        return -1
+
+    def exit(self) -> None:
+        """LINE_LineExit, 通知 TRACE32 断开并关闭 socket"""
+        if not self.line_up:
+            return
+        for _ in range(5):
+            try:
+                self.sock.sendto(_DISCONNECT, self.address)
+            except OSError:
+                break
+        self._close()
+
+    def _close(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = None
+        self.line_up = False
+
+    def fileno(self) -> int:
+        return -1 if self.sock is None else self.sock.fileno()
+
+    def _receive_with_timeout(self, timeout: float, dest: memoryview) -> int:
+        """ReceiveWithTimeout, 返回接收到的字节数, 超时返回 0, 出错返回 -1"""
+        try:
+            if not select.select((self.sock,), (), (), timeout)[0]:
+                return 0
+            return self.sock.recv_into(dest)
+        except OSError:
+            return -1
+
+    def _connection(self) -> int:
+        """
+        Connection, 发送 CONNECTREQUEST 并等待应答
+
+        :return: 0 无应答 | 1 成功 | 2 被拒绝
+        """
+        buffer = bytearray(max(self.packet_size, 16))
+        buffer[0] = T32_API_CONNECTREQUEST
+        buffer[1] = 1
+        self.transmit_seq = 1
+        struct.pack_into("<HHH", buffer, 2, self.transmit_seq, self.transmit_port, self.receive_port)
+        buffer[8:16] = MAGIC
+
+        try:
+            self.sock.sendto(memoryview(buffer)[:self.packet_size], self.address)
+        except OSError:
+            return 0
+        if (i := self._receive_with_timeout(0.5, memoryview(buffer))) <= 0:
+            return 0
+        if buffer[8:16] != MAGIC:
+            return 0
+        self.receive_seq = U16.unpack_from(buffer, 2)[0]
+
+        if buffer[0] == T32_API_CONNECTACKN_DEVICE:
+            return 2
+        if buffer[0] != T32_API_CONNECTACKN:
+            return 2 if buffer[0] == T32_API_CONNECTNACK else 0
+        self.packet_size = i
+        return 1
+
+    def transmit(self, buffer: bytearray, offset: int, size: int) -> int:
+        """
+        LINE_LineTransmit, 将 buffer[offset:offset+size] 的消息拆成若干包发送
+
+        与 C 版本一样, 包头直接写在 buffer[offset-4:offset] 处, 发送后恢复原内容, 避免拷贝。
+        """
+        self.transmit_counter += 1
+        self.last_transmit = (buffer, offset)
+        self.last_transmit_size = size
+        self.last_transmit_seq = self.transmit_seq
+
+        view = memoryview(buffer)
+        pos = offset - 4
+        payload = self.packet_size - 4
+        while True:
+            packet_size = min(size, payload)
+            saved = bytes(view[pos:pos + 4])
+            buffer[pos] = T32_API_TRANSMIT
+            buffer[pos + 1] = 1 if size > packet_size else 0
+            U16.pack_into(buffer, pos + 2, self.transmit_seq)
+            try:
+                sent = self.sock.sendto(view[pos:pos + packet_size + 4], self.address)
+            except (OSError, AttributeError):
+                sent = -1
+            view[pos:pos + 4] = saved
+            if sent != packet_size + 4:
+                return -1
+            self.transmit_seq = (self.transmit_seq + 1) & 0xFFFF
+            pos += packet_size
+            size -= packet_size
+            if size <= 0:
+                return self.last_transmit_size
+
+    def receive(self, buffer: bytearray, offset: int) -> int:
+        """
+        LINE_LineReceive, 接收并在 buffer[offset:] 处原地拼接一条完整消息
+
+        :return: 消息字节数 | -1 失败
+        """
+        if self.sock is None:
+            return -1
+        view = memoryview(buffer)
+        while True:
+            dest = offset - 4
+            count = 0
+            s = self.receive_seq
+            retry = False
+            while True:
+                saved = bytes(view[dest:dest + 4])
+                while True:
+                    i = self._receive_with_timeout(self.poll_time_sec, view[dest:dest + self.packet_size])
+                    if i <= 0:
+                        return -1
+                    if i == 1 and buffer[dest] == ord("+"):
+                        retry = True
+                        break
+                    if i <= 4:
+                        return -1
+                    if buffer[dest] == T32_API_NOTIFICATION:
+                        # 请求/应答之间插入的异步通知, 先放入队列
+                        self.notifications.append(bytes(view[dest:dest + i]))
+                        retry = True
+                        break
+                    if buffer[dest] != T32_API_RECEIVE:
+                        return -1
+                    seq = U16.unpack_from(buffer, dest + 2)[0]
+                    if seq == self.last_receive_seq and self.last_transmit_size:
+                        # 对端重发了上一条应答, 说明请求丢失, 重新发送
+                        self.transmit_seq = self.last_transmit_seq
+                        self.transmit(*self.last_transmit, self.last_transmit_size)
+                    if seq == self.receive_seq:
+                        break
+                if retry:
+                    break
+
+                self.receive_seq = (self.receive_seq + 1) & 0xFFFF
+                flag = buffer[dest + 1]
+                view[dest:dest + 4] = saved
+                dest += i - 4
+                count += i - 4
+                if count > LINE_MSIZE:
+                    return -1
+                if flag == 2:
+                    try:
+                        self.sock.sendto(_HANDSHAKE, self.address)
+                    except OSError:
+                        return -1
+                if not flag:
+                    self.last_receive_seq = s
+                    return count
+            if not retry:
+                return -1
+
+    def receive_notify_message(self) -> tuple[int, bytes] | None:
+        """
+        LINE_ReceiveNotifyMessage, 优先取出队列中的通知, 否则非阻塞地检查 socket
+
+        :return: None | (通知类型, 整个通知包)
+        """
+        if self.notifications:
+            package = self.notifications.popleft()
+        else:
+            if self.sock is None:
+                return None
+            package = bytearray(T32_PCKLEN_MAX)
+            if self._receive_with_timeout(0, memoryview(package)) < 2:
+                return None
+        if package[0] != T32_API_NOTIFICATION:
+            return None
+        return package[1], bytes(package)
+
+    def sync(self) -> int:
+        """LINE_LineSync, 同步包序号"""
+        packet = bytearray(PCKLEN_MAX)
+        view = memoryview(packet)
+        j = 0
+        while True:
+            request = struct.pack("<BBHI", T32_API_SYNCREQUEST, 0, self.transmit_seq, 0) + MAGIC
+            try:
+                self.sock.sendto(request, self.address)
+            except OSError:
+                return -1
+            resend = False
+            while True:
+                j += 1
+                if j > 20:
+                    return -1
+                if (i := self._receive_with_timeout(0.5, view)) <= 0:
+                    return -1
+                if i != 16 or packet[0] != T32_API_SYNCACKN or packet[8:16] != MAGIC:
+                    if i == 16 and packet[0] == T32_API_SYNCRETRY:
+                        resend = True
+                        break
+                    continue
+                break
+            if not resend:
+                break
+
+        self.receive_seq = U16.unpack_from(packet, 2)[0]
+        self.last_receive_seq = (self.receive_seq - 100) & 0xFFFF
+        try:
+            self.sock.sendto(struct.pack("<BBHI", T32_API_SYNCBACK, 0, self.transmit_seq, 0) + MAGIC, self.address)
+        except OSError:
+            return -1
+        return 1
+
+
+# ============================================================================
+# note API 对象 (T32_AddressObj, T32_MemoryBundleObj)
+# ============================================================================
+class _AddressObj:
+    """T32_AddressObj, 字段含义与 t32.h 相同"""
+
+    def __init__(self, kind: int = T32_ADDRTYPE_COMMON, address: int = 0):
+        self.type = kind
+        self.address = address
+        self.access = b""
+        self.width = 0
+        self.core = 0xFFFF
+        self.spaceid = 0xFFFFFFFF
+        self.attr = 0
+        self.sizeofmau = 0
+
+    def copy(self) -> '_AddressObj':
+        obj = _AddressObj()
+        obj.__dict__.update(self.__dict__)
+        return obj
+
+    def stream(self) -> bytes | None:
+        """streamAddressParams, 返回地址参数的报文形式, 地址类型无效时返回 None"""
+        if self.type == T32_ADDRTYPE_A32:
+            out = bytearray(struct.pack("<HI", self.type, self.address & 0xFFFFFFFF))
+        elif self.type == T32_ADDRTYPE_A64:
+            out = bytearray(struct.pack("<HQ", self.type, self.address))
+        else:
+            return None
+        if self.access:
+            length = (len(self.access) + 2) & ~1
+            out += struct.pack("<HH", 0x4341, length) + self.access.ljust(length, b"\0")
+        if self.width:
+            out += struct.pack("<HH", 0x4957, self.width)
+        if self.core != 0xFFFF:
+            out += struct.pack("<HH", 0x4F43, self.core)
+        if self.spaceid != 0xFFFFFFFF:
+            out += struct.pack("<HI", 0x4953, self.spaceid)
+        if self.attr:
+            out += struct.pack("<HI", 0x4A41, self.attr)
+        if self.sizeofmau:
+            out += struct.pack("<HH", 0x554D, self.sizeofmau)
+        return bytes(out + U16.pack(0x5858))
+
+    def extract(self, data, pos: int) -> int | None:
+        """extractAddressParams, 返回地址参数之后的位置, 地址类型无效时返回 None"""
+        self.type = U16.unpack_from(data, pos)[0]
+        if self.type == T32_ADDRTYPE_A32:
+            self.address = U32.unpack_from(data, pos + 2)[0]
+            pos += 6
+        elif self.type == T32_ADDRTYPE_A64:
+            self.address = struct.unpack_from("<Q", data, pos + 2)[0]
+            pos += 10
+        else:
+            return None
+        # 未知的参数逐字跳过, 直到结束标记 "XX"
+        while (tag := U16.unpack_from(data, pos)[0]) != 0x5858:
+            pos += 2
+            if tag == 0x4341:
+                length = U16.unpack_from(data, pos)[0]
+                self.access = bytes(data[pos + 2:pos + 2 + length]).split(b"\0")[0].rstrip(b":")[:15]
+                pos += 2 + length
+            elif tag in (0x4957, 0x4F43, 0x554D):
+                value = U16.unpack_from(data, pos)[0]
+                setattr(self, {0x4957: "width", 0x4F43: "core", 0x554D: "sizeofmau"}[tag], value)
+                pos += 2
+            elif tag in (0x4953, 0x4A41):
+                setattr(self, "spaceid" if tag == 0x4953 else "attr", U32.unpack_from(data, pos)[0])
+                pos += 4
+        return pos + 2
+
+
+class _BreakpointObj:
+    """T32_BreakpointObj, 字段含义与 t32.h 相同"""
+
+    def __init__(self, address: _AddressObj = None):
+        self.address = address or _AddressObj()
+        self.size = 0
+        self.types = 0
+        self.impl = 0
+        self.disabled = 0
+
+    def stream(self) -> bytes | None:
+        """streamBreakpointParams, 地址无效时返回 None"""
+        if (address := self.address.stream()) is None:
+            return None
+        params = U16.pack(0x4441) + address + struct.pack(
+            "<HQHIHIHH", 0x5A53, self.size, 0x5954, self.types, 0x4D49, self.impl, 0x4E45, 0 if self.disabled else 1
+        )
+        # 开头的 "xx" 给出从自身到结束标记 "XX" 的距离
+        return struct.pack("<HH", 0x6868, 4 + len(params)) + params + U16.pack(0x5858)
+
+    def extract(self, data, pos: int) -> None:
+        """extractBreakpointParams"""
+        tag = U16.unpack_from(data, pos)[0]
+        pos += 2
+        if tag == 0x6A6A:
+            # 没有断点
+            self.types = self.impl = 0
+            return
+        if tag == 0x6868:
+            tag = U16.unpack_from(data, pos + 2)[0]
+            pos += 4
+        if tag == 0x4441:
+            if (pos := self.address.extract(data, pos)) is None:
+                return
+            tag = U16.unpack_from(data, pos)[0]
+            pos += 2
+        if tag == 0x5A53:
+            self.size, tag = struct.unpack_from("<QH", data, pos)
+            pos += 10
+        if tag == 0x5954:
+            self.types, tag = struct.unpack_from("<IH", data, pos)
+            pos += 6
+        if tag in (0x4D44, 0x4D49):
+            self.impl, tag = struct.unpack_from("<IH", data, pos)
+            pos += 6
+        if tag == 0x4E45:
+            self.disabled = 0 if U16.unpack_from(data, pos)[0] else 1
+
+
+class _MemoryChunk:
+    """T32_MemoryChunk, read 为 1 时读取 size 字节, 为 0 时写入 data"""
+
+    def __init__(self, address: _AddressObj, size: int, data: bytes = None):
+        self.synched = T32_BUFFER_NOTSYNCHED
+        self.address = address
+        self.size = size
+        self.data = data
+        self.read = 1 if data is None else 0
+
+
+class _RegisterObj:
+    """T32_RegisterObj, 字段含义与 t32.h 相同, 值统一保存为无符号整数"""
+
+    def __init__(self, kind: int):
+        self.type = kind
+        self.id = T32_INVALID_REGID
+        self.name = b""
+        self.core = 0xFFFF
+        self.value = 0
+
+    def stream(self) -> bytes:
+        """streamRegisterParams, 返回寄存器参数的报文形式"""
+        length = (len(self.name) + 2) & ~1
+        out = struct.pack("<HHIHH", self.type, 0x4944, self.id, 0x4D4E, length) + self.name.ljust(length, b"\0")
+        if self.core != 0xFFFF:
+            out += struct.pack("<HH", 0x4F43, self.core)
+        return out + U16.pack(0x5858)
+
+    def stream_value(self) -> bytes:
+        """streamRegisterValue"""
+        return (self.value & ((1 << 8 * T32_REGTYPE_SIZES[self.type]) - 1)).to_bytes(T32_REGTYPE_SIZES[self.type], "little")
+
+    def extract(self, data, pos: int) -> int | None:
+        """extractRegisterParams, 返回下一个寄存器的位置, 类型与对象不符时返回 None"""
+        kind, tag = struct.unpack_from("<HH", data, pos)
+        pos += 4
+        if tag == 0x4944:
+            self.id, tag = struct.unpack_from("<IH", data, pos)
+            pos += 6
+        if tag == 0x414C:
+            if kind != self.type or kind not in T32_REGTYPE_SIZES:
+                return None
+            size = T32_REGTYPE_SIZES[kind]
+            self.value = int.from_bytes(data[pos:pos + size], "little")
+            pos += size
+            if pos + 2 <= len(data) and U16.unpack_from(data, pos)[0] == 0x5858:
+                pos += 2
+        return pos
+
+
+class _RegisterSetObj:
+    """T32_RegisterSetObj"""
+
+    def __init__(self, count: int, kind: int):
+        self.regs = [_RegisterObj(kind) for _ in range(count)]
+
+
+# ============================================================================
+# note 消息层 (hremote.c)
+# ============================================================================
+class RemoteApi:
+    """
+    纯 python 实现的 TRACE32 Remote API
+
+    方法名与调用方式和 t32api 动态库中的同名函数完全一致 (接受 ctypes 参数, 返回错误码),
+    因此可以直接替换 _trace32.__t32__ 使用。
+
+    每个实例拥有独立的收发缓冲区和链路, 不同实例可以在不同线程中并发访问不同的 PowerView,
+    同一实例上的调用由实例内部的锁串行化。
+    """
+
+    def __init__(self):
+        self.line = Line()
+        # 默认通道 (T32_GetChannel0): 未调用 T32_SetChannel 时使用的链路, 以其 Line 对象的 id 作为通道地址
+        self._channel0 = id(self.line)
+        self._channels = {self._channel0: (None, self.line)}
+        self._lock = threading.RLock()
+        self._out = bytearray(LINE_MSIZE + 256)
+        self._in = bytearray(LINE_MSIZE + PCKLEN_MAX)
+        self._in_address = addressof((c_char * len(self._in)).from_buffer(self._in))
+        self._out_address = addressof((c_char * len(self._out)).from_buffer(self._out))
+        self._cpu_string = create_string_buffer(16)
+        self._callbacks = [None] * T32_MAX_EVENTS
+        self._event_callbacks = {}
+        self._in_notify = False
+        self._objects = {}
+        self._next_handle = 0
+
+    def __getattr__(self, name):
+        # 尚未移植的函数 (JTAG, Lua 等) 统一返回 "功能未实现", 其他名称 (如拼写错误) 照常抛出 AttributeError
+        if name in _NOT_PORTED:
+            return _not_implemented
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    # --------------------------------------------------------------------------
+    # note 传输辅助函数
+    # --------------------------------------------------------------------------
+    def _header(self, length: int, cmd: int, sub: int) -> None:
+        out = self._out
+        out[OUT] = length & 0xFF
+        out[OUT + 1] = cmd
+        out[OUT + 2] = sub & 0xFF
+        out[OUT + 3] = self.line.next_message_id()
+
+    def _put_string(self, pos: int, value: bytes) -> None:
+        self._out[OUT + pos:OUT + pos + len(value)] = value
+        self._out[OUT + pos + len(value)] = 0
+
+    def _get_string(self, pos: int) -> bytes:
+        start = IN + pos
+        end = self._in.find(0, start)
+        return bytes(self._in[start:end if end >= 0 else len(self._in)])
+
+    def _transmit(self, length: int) -> int:
+        """LINE_Transmit, 加上 5 字节的消息头后发送 T32_OUTBUFFER[0:length]"""
+        self._out[OUT - 5:OUT] = b"\0\0\0\0\0"
+        return self.line.transmit(self._out, OUT - 5, length + 5 if length else 0)
+
+    def _receive(self) -> int:
+        """LINE_Receive, 接收与当前消息 id 匹配的应答, 返回 T32_INBUFFER 中的字节数"""
+        line, buf = self.line, self._in
+        retry = 0
+        while retry < MAXRETRY:
+            retry += 1
+            length = line.receive(buf, IN - 1)
+            if length == -1:
+                return -1
+            if buf[IN + 2] == 0xFE:
+                retry = 1
+                line.receive_toggle_bit = -1
+                continue
+            if buf[IN + 3] != line.message_id:
+                continue
+            handle = int(bool(buf[IN - 1] & T32_MSG_LHANDLE))
+            if buf[IN - 1] & T32_MSG_LRETRY and line.receive_toggle_bit == handle:
+                if self._transmit(0) == -1:
+                    self._sync()
+                continue
+            line.receive_toggle_bit = handle
+            return length - 1
+        return -1
+
+    def _sync(self) -> int:
+        for _ in range(MAXRETRY - 1):
+            if self.line.sync() != -1:
+                return 0
+        return -1
+
+    def _exchange(self, length: int) -> int:
+        """发送 T32_OUTBUFFER[0:length] 并等待应答, 返回 T32_INBUFFER[2] 中的错误码"""
+        if self._transmit(length) == -1:
+            return T32_ERR_COM_TRANSMIT_FAIL
+        if self._receive() == -1:
+            return T32_ERR_COM_RECEIVE_FAIL
+        return self._in[IN + 2]
+
+    def _simple(self, cmd: int, sub: int) -> int:
+        self._header(2, cmd, sub)
+        return self._exchange(4)
+
+    def _string_request(self, sub: int, name: bytes, prefix: bytes = b"") -> int:
+        """发送 "定长前缀 + 以 0 结尾字符串" 形式的请求"""
+        length = len(prefix) + len(name)
+        if length + 3 > 0xFF:
+            return T32_ERR_COM_PARA_FAIL
+        self._header(length + 3, RAPI_CMD_DEVICE_SPECIFIC, sub)
+        self._out[OUT + 4:OUT + 4 + len(prefix)] = prefix
+        self._put_string(4 + len(prefix), name)
+        return self._exchange((length + 5 + 1) & ~1)
+
+    def _u32(self, pos: int) -> int:
+        return U32.unpack_from(self._in, IN + pos)[0]
+
+    # --------------------------------------------------------------------------
+    # note 基本 API 函数
+    # --------------------------------------------------------------------------
+    @_locked
+    def T32_Config(self, string1, string2) -> int:
+        return 0 if self.line.config((_bytes(string1) + _bytes(string2)).decode("GBK")) == 1 else -1
+
+    @_locked
+    def T32_Init(self) -> int:
+        if self.line.init() == -1:
+            return -1
+        self.line.receive_toggle_bit = -1
+        return self._sync()
+
+    @_locked
+    def T32_Exit(self) -> int:
+        self.line.exit()
+        # 与 hremote.c 的 releaseAllObjects 一致, 断开后释放全部对象; 句柄编号继续递增, 旧句柄不会指向新对象
+        self._objects.clear()
+        # 通道缓冲区已被回收的链路不会再被选中 (其地址可能被新的缓冲区复用), 一并丢弃
+        self._channels = {
+            address: (ref, line) for address, (ref, line) in self._channels.items() if ref is None or ref() is not None
+        }
+        return 0
+
+    @_locked
+    def T32_Attach(self, device) -> int:
+        self._header(2, RAPI_CMD_ATTACH, _int(device))
+        return self._exchange(4)
+
+    @_locked
+    def T32_Terminate(self, code) -> int:
+        self._header(2, RAPI_CMD_TERMINATE, _int(code))
+        return self._exchange(4)
+
+    @_locked
+    def T32_Ping(self) -> int:
+        return self._simple(RAPI_CMD_PING, 0)
+
+    @_locked
+    def T32_NopEx(self, length, options) -> int:
+        length, options = _int(length), _int(options)
+        self._header(0 if length > 0xFD else length + 2, RAPI_CMD_NOP, options)
+        U16.pack_into(self._out, OUT + 4, (length + 4) & 0xFFFF)
+        return self._exchange(length + 6 if length > 0xFD else length + 4)
+
+    def T32_Nop(self) -> int:
+        return self.T32_NopEx(0, 0)
+
+    @_locked
+    def T32_NopFail(self) -> int:
+        self._header(2, RAPI_CMD_NOP, 0)
+        self._transmit(4)
+        return -1
+
+    @_locked
+    def T32_Stop(self) -> int:
+        return self._simple(RAPI_CMD_EXECUTE_PRACTICE, 0x00)
+
+    @_locked
+    def T32_Cmd(self, command) -> int:
+        command = _bytes(command)
+        length = len(command)
+        if length + 7 + 1 > MAX_PACKET_SIZE:
+            return T32_ERR_COM_PARA_FAIL
+        if length + 3 > 0xFF:
+            self._header(0, RAPI_CMD_EXECUTE_PRACTICE, 0x02)
+            U16.pack_into(self._out, OUT + 4, length + 5)
+            self._put_string(6, command)
+            return self._exchange((length + 7 + 1) & ~1)
+        self._header(length + 3, RAPI_CMD_EXECUTE_PRACTICE, 0x02)
+        self._put_string(4, command)
+        return self._exchange((length + 5 + 1) & ~1)
+
+    def _format(self, fmt, args) -> bytes | None:
+        text = _bytes(fmt).decode("GBK")
+        args = tuple(a.decode("GBK") if isinstance(a, bytes) else _int(a) for a in args)
+        text = (text % args) if args else text.replace("%%", "%")
+        return text.encode("GBK") if len(text) < 1024 else None
+
+    @_locked
+    def T32_Cmd_f(self, command, *args) -> int:
+        command = self._format(command, args)
+        return T32_ERR_COM_PARA_FAIL if command is None else self.T32_Cmd(command)
+
+    @_locked
+    def T32_Printf(self, string, *args) -> int:
+        string = self._format(string, args)
+        if string is None:
+            return T32_ERR_COM_PARA_FAIL
+        *lines, last = string.split(b"\n")
+        for line in lines:
+            err = self.T32_Cmd(b'PRINT %CONTinue "' + line + b'"') or self.T32_Cmd(b"PRINT")
+            if err:
+                return err
+        return self.T32_Cmd(b'PRINT %CONTinue "' + last + b'"') if last else 0
+
+    @_locked
+    def T32_CmdWin(self, handle, command) -> int:
+        command = _bytes(command)
+        length = len(command)
+        if length + 11 + 1 >= MAX_PACKET_SIZE:
+            return T32_ERR_COM_PARA_FAIL
+        if length + 7 >= 0xFF:
+            self._header(0, RAPI_CMD_CMDWINDOW, 0x02)
+            struct.pack_into("<HI", self._out, OUT + 4, length + 9, _int(handle))
+            self._put_string(10, command)
+            return self._exchange((length + 11 + 1) & ~1)
+        self._header(length + 7, RAPI_CMD_CMDWINDOW, 0x02)
+        U32.pack_into(self._out, OUT + 4, _int(handle))
+        self._put_string(8, command)
+        return self._exchange((length + 9 + 1) & ~1)
+
+    @_locked
+    def T32_GetPracticeState(self, p_state) -> int:
+        err = self._simple(RAPI_CMD_EXECUTE_PRACTICE, 0x03)
+        if err >= 0:
+            _store(p_state, c_int, self._in[IN + 4])
+        return err
+
+    @_locked
+    def T32_EvalGet(self, p_result) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_EVAL_GETVALUE)
+        if err >= 0:
+            _store(p_result, c_uint32, self._u32(4))
+        return err
+
+    @_locked
+    def T32_EvalGetString(self, p_string) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_EVAL_GETSTRING)
+        if err >= 0:
+            _store_string(p_string, self._get_string(4))
+        return err
+
+    @_locked
+    def T32_GetMessage(self, p_message, p_type) -> int:
+        err = self._simple(RAPI_CMD_GETMSG, 0)
+        if err >= 0:
+            _store_string(p_message, self._get_string(8))
+            _store(p_type, c_uint16, self._u32(4) & 0xFFFF)
+        return err
+
+    @_locked
+    def T32_GetTriggerMessage(self, p_message=None) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_TRIGGER_MESSAGE_GET)
+        if err >= 0:
+            _store_string(p_message, self._get_string(4))
+        return err
+
+    def T32_GetChannelSize(self) -> int:
+        return sizeof(c_void_p)
+
+    def T32_GetChannel0(self) -> int:
+        return self._channel0
+
+    @_locked
+    def T32_GetChannelDefaults(self, parameters) -> None:
+        # 通道缓冲区只作为键使用, 真正的链路状态保存在对应的 Line 对象中; 同时保存缓冲区的弱引用,
+        # 以便在 T32_Exit 时丢弃缓冲区已被回收的链路
+        self._channels[_address(parameters)] = (_weak(parameters), Line())
+
+    @_locked
+    def T32_SetChannel(self, parameters) -> None:
+        address = _address(parameters)
+        if address not in self._channels:
+            self._channels[address] = (_weak(parameters), Line())
+        self.line = self._channels[address][1]
+
+    @_locked
+    def T32_APILock(self, timeout) -> int:
+        self._header(6, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_API_LOCK)
+        U32.pack_into(self._out, OUT + 4, _int(timeout) & 0xFFFFFFFF)
+        return self._exchange(8)
+
+    @_locked
+    def T32_APIUnlock(self) -> int:
+        return self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_API_UNLOCK)
+
+    def T32_GetApiRevision(self, p_revision) -> int:
+        _store(p_revision, c_uint32, API_REVISION)
+        return T32_OK
+
+    def T32_GetSocketHandle(self, p_socket) -> None:
+        _store(p_socket, c_int, self.line.fileno())
+
+    # --------------------------------------------------------------------------
+    # note 调试器相关函数
+    # --------------------------------------------------------------------------
+    @_locked
+    def T32_Go(self) -> int:
+        return self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_GO)
+
+    @_locked
+    def T32_Break(self) -> int:
+        return self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BREAK)
+
+    @_locked
+    def T32_Step(self) -> int:
+        return self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_STEP_SINGLE)
+
+    @_locked
+    def T32_StepMode(self, mode) -> int:
+        self._header(4, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_STEP_MODE)
+        self._out[OUT + 4:OUT + 6] = bytes((_int(mode) & 0xFF, 0))
+        return self._exchange(6)
+
+    @_locked
+    def T32_SetMode(self, mode) -> int:
+        self._header(4, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_MODE_SET)
+        self._out[OUT + 4:OUT + 6] = bytes((_int(mode) & 0xFF, 0))
+        return self._exchange(6)
+
+    @_locked
+    def T32_ResetCPU(self) -> int:
+        return self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_RESET)
+
+    @_locked
+    def T32_GetCpuInfo(self, pp_string, p_fpu, p_endian, p_reserved) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_GETCPUINFO)
+        if err >= 0:
+            self._cpu_string.value = bytes(self._in[IN + 4:IN + 19]).split(b"\0", 1)[0]
+            _store(pp_string, c_void_p, addressof(self._cpu_string))
+            _store(p_fpu, c_uint16, U16.unpack_from(self._in, IN + 22)[0])
+            _store(p_endian, c_uint16, U16.unpack_from(self._in, IN + 24)[0])
+            _store(p_reserved, c_uint16, U16.unpack_from(self._in, IN + 20)[0])
+        return err
+
+    @_locked
+    def T32_GetState(self, p_state) -> int:
+        if p_state is None:
+            return T32_ERR_COM_PARA_FAIL
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_GETSTATE)
+        _store(p_state, c_int, self._in[IN + 4] if err >= 0 else 0)
+        return err
+
+    @_locked
+    def T32_GetRam(self, p_start, p_end, p_access) -> int:
+        start, access = c_uint32(), c_uint16()
+        memmove(byref(start), p_start, sizeof(start))
+        memmove(byref(access), p_access, sizeof(access))
+        self._header(8, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_MEMORY_GETMAP)
+        struct.pack_into("<IH", self._out, OUT + 4, start.value, access.value)
+        err = self._exchange(10)
+        if err >= 0:
+            _store(p_start, c_uint32, self._u32(4))
+            _store(p_end, c_uint32, self._u32(8))
+            if not self._u32(12):
+                _store(p_access, c_uint16, 0)
+            if err == T32_ERR_FN1:
+                err = T32_ERR_GETRAM_INTERNAL
+        return err
+
+    @_locked
+    def T32_WriteMemory(self, address, access, buffer, size) -> int:
+        address, access, size = _int(address), _int(access), _int(size)
+        if size > MAX_PACKET_SIZE:
+            err = self.T32_WriteMemoryPipe(address, access, buffer, size)
+            return err or self.T32_WriteMemoryPipe(address, access, buffer, 0)
+        self._header(10, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_MEMORY_WRITE)
+        struct.pack_into("<IBBH", self._out, OUT + 4, address & 0xFFFFFFFF, access & 0xFF, 0, size)
+        memmove(self._out_address + OUT + 12, buffer, size)
+        return self._exchange(12 + ((size + 1) & ~1))
+
+    @_locked
+    def T32_WriteMemoryPipe(self, address, access, buffer, size) -> int:
+        address, access, size = _int(address), _int(access), _int(size)
+        if size == 0:
+            return self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_MEMORY_WRITEPIPE)
+        source, err = _address(buffer), 0
+        while not err and size > 0:
+            length = min(size, MAX_PACKET_SIZE)
+            self._header(10, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_MEMORY_WRITEPIPE)
+            struct.pack_into("<IBBH", self._out, OUT + 4, address & 0xFFFFFFFF, access & 0xFF, 0, length)
+            memmove(self._out_address + OUT + 12, source, length)
+            err = self._exchange(12 + ((length + 1) & ~1))
+            size -= length
+            address += length
+            source += length
+        return err
+
+    @_locked
+    def T32_ReadMemory(self, address, access, buffer, size) -> int:
+        address, access, size = _int(address), _int(access), _int(size)
+        dest, err = _address(buffer), 0
+        while not err and size > 0:
+            length = min(size, MAX_PACKET_SIZE)
+            self._header(10, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_MEMORY_READ)
+            struct.pack_into("<IBBH", self._out, OUT + 4, address & 0xFFFFFFFF, access & 0xFF, 0, length)
+            err = self._exchange(12)
+            if err >= 0:
+                memmove(dest, self._in_address + IN + 4, length)
+            size -= length
+            address += length
+            dest += length
+        return err
+
+    @_locked
+    def T32_SetMemoryAccessClass(self, access) -> int:
+        access = _bytes(access) if access is not None else b""
+        if len(access) + 3 > 0xFF:
+            return T32_ERR_COM_PARA_FAIL
+        self._header(len(access) + 3, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_MEMORY_ACCESS_SET)
+        self._put_string(4, access)
+        return self._exchange((len(access) + 5 + 1) & ~1)
+
+    @_locked
+    def T32_WriteRegister(self, mask_lower, mask_upper, buffer) -> int:
+        mask = _int(mask_lower) | (_int(mask_upper) << 32)
+        values = (c_uint32 * 64).from_address(_address(buffer))
+        index = 12
+        struct.pack_into("<II", self._out, OUT + 4, mask & 0xFFFFFFFF, mask >> 32)
+        for i in range(64):
+            if mask >> i & 1:
+                U32.pack_into(self._out, OUT + index, values[i])
+                index += 4
+        self._header(index, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_REGISTER_WRITE)
+        return self._exchange(index)
+
+    @_locked
+    def T32_ReadRegister(self, mask_lower, mask_upper, buffer) -> int:
+        mask = _int(mask_lower) | (_int(mask_upper) << 32)
+        self._header(12, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_REGISTER_READ)
+        struct.pack_into("<II", self._out, OUT + 4, mask & 0xFFFFFFFF, mask >> 32)
+        err = self._exchange(12)
+        if err >= 0:
+            values = (c_uint32 * 64).from_address(_address(buffer))
+            index = 4
+            for i in range(64):
+                if mask >> i & 1:
+                    values[i] = self._u32(index)
+                    index += 4
+                else:
+                    values[i] = 0
+        return err
+
+    @_locked
+    def T32_ReadRegisterByName(self, name, p_lower, p_upper) -> int:
+        err = self._string_request(RAPI_DSCMD_REGISTER_READBYNAME, _bytes(name))
+        if err >= 0:
+            _store(p_lower, c_uint32, self._u32(4))
+            _store(p_upper, c_uint32, self._u32(8))
+            err = {T32_ERR_FN1: T32_ERR_READREGBYNAME_NOTFOUND, T32_ERR_FN2: T32_ERR_READREGBYNAME_FAILED}.get(err, err)
+        return err
+
+    @_locked
+    def T32_WriteRegisterByName(self, name, lower, upper) -> int:
+        err = self._string_request(
+            RAPI_DSCMD_REGISTER_WRITEBYNAME, _bytes(name), struct.pack("<II", _int(lower), _int(upper))
+        )
+        if err >= 0:
+            err = {T32_ERR_FN1: T32_ERR_WRITEREGBYNAME_NOTFOUND, T32_ERR_FN2: T32_ERR_WRITEREGBYNAME_FAILED}.get(err, err)
+        return err
+
+    @_locked
+    def T32_ReadPP(self, p_counter) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_REGISTER_PC_READ)
+        if err >= 0:
+            _store(p_counter, c_uint32, self._u32(4))
+        return err
+
+    @_locked
+    def T32_WriteBreakpoint(self, address, access, config, size) -> int:
+        config, size = _int(config), _int(size)
+        if size < 1 or size > 0xFFFF:
+            return T32_ERR_COM_PARA_FAIL
+        sub = RAPI_DSCMD_BREAKPOINT_CLEAR if config & 0x100 else RAPI_DSCMD_BREAKPOINT_SET
+        self._header(10, RAPI_CMD_DEVICE_SPECIFIC, sub)
+        struct.pack_into("<IBBH", self._out, OUT + 4, _int(address), _int(access) & 0xFF, config & 0xFF, size)
+        err = self._exchange(12)
+        return T32_ERR_SETBP_FAILED if err == T32_ERR_FN1 else err
+
+    @_locked
+    def T32_ReadBreakpoint(self, address, access, p_config, size) -> int:
+        address, access, size = _int(address), _int(access), _int(size)
+        dest, err = _address(p_config), 0
+        while not err and size > 0:
+            length = min(size, MAX_PACKET_SIZE // 2)
+            self._header(10, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BREAKPOINT_GET)
+            struct.pack_into("<IBBH", self._out, OUT + 4, address, access & 0xFF, 0, length)
+            err = self._exchange(12)
+            if err >= 0:
+                memmove(dest, self._in_address + IN + 4, length * 2)
+            size -= length
+            address += length
+            dest += length * 2
+        return err
+
+    @_locked
+    def T32_GetBreakpointList(self, p_number, p_settings, limit) -> int:
+        self._header(4, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BREAKPOINT_LIST)
+        U16.pack_into(self._out, OUT + 4, BREAKPOINT_LIST_MAX)
+        err = self._exchange(6)
+        if err >= 0:
+            number = U16.unpack_from(self._in, IN + 4)[0]
+            _store(p_number, c_int, number)
+            dest = _address(p_settings)
+            for i in range(min(number, _int(limit))):
+                address, enabled, bp_type, aux = struct.unpack_from("<IBII", self._in, IN + 6 + i * 13)
+                memmove(dest + i * 16, struct.pack("<IB3xII", address, enabled & 1, bp_type, aux), 16)
+        return err
+
+    @_locked
+    def T32_GetSource(self, address, p_file, p_line) -> int:
+        self._header(6, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_SOURCE_GETFILE)
+        U32.pack_into(self._out, OUT + 4, _int(address))
+        err = self._exchange(8)
+        if err >= 0:
+            _store_string(p_file, self._get_string(8))
+            _store(p_line, c_uint32, self._u32(4))
+        return err
+
+    @_locked
+    def T32_GetSelectedSource(self, p_file, p_line) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_SOURCE_GETSELECTED)
+        if err >= 0:
+            _store_string(p_file, self._get_string(8))
+            _store(p_line, c_uint32, self._u32(4))
+        return err
+
+    @_locked
+    def T32_GetSymbol(self, name, p_address, p_size, p_access) -> int:
+        if name is None:
+            return T32_ERR_COM_PARA_FAIL
+        err = self._string_request(RAPI_DSCMD_SYMBOL_GET, _bytes(name))
+        if err >= 0:
+            _store(p_address, c_uint32, self._u32(4))
+            _store(p_size, c_uint32, self._u32(8))
+            _store(p_access, c_uint32, self._u32(12))
+        return err
+
+    @_locked
+    def T32_GetSymbolFromAddress(self, p_name, address, length) -> int:
+        self._header(10, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_SYMBOL_GETBYADDRESS)
+        struct.pack_into("<Ii", self._out, OUT + 4, _int(address), _int(length))
+        err = self._exchange(12)
+        if err >= 0:
+            _store_string(p_name, self._get_string(4), _int(length))
+        return err
+
+    @staticmethod
+    def _variable_error(err: int) -> int:
+        return {T32_ERR_FN1: T32_ERR_READVAR_ALLOC, T32_ERR_FN2: T32_ERR_READVAR_ACCESS}.get(err, err)
+
+    @_locked
+    def T32_ReadVariableValue(self, name, p_lower, p_upper) -> int:
+        err = self._string_request(RAPI_DSCMD_VARIABLE_READVALUE, _bytes(name))
+        if err >= 0:
+            _store(p_lower, c_uint32, self._u32(4))
+            _store(p_upper, c_uint32, self._u32(8))
+            err = self._variable_error(err)
+        return err
+
+    @_locked
+    def T32_WriteVariableValue(self, name, lower, upper) -> int:
+        err = self._string_request(
+            RAPI_DSCMD_VARIABLE_WRITEVALUE, _bytes(name), struct.pack("<II", _int(lower), _int(upper))
+        )
+        return self._variable_error(err) if err >= 0 else err
+
+    @_locked
+    def T32_ReadVariableString(self, name, p_string, length) -> int:
+        err = self._string_request(RAPI_DSCMD_VARIABLE_READSTRING, _bytes(name))
+        if err >= 0:
+            _store_string(p_string, self._get_string(4), _int(length))
+            err = self._variable_error(err)
+        return err
+
+    @_locked
+    def T32_GetWindowContent(self, command, buffer, requested, offset, print_code) -> int:
+        command, requested = _bytes(command), _int(requested)
+        length = len(command)
+        if length + 3 + 8 > 0xFF:
+            return -1
+        self._header(length + 3 + 12, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_WINDOW_CONTENT)
+        struct.pack_into("<III", self._out, OUT + 4, requested, _int(offset), _int(print_code))
+        self._put_string(16, command)
+        if self._exchange((12 + length + 5 + 1) & ~1):
+            return -1
+        length = min(self._u32(4), requested - 1)
+        data = bytes(self._in[IN + 8:IN + 8 + length]).split(b"\0", 1)[0]
+        _store_string(buffer, data)
+        return length
+
+    @_locked
+    def T32_GetLastErrorMessage(self, p_message, p_last_error, p_internal) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_GETLASTERRMSG)
+        if err >= 0:
+            _store(p_last_error, c_uint32, self._u32(4))
+            _store(p_internal, c_uint32, self._u32(8))
+            _store_string(p_message, self._get_string(12))
+        return err
+
+    # --------------------------------------------------------------------------
+    # note 面向对象风格的函数
+    # --------------------------------------------------------------------------
+    def _request_object(self, p_handle, obj) -> int:
+        """登记对象并把其句柄写入 p_handle, 句柄只是对象表中的键"""
+        self._next_handle += 1
+        self._objects[self._next_handle] = obj
+        _store(p_handle, c_void_p, self._next_handle)
+        return T32_OK
+
+    def _release_object(self, p_handle) -> int:
+        handle = c_void_p()
+        memmove(byref(handle), p_handle, sizeof(handle))
+        self._objects.pop(handle.value, None)
+        _store(p_handle, c_void_p, 0)
+        return T32_OK
+
+    def _object(self, handle, kind):
+        obj = self._objects.get(_int(handle))
+        return obj if isinstance(obj, kind) else None
+
+    @_locked
+    def T32_RequestAddressObj(self, p_handle) -> int:
+        return self._request_object(p_handle, _AddressObj())
+
+    @_locked
+    def T32_RequestAddressObjA32(self, p_handle, address) -> int:
+        return self._request_object(p_handle, _AddressObj(T32_ADDRTYPE_A32, _int(address) & 0xFFFFFFFF))
+
+    @_locked
+    def T32_RequestAddressObjA64(self, p_handle, address) -> int:
+        return self._request_object(p_handle, _AddressObj(T32_ADDRTYPE_A64, _int(address)))
+
+    @_locked
+    def T32_ReleaseAddressObj(self, p_handle) -> int:
+        return self._release_object(p_handle)
+
+    @_locked
+    def T32_SetAddressObjAddr32(self, handle, address) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        if obj.type == T32_ADDRTYPE_COMMON:
+            obj.type = T32_ADDRTYPE_A32
+        obj.address = _int(address) & 0xFFFFFFFF
+        return T32_OK
+
+    @_locked
+    def T32_SetAddressObjAddr64(self, handle, address) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.type = T32_ADDRTYPE_A64
+        obj.address = _int(address)
+        return T32_OK
+
+    @_locked
+    def T32_SetAddressObjAccessString(self, handle, access) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.access = _bytes(access)[:15]
+        return T32_OK
+
+    @_locked
+    def T32_SetAddressObjWidth(self, handle, width) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.width = _int(width)
+        return T32_OK
+
+    @_locked
+    def T32_SetAddressObjCore(self, handle, core) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.core = _int(core)
+        return T32_OK
+
+    @_locked
+    def T32_GetAddressObjAddr32(self, handle, p_address) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None or obj.type != T32_ADDRTYPE_A32:
+            return T32_ERR_COM_PARA_FAIL
+        _store(p_address, c_uint32, obj.address)
+        return T32_OK
+
+    @_locked
+    def T32_GetAddressObjAddr64(self, handle, p_address) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None or obj.type not in (T32_ADDRTYPE_A32, T32_ADDRTYPE_A64):
+            return T32_ERR_COM_PARA_FAIL
+        _store(p_address, c_uint64, obj.address)
+        return T32_OK
+
+    @_locked
+    def T32_GetAddressObjAccessString(self, handle, buffer, maxlen) -> int:
+        if (obj := self._object(handle, _AddressObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        _store_string(buffer, obj.access, _int(maxlen))
+        return T32_OK
+
+    @_locked
+    def T32_RequestMemoryBundleObj(self, p_handle, initial_size) -> int:
+        return self._request_object(p_handle, [])
+
+    @_locked
+    def T32_ReleaseMemoryBundleObj(self, p_handle) -> int:
+        return self._release_object(p_handle)
+
+    @_locked
+    def T32_AddToBundleObjAddrLength(self, bundle, address, length) -> int:
+        chunks, address = self._object(bundle, list), self._object(address, _AddressObj)
+        if chunks is None or address is None:
+            return T32_ERR_COM_PARA_FAIL
+        chunks.append(_MemoryChunk(address.copy(), _int(length)))
+        return T32_OK
+
+    @_locked
+    def T32_AddToBundleObjAddrLengthByteArray(self, bundle, address, length, buffer) -> int:
+        chunks, address = self._object(bundle, list), self._object(address, _AddressObj)
+        if chunks is None or address is None:
+            return T32_ERR_COM_PARA_FAIL
+        length = _int(length)
+        chunks.append(_MemoryChunk(address.copy(), length, string_at(buffer, length)))
+        return T32_OK
+
+    @_locked
+    def T32_GetBundleObjSize(self, bundle, p_size) -> int:
+        if (chunks := self._object(bundle, list)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        _store(p_size, c_uint32, len(chunks))
+        return T32_OK
+
+    @_locked
+    def T32_GetBundleObjSyncStatusByIndex(self, bundle, p_status, index) -> int:
+        chunks, index = self._object(bundle, list), _int(index)
+        if chunks is None or index >= len(chunks):
+            _store(p_status, c_int, T32_BUFFER_ERROR)
+            return T32_ERR_COM_PARA_FAIL
+        _store(p_status, c_int, chunks[index].synched)
+        return T32_OK
+
+    @_locked
+    def T32_CopyDataFromBundleObjByIndex(self, buffer, size, bundle, index) -> int:
+        chunks, index = self._object(bundle, list), _int(index)
+        if chunks is None or index >= len(chunks):
+            return T32_ERR_COM_PARA_FAIL
+        data = chunks[index].data or b""
+        memmove(buffer, data, min(len(data), _int(size)))
+        return T32_OK
+
+    @_locked
+    def T32_TransferMemoryBundleObj(self, bundle) -> int:
+        if (chunks := self._object(bundle, list)) is None:
+            return T32_ERR_COM_PARA_FAIL
+
+        # 应答数据的总长度不能超过 EMU_CBMAXDATASIZE
+        if 4 + sum(2 + (chunk.size if chunk.read else 0) for chunk in chunks) > EMU_CBMAXDATASIZE:
+            return T32_ERR_TRANSFERMEMOBJ_PARAFAIL
+        request = bytearray(U16.pack(len(chunks)))
+        for chunk in chunks:
+            chunk.synched = T32_BUFFER_ERROR
+            if (params := chunk.address.stream()) is None:
+                return T32_ERR_COM_PARA_FAIL
+            size = chunk.size if chunk.read else len(chunk.data)
+            request += struct.pack("<HH", chunk.read, size) + params
+            if not chunk.read:
+                request += chunk.data + b"\0" * (size & 1)
+        request += U16.pack(0x5858)
+        length = 6 + len(request)
+        if length > EMU_CBMAXDATASIZE:
+            return T32_ERR_TRANSFERMEMOBJ_PARAFAIL
+
+        self._header(0, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BUNDLE_OBJ_TRANSFER)
+        U16.pack_into(self._out, OUT + 4, length)
+        self._out[OUT + 6:OUT + length] = request
+        err = self._exchange(length)
+        if err:
+            return {T32_ERR_FN1: T32_ERR_TRANSFERMEMOBJ_PARAFAIL, T32_ERR_FN2: T32_ERR_TRANSFERMEMOBJ_TRANSFERFAIL}.get(err, err)
+
+        pos = 4
+        for chunk in chunks:
+            ok = U16.unpack_from(self._in, IN + pos)[0]
+            pos += 2
+            if not chunk.read:
+                chunk.synched = T32_BUFFER_WRITTEN if ok else T32_BUFFER_ERROR
+            elif ok:
+                chunk.synched = T32_BUFFER_READ
+                chunk.data = bytes(self._in[IN + pos:IN + pos + chunk.size])
+                pos += chunk.size
+            if not ok:
+                err = T32_ERR_TRANSFERMEMOBJ_TRANSFERFAIL
+        return err
+
+    @_locked
+    def T32_RequestRegisterSetObj(self, p_handle, count, kind) -> int:
+        if _int(count) > T32_MAX_REGISTERS:
+            return T32_ERR_COM_PARA_FAIL
+        return self._request_object(p_handle, _RegisterSetObj(_int(count), _int(kind)))
+
+    def T32_RequestRegisterSetObjR32(self, p_handle, count) -> int:
+        return self.T32_RequestRegisterSetObj(p_handle, count, T32_REGTYPE_R32)
+
+    def T32_RequestRegisterSetObjR64(self, p_handle, count) -> int:
+        return self.T32_RequestRegisterSetObj(p_handle, count, T32_REGTYPE_R64)
+
+    @_locked
+    def T32_ReleaseRegisterSetObj(self, p_handle) -> int:
+        return self._release_object(p_handle)
+
+    @_locked
+    def T32_SetRegisterSetObjNames(self, handle, names, count) -> int:
+        obj, count = self._object(handle, _RegisterSetObj), _int(count)
+        if obj is None or len(obj.regs) < count:
+            return T32_ERR_COM_PARA_FAIL
+        names = cast(names, POINTER(c_char_p))
+        for reg, name in zip(obj.regs, (names[i] for i in range(count))):
+            if len(name) > T32_MAX_REGNAME:
+                return T32_ERR_COM_PARA_FAIL
+            reg.name, reg.id = name, T32_INVALID_REGID
+        return T32_OK
+
+    @_locked
+    def T32_SetRegisterSetObjValues32(self, handle, values, count) -> int:
+        return self._set_register_values(handle, cast(values, POINTER(c_uint32)), _int(count))
+
+    @_locked
+    def T32_GetRegisterSetObjValues32(self, handle, values, count) -> int:
+        return self._get_register_values(handle, cast(values, POINTER(c_uint32)), _int(count), (T32_REGTYPE_R32,))
+
+    @_locked
+    def T32_SetRegisterSetObjValues64(self, handle, values, count) -> int:
+        """hremote.c 中没有的 64 位版本, 相当于对集合中的每个寄存器调用 T32_SetRegisterObjValue64"""
+        obj = self._object(handle, _RegisterSetObj)
+        if obj is not None and any(reg.type == T32_REGTYPE_R32 for reg in obj.regs[:_int(count)]):
+            return T32_ERR_COM_PARA_FAIL
+        return self._set_register_values(handle, cast(values, POINTER(c_uint64)), _int(count))
+
+    @_locked
+    def T32_GetRegisterSetObjValues64(self, handle, values, count) -> int:
+        """hremote.c 中没有的 64 位版本, 相当于对集合中的每个寄存器调用 T32_GetRegisterObjValue64"""
+        return self._get_register_values(
+            handle, cast(values, POINTER(c_uint64)), _int(count), (T32_REGTYPE_R32, T32_REGTYPE_R64)
+        )
+
+    def _set_register_values(self, handle, values, count: int) -> int:
+        obj = self._object(handle, _RegisterSetObj)
+        if obj is None or len(obj.regs) < count:
+            return T32_ERR_COM_PARA_FAIL
+        for i in range(count):
+            if obj.regs[i].type not in T32_REGTYPE_SIZES:
+                return T32_ERR_COM_PARA_FAIL
+            obj.regs[i].value = values[i]
+        return T32_OK
+
+    def _get_register_values(self, handle, values, count: int, kinds: tuple) -> int:
+        obj = self._object(handle, _RegisterSetObj)
+        if obj is None or len(obj.regs) < count:
+            return T32_ERR_COM_PARA_FAIL
+        for i in range(count):
+            if obj.regs[i].type not in kinds:
+                return T32_ERR_COM_PARA_FAIL
+            values[i] = obj.regs[i].value
+        return T32_OK
+
+    @_locked
+    def T32_ReadRegisterSetObj(self, handle) -> int:
+        err = self._transfer_register_set(handle, RAPI_DSCMD_REGISTERSET_OBJ_READ)
+        return {
+            T32_ERR_FN1: T32_ERR_READREGSETOBJ_PARAFAIL, T32_ERR_FN2: T32_ERR_READREGOBJ_MAXCORE,
+            T32_ERR_FN3: T32_ERR_READREGOBJ_NOTFOUND,
+        }.get(err, err)
+
+    @_locked
+    def T32_WriteRegisterSetObj(self, handle) -> int:
+        err = self._transfer_register_set(handle, RAPI_DSCMD_REGISTERSET_OBJ_WRITE)
+        return {
+            T32_ERR_FN1: T32_ERR_WRITEREGOBJ_PARAFAIL, T32_ERR_FN2: T32_ERR_WRITEREGOBJ_MAXCORE,
+            T32_ERR_FN3: T32_ERR_WRITEREGOBJ_NOTFOUND, T32_ERR_FN4: T32_ERR_WRITEREGOBJ_FAILED,
+        }.get(err, err)
+
+    def _transfer_register_set(self, handle, sub: int) -> int:
+        obj = self._object(handle, _RegisterSetObj)
+        if obj is None or len(obj.regs) > T32_MAX_REGISTERS:
+            return T32_ERR_COM_PARA_FAIL
+        request = bytearray(U16.pack(len(obj.regs)))
+        for reg in obj.regs:
+            request += reg.stream()
+            if sub == RAPI_DSCMD_REGISTERSET_OBJ_WRITE:
+                if reg.type not in T32_REGTYPE_SIZES:
+                    return T32_ERR_COM_PARA_FAIL
+                request += reg.stream_value()
+        request += U16.pack(0x5858)
+        length = 6 + len(request)
+        if length > EMU_CBMAXDATASIZE:
+            return T32_ERR_COM_PARA_FAIL
+
+        self._header(0, RAPI_CMD_DEVICE_SPECIFIC, sub)
+        U16.pack_into(self._out, OUT + 4, length)
+        self._out[OUT + 6:OUT + length] = request
+        err = self._exchange(length)
+        if err:
+            return err
+
+        if U16.unpack_from(self._in, IN + 4)[0] != len(obj.regs):
+            return T32_ERR_READREGSETOBJ_NUMREGS
+        pos = 6
+        for reg in obj.regs:
+            if (pos := reg.extract(self._in, IN + pos)) is None:
+                return T32_ERR_COM_PARA_FAIL
+            pos -= IN
+        return T32_OK
+
+    @_locked
+    def T32_RequestBreakpointObj(self, p_handle) -> int:
+        return self._request_object(p_handle, _BreakpointObj())
+
+    @_locked
+    def T32_RequestBreakpointObjAddr(self, p_handle, address) -> int:
+        if (address := self._object(address, _AddressObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        return self._request_object(p_handle, _BreakpointObj(address.copy()))
+
+    @_locked
+    def T32_ReleaseBreakpointObj(self, p_handle) -> int:
+        return self._release_object(p_handle)
+
+    @_locked
+    def T32_SetBreakpointObjAddress(self, handle, address) -> int:
+        obj, address = self._object(handle, _BreakpointObj), self._object(address, _AddressObj)
+        if obj is None or address is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.address = address.copy()
+        return T32_OK
+
+    @_locked
+    def T32_GetBreakpointObjAddress(self, handle, p_address) -> int:
+        """与 copyAddressObj 相同: *p_address 为空时分配新的地址对象, 否则覆盖其内容"""
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        target = c_void_p()
+        memmove(byref(target), p_address, sizeof(target))
+        if (address := self._object(target.value, _AddressObj)) is None:
+            return self._request_object(p_address, obj.address.copy())
+        address.__dict__.update(obj.address.__dict__)
+        return T32_OK
+
+    @_locked
+    def T32_SetBreakpointObjType(self, handle, types) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.types = _int(types)
+        return T32_OK
+
+    @_locked
+    def T32_GetBreakpointObjType(self, handle, p_types) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        _store(p_types, c_uint32, obj.types)
+        return T32_OK
+
+    @_locked
+    def T32_SetBreakpointObjImpl(self, handle, impl) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.impl = _int(impl)
+        return T32_OK
+
+    @_locked
+    def T32_GetBreakpointObjImpl(self, handle, p_impl) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        _store(p_impl, c_uint32, obj.impl)
+        return T32_OK
+
+    @_locked
+    def T32_SetBreakpointObjEnable(self, handle, enable) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        obj.disabled = 0 if _int(enable) else 1
+        return T32_OK
+
+    @_locked
+    def T32_GetBreakpointObjEnable(self, handle, p_enable) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        _store(p_enable, c_uint8, 0 if obj.disabled else 1)
+        return T32_OK
+
+    @_locked
+    def T32_ReadBreakpointObj(self, handle) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None or (params := obj.address.stream()) is None:
+            return T32_ERR_COM_PARA_FAIL
+        length = 6 + len(params)
+        self._header(length, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BREAKPOINT_OBJ_READ)
+        self._out[OUT + 4:OUT + 6] = b"\0\0"  # 按地址查找
+        self._out[OUT + 6:OUT + length] = params
+        return self._read_breakpoint_reply(obj, self._exchange(length))
+
+    @_locked
+    def T32_ReadBreakpointObjByIndex(self, handle, index) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None:
+            return T32_ERR_COM_PARA_FAIL
+        self._header(8, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BREAKPOINT_OBJ_READ)
+        self._out[OUT + 4:OUT + 6] = b"\1\0"  # 按序号查找
+        U32.pack_into(self._out, OUT + 6, _int(index))
+        return self._read_breakpoint_reply(obj, self._exchange(10))
+
+    def _read_breakpoint_reply(self, obj: _BreakpointObj, err: int) -> int:
+        if err < 0:
+            return err
+        obj.extract(self._in, IN + 4)
+        return {T32_ERR_FN1: T32_ERR_READBPOBJ_PARAFAIL, T32_ERR_FN2: T32_ERR_READBPOBJ_NOTFOUND}.get(err, err)
+
+    @_locked
+    def T32_WriteBreakpointObj(self, handle, set) -> int:
+        if (obj := self._object(handle, _BreakpointObj)) is None or (params := obj.stream()) is None:
+            return T32_ERR_COM_PARA_FAIL
+        length = 6 + len(params)
+        self._header(length, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BREAKPOINT_OBJ_WRITE)
+        self._out[OUT + 4:OUT + 6] = bytes((_int(set) & 0xFF, 0))
+        self._out[OUT + 6:OUT + length] = params
+        err = self._exchange(length)
+        if err < 0:
+            return err
+        obj.extract(self._in, IN + 4)
+        return {T32_ERR_FN1: T32_ERR_SETBP_FAILED, T32_ERR_FN2: T32_ERR_WRITEBPOBJ_FAILED}.get(err, err)
+
+    @_locked
+    def T32_QueryBreakpointObjCount(self, p_count) -> int:
+        self._header(4, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_BREAKPOINT_OBJ_QUERY)
+        self._out[OUT + 4:OUT + 6] = b"\0\0"  # 查询断点数
+        err = self._exchange(6)
+        if err >= 0:
+            _store(p_count, c_uint32, self._u32(6))
+        return err
+
+    # --------------------------------------------------------------------------
+    # note 跟踪 (Trace / Analyzer) 相关函数
+    # --------------------------------------------------------------------------
+    @_locked
+    def T32_AnaStatusGet(self, p_state, p_size, p_min, p_max) -> int:
+        err = self._simple(RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_ANALYZER_STATE)
+        if err >= 0:
+            _store(p_state, c_uint8, self._in[IN + 4])
+            _store(p_size, c_int32, I32.unpack_from(self._in, IN + 8)[0])
+            _store(p_min, c_int32, I32.unpack_from(self._in, IN + 12)[0])
+            _store(p_max, c_int32, I32.unpack_from(self._in, IN + 16)[0])
+        return err
+
+    @_locked
+    def T32_AnaRecordGet(self, record, buffer, length) -> int:
+        length = _int(length)
+        self._header(8, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_ANALYZER_READ)
+        struct.pack_into("<IH", self._out, OUT + 4, _int(record) & 0xFFFFFFFF, length & 0xFFFF)
+        err = self._exchange(10)
+        if err >= 0:
+            memmove(buffer, self._in_address + IN + 4, length or 128)
+        return err
+
+    @_locked
+    def T32_GetTraceState(self, trace_type, p_state, p_total, p_min, p_max) -> int:
+        self._header(4, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_TRACE_STATE)
+        self._out[OUT + 4:OUT + 6] = bytes((_int(trace_type) & 0xFF, 0))
+        err = self._exchange(6)
+        if err >= 0:
+            _store(p_state, c_int, self._in[IN + 4])
+            _store(p_total, c_int32, I32.unpack_from(self._in, IN + 8)[0])
+            _store(p_min, c_int32, I32.unpack_from(self._in, IN + 12)[0])
+            _store(p_max, c_int32, I32.unpack_from(self._in, IN + 16)[0])
+        return err
+
+    @_locked
+    def T32_ReadTrace(self, trace_type, start, number, mask, buffer) -> int:
+        trace_type, start, number, mask = _int(trace_type), _int(start), _int(number), _int(mask)
+        if number < 0:
+            return T32_ERR_COM_PARA_FAIL
+        nbytes = 4 * bin(mask).count("1")
+        dest, err = _address(buffer), 0
+        while not err and number > 0:
+            records = LINE_SBLOCK // nbytes if number * nbytes > LINE_SBLOCK else number
+            self._header(14, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_TRACE_READ)
+            struct.pack_into("<BBIIH", self._out, OUT + 4, trace_type & 0xFF, 0, start & 0xFFFFFFFF, mask, records)
+            err = self._exchange(16)
+            if err >= 0:
+                memmove(dest, self._in_address + IN + 4, records * nbytes)
+            start += records
+            number -= records
+            dest += records * nbytes
+        return err
+
+    # --------------------------------------------------------------------------
+    # note 通知相关函数
+    # --------------------------------------------------------------------------
+    @_locked
+    def T32_NotifyStateEnable(self, event, function) -> int:
+        event = _int(event)
+        if event >= T32_MAX_EVENTS:
+            return T32_ERR_NOTIFY_MAX_EVENT
+        self._callbacks[event] = function
+        if event == T32_E_EDIT:
+            self._header(4, RAPI_CMD_EDITNOTIFY, 0)
+            self._out[OUT + 4:OUT + 6] = b"\x01\x00"
+        else:
+            mask = sum(1 << i for i, f in enumerate(self._callbacks) if f is not None)
+            self._header(4, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_STATE_SETNOTIFIER)
+            self._out[OUT + 4:OUT + 6] = bytes((mask & 0xFF, 0))
+        if self._transmit(6) == -1:
+            return T32_ERR_COM_TRANSMIT_FAIL
+        return T32_ERR_COM_RECEIVE_FAIL if self._receive() == -1 else T32_OK
+
+    @_locked
+    def T32_NotifyEventEnable(self, event, function) -> int:
+        event = _bytes(event)
+        if len(event) + 6 > 0xFF:
+            return T32_ERR_COM_PARA_FAIL
+        self._header(len(event) + 6, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_EVENT_SETNOTIFIER)
+        self._out[OUT + 4:OUT + 6] = bytes((1 if function else 0, 0))
+        self._put_string(6, event)
+        if self._transmit((6 + len(event) + 1 + 1) & ~1) == -1:
+            return T32_ERR_COM_TRANSMIT_FAIL
+        if self._receive() == -1:
+            return T32_ERR_COM_RECEIVE_FAIL
+        if function:
+            self._event_callbacks[event] = function
+        else:
+            self._event_callbacks.pop(event, None)
+        return T32_OK
+
+    @_locked
+    def T32_NotificationPending(self) -> int:
+        return 1 if self.line.notifications else 0
+
+    @_locked
+    def T32_CheckStateNotify(self, parameter) -> int:
+        if self._in_notify:
+            return 0
+        self._in_notify = True
+        try:
+            parameter = _int(parameter)
+            while (notification := self.line.receive_notify_message()) is not None:
+                self._dispatch(parameter, *notification)
+        finally:
+            self._in_notify = False
+        return 0
+
+    def _dispatch(self, parameter: int, notify_id: int, package: bytes) -> None:
+        callback = self._callbacks[notify_id] if notify_id < T32_MAX_EVENTS else None
+        match notify_id:
+            case 0x00 if callback:
+                pc, reason = struct.unpack_from("<QQ", package, 16)
+                callback(parameter, pc, reason)
+            case 0x01 if callback:
+                line = U32.unpack_from(package, 16)[0]
+                callback(parameter, line, package[20:].split(b"\0", 1)[0])
+            case 0x02 if callback:
+                callback(parameter)
+            case 0x03:
+                event = package[16:].split(b"\0", 1)[0]
+                if event in self._event_callbacks:
+                    self._event_callbacks[event](parameter)
+            case 0x04 if callback:
+                callback(parameter, *struct.unpack_from("<QQQ", package, 16))
+            case 0x05 if callback:
+                callback(parameter, package[16], package[20:].split(b"\0", 1)[0])
+
+    # --------------------------------------------------------------------------
+    # note 高速调试（FDX）相关函数
+    # --------------------------------------------------------------------------
+    def _fdx_result(self, err: int) -> int:
+        return -1 if err else self._u32(4)
+
+    @_locked
+    def T32_Fdx_Open(self, name, mode) -> int:
+        name, mode = _bytes(name), _bytes(mode)
+        self._header(2 + len(name) + 1 + len(mode) + 1, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_FDX_OPEN)
+        self._put_string(4, name)
+        self._put_string(4 + len(name) + 1, mode)
+        return self._fdx_result(self._exchange((len(name) + len(mode) + 6 + 1) & ~1))
+
+    @_locked
+    def T32_Fdx_Close(self, channel) -> int:
+        self._header(6, RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_FDX_CLOSE)
+        U32.pack_into(self._out, OUT + 4, _int(channel) & 0xFFFFFFFF)
+        return -1 if self._exchange(8) else 0
+
+    @_locked
+    def T32_Fdx_Resolve(self, name) -> int:
+        name = _bytes(name)
+        self._header(3 + len(name), RAPI_CMD_DEVICE_SPECIFIC, RAPI_DSCMD_FDX_RESOLVE)
+        self._put_string(4, name)
+        return self._fdx_result(self._exchange((len(name) + 5 + 1) & ~1))
+
+    def _fdx_receive(self, sub: int, channel, data, width, max_size, wait: bool) -> int:
+        param_width, width, max_size = _int(width), _int(width) & 0x3F, _int(max_size)
+        if width <= 0 or width > 16 or max_size <= 0:
+            return -1
+        max_size = min(max_size * width, LINE_SBLOCK)
+        while True:
+            self._header(6, RAPI_CMD_DEVICE_SPECIFIC, sub)
+            struct.pack_into("<IBB", self._out, OUT + 4, _int(channel) & 0xFFFFFFFF, param_width & 0xFF, 0)
+            if self._transmit(10) == -1:
+                return -1
+            if (length := self._receive()) == -1:
+                return -1
+            if self._in[IN + 2]:
+                return -1
+            if (length := length - 4) < 0:
+                return -1
+            size = min(length, max_size)
+            if size > 0 or not wait:
+                break
+        if size > 0:
+            memmove(data, self._in_address + IN + 4, size)
+        return size if width <= 1 else size // width
+
+    @_locked
+    def T32_Fdx_ReceivePoll(self, channel, data, width, max_size) -> int:
+        return self._fdx_receive(RAPI_DSCMD_FDX_RECEIVEPOLL, channel, data, width, max_size, False)
+
+    @_locked
+    def T32_Fdx_Receive(self, channel, data, width, max_size) -> int:
+        return self._fdx_receive(RAPI_DSCMD_FDX_RECEIVE, channel, data, width, max_size, True)
+
+    def _fdx_send(self, sub: int, channel, data, width, size, wait: bool) -> int:
+        width, size = _int(width), _int(size)
+        if width <= 0 or width > 16:
+            return -1
+        bsize = size * width
+        if bsize > LINE_SBLOCK or bsize <= 0:
+            return -1
+        while True:
+            self._header(0, RAPI_CMD_DEVICE_SPECIFIC, sub)
+            struct.pack_into("<IBBH", self._out, OUT + 4, _int(channel) & 0xFFFFFFFF, width, 0, 10 + bsize)
+            memmove(self._out_address + OUT + 12, data, bsize)
+            if self._transmit((bsize + 12 + 1) & ~1) == -1:
+                return -1
+            if self._receive() == -1:
+                return -1
+            if self._in[IN + 2] != 1 or not wait:
+                break
+        if self._in[IN + 2] == 1:
+            return 0
+        return -1 if self._in[IN + 2] else size
+
+    @_locked
+    def T32_Fdx_SendPoll(self, channel, data, width, size) -> int:
+        return self._fdx_send(RAPI_DSCMD_FDX_TRANSMITPOLL, channel, data, width, size, False)
+
+    @_locked
+    def T32_Fdx_Send(self, channel, data, width, size) -> int:
+        return self._fdx_send(RAPI_DSCMD_FDX_TRANSMIT, channel, data, width, size, True)
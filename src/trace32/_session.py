@@ -0,0 +1,155 @@
+"""
+@文件: _session.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 每个连接一个会话对象, 持有自己的通道缓冲区, 在多个仿真器之间安全切换
+@许可: MIT License
+@版本: Version 1.0
+"""
+import contextlib
+import functools
+import threading
+from types import GeneratorType
+from typing import Callable
+
+from . import _trace32
+from ._cache import BreakpointCache, MemoryCache, RegisterCache
+from ._symbols import SymbolCache
+from ._trace32 import T32, _lookup_symbol
+
+# 保护 Remote API 的全局状态 (当前通道): 切换通道与随后的调用必须作为一个整体执行
+_lock = threading.RLock()
+
+
+class T32Session:
+    """
+    与一个 PowerView 实例的连接
+
+    每个会话持有自己的通道缓冲区 (T32_GetChannelDefaults), 符号缓存, 寄存器缓存, 内存缓存和断点表镜像。会话对象提供 T32 的全部函数,
+    如 session.cmd("Go"), session.read_memory(...); 调用前如当前通道不是本会话的通道, 先执行一次 T32_SetChannel。
+    切换与调用在同一把进程级锁内完成, 不同线程上交替使用多个会话不会互相干扰; 调用结束后恢复之前的通道与各缓存,
+    直接调用 T32 的静态函数仍使用默认连接 (或 T32.set_channel 选中的通道), 且不受该锁保护。
+    返回生成器的函数 (如 iter_window_rows) 每取一项都会重新切换到本会话。
+
+    :param host: PowerView 所在主机
+    :param port: Remote API 端口
+    :param packlen: UDP 最大包长度
+    :param timeout: 通信超时, 单位秒, None 使用默认值
+    """
+
+    _shared = {}
+
+    def __init__(self, host: str = "localhost", port: int = 20000, packlen: int = 1024, timeout: float = None):
+        self.host = host
+        self.port = port
+        self.packlen = packlen
+        self.timeout = timeout
+        self.symbols = SymbolCache(_lookup_symbol, lambda address: T32.get_symbol_from_address(address))
+        self.registers = RegisterCache(T32.get_state)
+        self.memory = MemoryCache(self.registers.halt_epoch)
+        self.breakpoints = BreakpointCache(T32._read_breakpoint_table)
+        with _lock:
+            self._channel = T32._new_channel()
+        with self._active():
+            T32.config("NODE", host)
+            T32.config("PORT", str(port))
+            T32.config("PACKLEN", str(packlen))
+            if timeout is not None:
+                T32.config("TIMEOUT", str(timeout))
+
+    @classmethod
+    def shared(cls, host: str, port: int) -> "T32Session":
+        """
+        获取 (不存在时创建并连接) host:port 对应的共享会话, 供 T32.set_channel 使用
+
+        :param host: PowerView 所在主机
+        :param port: Remote API 端口
+        :return: 会话
+        """
+        with _lock:
+            if (host, port) not in cls._shared:
+                session = cls(host, port)
+                session.open()
+                cls._shared[host, port] = session
+            return cls._shared[host, port]
+
+    def __repr__(self) -> str:
+        return f"T32Session({self.host!r}, {self.port})"
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self) -> None:
+        """连接 PowerView (T32_Init)"""
+        self.call(T32.init)
+
+    def close(self) -> None:
+        """断开连接 (T32_Exit)"""
+        self.call(T32.exit)
+
+    def activate(self) -> None:
+        """把本会话的通道, 符号缓存, 寄存器缓存, 内存缓存和断点表镜像设为当前使用的 (之后直接调用 T32 也使用本会话)"""
+        with _lock:
+            T32._select_channel(self._channel)
+            _trace32._symbols = self.symbols
+            _trace32._registers = self.registers
+            _trace32._memory = self.memory
+            _trace32._breakpoints = self.breakpoints
+
+    @contextlib.contextmanager
+    def _active(self):
+        """在 with 块内持有锁并使用本会话, 结束后恢复之前的通道与缓存"""
+        with _lock:
+            previous = (
+                _trace32._current_channel, _trace32._symbols, _trace32._registers, _trace32._memory,
+                _trace32._breakpoints,
+            )
+            try:
+                self.activate()
+                yield
+            finally:
+                channel, _trace32._symbols, _trace32._registers, _trace32._memory, _trace32._breakpoints = previous
+                T32._select_channel(channel)
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        在本会话的通道上执行 func
+
+        :param func: T32 的函数或其他调用 Remote API 的函数
+        :return: func 的返回值, 生成器被包装为每一步都在本会话上执行的生成器
+        """
+        with self._active():
+            result = func(*args, **kwargs)
+        if isinstance(result, GeneratorType):
+            return self._iterate(result)
+        return result
+
+    def _iterate(self, generator: GeneratorType):
+        try:
+            while True:
+                with self._active():
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                yield item
+        finally:
+            with self._active():
+                generator.close()
+
+    def __getattr__(self, name: str):
+        attr = getattr(T32, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def method(*args, **kwargs):
+            return self.call(attr, *args, **kwargs)
+
+        # 缓存包装后的函数, 之后的访问不再经过 __getattr__
+        setattr(self, name, method)
+        return method
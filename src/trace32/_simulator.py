@@ -0,0 +1,887 @@
+"""
+@文件: _simulator.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 本地 PowerView 模拟服务器, 实现 Remote API 协议的服务端, 用于无硬件的测试与性能测量
+@许可: MIT License
+@版本: Version 1.0
+"""
+import random
+import select
+import socket
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+
+from ._remote import *
+from ._remote import _AddressObj, _BreakpointObj
+
+PAGE_SIZE = 0x1000
+
+
+class SparseMemory:
+    """按页分配的稀疏内存, 未写入过的区域读出为 0"""
+
+    def __init__(self):
+        self.pages = {}
+
+    def read(self, address: int, size: int) -> bytes:
+        result = bytearray(size)
+        pos = 0
+        while pos < size:
+            page, offset = divmod(address + pos, PAGE_SIZE)
+            length = min(size - pos, PAGE_SIZE - offset)
+            if page in self.pages:
+                result[pos:pos + length] = self.pages[page][offset:offset + length]
+            pos += length
+        return bytes(result)
+
+    def write(self, address: int, data: bytes) -> None:
+        pos = 0
+        while pos < len(data):
+            page, offset = divmod(address + pos, PAGE_SIZE)
+            length = min(len(data) - pos, PAGE_SIZE - offset)
+            self.pages.setdefault(page, bytearray(PAGE_SIZE))[offset:offset + length] = data[pos:pos + length]
+            pos += length
+
+
+@dataclass
+class SimulatedFdxChannel:
+    """模拟的 FDX 通道, to_host 为目标发往主机的记录, from_host 为主机发往目标的记录"""
+    name: str
+    capacity: int = 64
+    to_host: deque = field(default_factory=deque)
+    from_host: deque = field(default_factory=deque)
+    opened: bool = False
+
+
+@dataclass
+class _Connection:
+    """单个客户端的链路状态"""
+    address: tuple
+    packet_size: int = 1024
+    tx_seq: int = 1
+    partial: bytearray = None
+    partial_start: int = 0
+    expected: int = 0
+    last_start: int = -1
+    last_end: int = -1
+    last_reply: list = field(default_factory=list)
+    last_reply_time: float = 0.0
+    retransmits: int = 0
+
+
+class PowerViewSimulator:
+    """
+    本地 PowerView 模拟服务器
+
+    在 UDP 端口上实现 hremote.c 所使用的 Remote API 服务端协议, 并以模拟的内存, 寄存器, 符号表,
+    窗口内容和 FDX 通道作为后端。可注入固定延迟和丢包以模拟真实链路。
+
+    使用示例::
+
+        with PowerViewSimulator(latency=0.001, loss=0.01) as sim:
+            T32.config('NODE', 'localhost')
+            T32.config('PORT', str(sim.port))
+            T32.init()
+
+    :param host: 监听地址
+    :param port: 监听端口, 0 表示自动分配 (见 port 属性)
+    :param latency: 每个应答前的延迟, 单位秒
+    :param loss: 收发每个数据包时的丢包概率 [0, 1)
+    :param retransmit_timeout: 没有收到新请求时重发上一应答的间隔, 默认在 loss > 0 时为 0.05 秒, 否则不重发
+    :param seed: 丢包随机数种子
+    """
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            latency: float = 0.0,
+            loss: float = 0.0,
+            retransmit_timeout: float = None,
+            seed: int = None,
+    ):
+        self.latency = latency
+        self.loss = loss
+        self.retransmit_timeout = retransmit_timeout if retransmit_timeout is not None else (0.05 if loss else None)
+        self._random = random.Random(seed)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.sock.bind((host, port))
+        self.host, self.port = self.sock.getsockname()
+
+        self._connections = {}
+        self._thread = None
+        self._running = False
+        self.lock = threading.RLock()
+
+        # 模拟的目标状态
+        self.memory = SparseMemory()
+        self.inaccessible = []
+        self.registers = {f"R{i}": 0 for i in range(16)} | {"PC": 0, "SP": 0, "CPSR": 0}
+        self.symbols = {}
+        self.windows = {}
+        self.fdx = {}
+        self.breakpoints = {}
+        # 通过断点对象设置的断点的实现方式和是否禁用: 地址 -> (impl, disabled)
+        self.breakpoint_attributes = {}
+        self.trace = []
+        self.trace_state = 0
+        self.notify_mask = 0
+        self.notify_events = set()
+        self.state = 2
+        self.practice_state = 0
+        self.eval_value = 0
+        self.eval_string = ""
+        self.data_sum = 0
+        self.message = ("", 0)
+        self.cpu = ("CortexM4", 0, 0)
+        self.commands = []
+        self.stats = {"requests": 0, "duplicates": 0, "dropped": 0, "retransmits": 0, "errors": 0}
+        # 处理请求时抛出的最后一个异常 (应答 T32_ERR_STD_INVALID), 便于测试中检查
+        self.last_error = None
+
+        self.handlers = {
+            (RAPI_CMD_NOP, None): self._nop,
+            (RAPI_CMD_PING, None): self._ok,
+            (RAPI_CMD_ATTACH, None): self._ok,
+            (RAPI_CMD_TERMINATE, None): self._ok,
+            (RAPI_CMD_GETMSG, None): self._get_message,
+            (RAPI_CMD_EXECUTE_PRACTICE, 0x00): self._ok,
+            (RAPI_CMD_EXECUTE_PRACTICE, 0x02): self._cmd,
+            (RAPI_CMD_EXECUTE_PRACTICE, 0x03): self._practice_state,
+            (RAPI_CMD_EDITNOTIFY, None): self._edit_notifier,
+            RAPI_DSCMD_STATE_SETNOTIFIER: self._state_notifier,
+            RAPI_DSCMD_EVENT_SETNOTIFIER: self._event_notifier,
+            RAPI_DSCMD_GETSTATE: self._get_state,
+            RAPI_DSCMD_RESET: self._reset,
+            RAPI_DSCMD_GETCPUINFO: self._get_cpu_info,
+            RAPI_DSCMD_EVAL_GETVALUE: lambda msg: (0, U32.pack(self.eval_value & 0xFFFFFFFF)),
+            RAPI_DSCMD_EVAL_GETSTRING: lambda msg: (0, self.eval_string.encode("GBK") + b"\0"),
+            RAPI_DSCMD_GETLASTERRMSG: lambda msg: (0, bytes(12)),
+            RAPI_DSCMD_REGISTER_READ: self._read_register,
+            RAPI_DSCMD_REGISTER_WRITE: self._write_register,
+            RAPI_DSCMD_REGISTER_PC_READ: lambda msg: (0, U32.pack(self.registers["PC"] & 0xFFFFFFFF)),
+            RAPI_DSCMD_REGISTER_READBYNAME: self._read_register_by_name,
+            RAPI_DSCMD_REGISTER_WRITEBYNAME: self._write_register_by_name,
+            RAPI_DSCMD_REGISTERSET_OBJ_READ: self._register_set,
+            RAPI_DSCMD_REGISTERSET_OBJ_WRITE: self._register_set,
+            RAPI_DSCMD_MEMORY_READ: self._read_memory,
+            RAPI_DSCMD_MEMORY_WRITE: self._write_memory,
+            RAPI_DSCMD_MEMORY_WRITEPIPE: self._write_memory,
+            RAPI_DSCMD_MEMORY_ACCESS_SET: self._ok,
+            RAPI_DSCMD_BUNDLE_OBJ_TRANSFER: self._bundle_transfer,
+            RAPI_DSCMD_BREAKPOINT_SET: self._set_breakpoint,
+            RAPI_DSCMD_BREAKPOINT_CLEAR: self._clear_breakpoint,
+            RAPI_DSCMD_BREAKPOINT_GET: self._get_breakpoint,
+            RAPI_DSCMD_BREAKPOINT_LIST: self._list_breakpoints,
+            RAPI_DSCMD_BREAKPOINT_OBJ_READ: self._read_breakpoint_obj,
+            RAPI_DSCMD_BREAKPOINT_OBJ_WRITE: self._write_breakpoint_obj,
+            RAPI_DSCMD_BREAKPOINT_OBJ_QUERY: lambda msg: (0, U16.pack(0) + U32.pack(len(self.breakpoints))),
+            RAPI_DSCMD_GO: lambda msg: self._set_state(3),
+            RAPI_DSCMD_BREAK: lambda msg: self._set_state(2),
+            RAPI_DSCMD_STEP_SINGLE: self._ok,
+            RAPI_DSCMD_STEP_MODE: self._ok,
+            RAPI_DSCMD_MODE_SET: self._ok,
+            RAPI_DSCMD_SYMBOL_GET: self._get_symbol,
+            RAPI_DSCMD_SYMBOL_GETBYADDRESS: self._get_symbol_by_address,
+            RAPI_DSCMD_VARIABLE_READVALUE: self._read_variable_value,
+            RAPI_DSCMD_VARIABLE_READSTRING: self._read_variable_string,
+            RAPI_DSCMD_VARIABLE_WRITEVALUE: self._write_variable_value,
+            RAPI_DSCMD_WINDOW_CONTENT: self._window_content,
+            RAPI_DSCMD_TRACE_STATE: self._trace_status,
+            RAPI_DSCMD_ANALYZER_STATE: self._trace_status,
+            RAPI_DSCMD_ANALYZER_READ: self._analyzer_record,
+            RAPI_DSCMD_TRACE_READ: self._read_trace,
+            RAPI_DSCMD_API_LOCK: self._ok,
+            RAPI_DSCMD_API_UNLOCK: self._ok,
+            RAPI_DSCMD_FDX_RESOLVE: self._fdx_resolve,
+            RAPI_DSCMD_FDX_OPEN: self._fdx_open,
+            RAPI_DSCMD_FDX_CLOSE: self._fdx_close,
+            RAPI_DSCMD_FDX_RECEIVE: self._fdx_receive,
+            RAPI_DSCMD_FDX_RECEIVEPOLL: self._fdx_receive,
+            RAPI_DSCMD_FDX_TRANSMIT: self._fdx_transmit,
+            RAPI_DSCMD_FDX_TRANSMITPOLL: self._fdx_transmit,
+        }
+        self.command_handlers = {
+            "GO": lambda args: self._set_state(3),
+            "G": lambda args: self._set_state(3),
+            "BREAK": lambda args: self._set_state(2),
+            "SYSTEM.UP": lambda args: self._set_state(2),
+            "SYSTEM.DOWN": lambda args: self._set_state(0),
+            "REGISTER.SET": self._cmd_register_set,
+            "PRINT": self._cmd_print,
+            "EVAL": self._cmd_eval,
+            "DATA.SUM": self._cmd_data_sum,
+        }
+
+    # --------------------------------------------------------------------------
+    # note 目标状态配置
+    # --------------------------------------------------------------------------
+    def add_symbol(self, name: str, address: int, size: int = 4, value: int | bytes = None) -> None:
+        """
+        添加符号, 同时可以设置其初始值
+
+        :param name: 符号名
+        :param address: 地址
+        :param size: 字节数
+        :param value: 初始值, 整数按小端写入
+        """
+        with self.lock:
+            self.symbols[name] = (address, size)
+            if value is not None:
+                if isinstance(value, int):
+                    value = value.to_bytes(size, "little")
+                self.memory.write(address, value)
+
+    def add_window(self, command: str, content) -> None:
+        """
+        设置窗口命令 (如 "Register.view") 的输出内容
+
+        :param command: 窗口命令, 不区分大小写
+        :param content: 字符串, 或接受打印格式 (0-4) 返回字符串的函数
+        """
+        with self.lock:
+            self.windows[command.upper()] = content
+
+    def add_inaccessible(self, start: int, size: int) -> None:
+        """将 [start, start + size) 设为不可访问区域, 读写该区域会返回总线错误"""
+        with self.lock:
+            self.inaccessible.append((start, start + size))
+
+    def add_trace(self, records) -> None:
+        """
+        追加跟踪记录, 最新的记录编号为 0, 更早的记录编号依次为 -1, -2, ...
+
+        :param records: (周期类型, 地址, 数据, 时间戳) 序列, 同时作为分析器 (Analyzer) 的记录
+        """
+        with self.lock:
+            self.trace.extend(tuple(record) for record in records)
+
+    def notify(self, notify_id: int, payload: bytes = b"") -> None:
+        """
+        向所有客户端发送通知包 (T32_E_BREAK, T32_E_EDIT ...), 客户端未启用的通知不发送
+
+        :param notify_id: 通知类型
+        :param payload: 通知包第 16 字节起的内容
+        """
+        with self.lock:
+            if notify_id == T32_E_ONEVENT:
+                if payload.split(b"\0", 1)[0] not in self.notify_events:
+                    return
+            elif not self.notify_mask >> notify_id & 1:
+                return
+            packet = bytes((T32_API_NOTIFICATION, notify_id)) + bytes(14) + payload
+            for conn in list(self._connections.values()):
+                self._send(packet, conn.address)
+
+    def trigger_break(self, pc: int = None, reason: int = 0) -> None:
+        """模拟目标停止 (如命中断点), 状态变为已停止并发送 T32_E_BREAK 通知"""
+        with self.lock:
+            if pc is not None:
+                self.registers["PC"] = pc
+            self.state = 2
+            self.notify(T32_E_BREAK, struct.pack("<QQ", self.registers["PC"], reason))
+
+    def trigger_event(self, name: str) -> None:
+        """模拟 PRACTICE ON 事件, 发送 T32_E_ONEVENT 通知"""
+        self.notify(T32_E_ONEVENT, name.encode("GBK") + b"\0")
+
+    def _accessible(self, address: int, size: int) -> bool:
+        return not any(start < address + size and address < end for start, end in self.inaccessible)
+
+    def fdx_channel(self, name: str, capacity: int = 64) -> SimulatedFdxChannel:
+        """获取 (不存在时创建) 名为 name 的 FDX 通道"""
+        with self.lock:
+            if name not in self.fdx:
+                self.fdx[name] = SimulatedFdxChannel(name, capacity)
+            return self.fdx[name]
+
+    # --------------------------------------------------------------------------
+    # note 服务器生命周期
+    # --------------------------------------------------------------------------
+    def start(self) -> 'PowerViewSimulator':
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._serve, name="PowerViewSimulator", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sock.close()
+
+    def __enter__(self) -> 'PowerViewSimulator':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _lost(self) -> bool:
+        if self.loss and self._random.random() < self.loss:
+            self.stats["dropped"] += 1
+            return True
+        return False
+
+    def _send(self, data: bytes, address) -> None:
+        if not self._lost():
+            self.sock.sendto(data, address)
+
+    def _serve(self) -> None:
+        buffer = bytearray(PCKLEN_MAX)
+        view = memoryview(buffer)
+        while self._running:
+            if not select.select((self.sock,), (), (), self.retransmit_timeout or 0.1)[0]:
+                self._retransmit()
+                continue
+            try:
+                size, address = self.sock.recvfrom_into(buffer)
+            except OSError:
+                continue
+            if size < 4 or self._lost():
+                continue
+            with self.lock:
+                self._packet(bytes(view[:size]), address)
+
+    def _retransmit(self) -> None:
+        """长时间没有收到新请求时重发上一个应答, 使客户端能够发现丢失的请求或应答"""
+        if self.retransmit_timeout is None:
+            return
+        now = time.monotonic()
+        for conn in self._connections.values():
+            if conn.last_reply and conn.retransmits < 8 and now - conn.last_reply_time > self.retransmit_timeout:
+                conn.retransmits += 1
+                conn.last_reply_time = now
+                self.stats["retransmits"] += 1
+                for packet in conn.last_reply:
+                    self._send(packet, conn.address)
+
+    def _packet(self, packet: bytes, address) -> None:
+        kind = packet[0]
+        if kind == T32_API_CONNECTREQUEST:
+            conn = self._connections[address] = _Connection(address, len(packet))
+            ack = bytearray(len(packet))
+            ack[0] = T32_API_CONNECTACKN
+            U16.pack_into(ack, 2, conn.tx_seq)
+            ack[8:16] = MAGIC
+            self._send(bytes(ack), address)
+            return
+
+        conn = self._connections.get(address)
+        if conn is None:
+            return
+        if kind == T32_API_SYNCREQUEST:
+            self._send(struct.pack("<BBHI", T32_API_SYNCACKN, 0, conn.tx_seq, 0) + MAGIC, address)
+        elif kind == T32_API_DISCONNECT:
+            del self._connections[address]
+        elif kind == T32_API_TRANSMIT:
+            self._transmit_packet(conn, packet)
+
+    def _transmit_packet(self, conn: _Connection, packet: bytes) -> None:
+        seq, more = U16.unpack_from(packet, 2)[0], packet[1]
+        if conn.last_start >= 0 and (seq - conn.last_start) & 0xFFFF <= (conn.last_end - conn.last_start) & 0xFFFF:
+            # 已处理过的请求被重发, 说明应答丢失, 直接重发应答而不重复执行
+            if not more:
+                self.stats["duplicates"] += 1
+                for reply in conn.last_reply:
+                    self._send(reply, conn.address)
+            return
+
+        if conn.partial is None or seq != conn.expected:
+            conn.partial, conn.partial_start = bytearray(), seq
+        conn.partial += packet[4:]
+        conn.expected = (seq + 1) & 0xFFFF
+        if more:
+            return
+
+        message, conn.partial = conn.partial, None
+        conn.last_start, conn.last_end = conn.partial_start, seq
+        if len(message) < 9:
+            return
+        reply = self._dispatch(memoryview(message)[5:])
+        if self.latency:
+            time.sleep(self.latency)
+        conn.last_reply = self._packets(conn, reply)
+        conn.last_reply_time = time.monotonic()
+        conn.retransmits = 0
+        for reply in conn.last_reply:
+            self._send(reply, conn.address)
+
+    def _packets(self, conn: _Connection, message: bytes) -> list[bytes]:
+        """将应答消息拆成若干带包头的数据包"""
+        payload = conn.packet_size - 4
+        packets = []
+        for pos in range(0, len(message), payload):
+            more = 1 if pos + payload < len(message) else 0
+            packets.append(struct.pack("<BBH", T32_API_RECEIVE, more, conn.tx_seq) + message[pos:pos + payload])
+            conn.tx_seq = (conn.tx_seq + 1) & 0xFFFF
+        return packets
+
+    def _dispatch(self, message: memoryview) -> bytes:
+        """执行一条请求, 返回 1 字节消息头 + T32_INBUFFER 形式的应答"""
+        self.stats["requests"] += 1
+        cmd, sub, msgid = message[1], message[2], message[3]
+        if cmd == RAPI_CMD_DEVICE_SPECIFIC:
+            handler = self.handlers.get(sub)
+        else:
+            handler = self.handlers.get((cmd, sub)) or self.handlers.get((cmd, None))
+        if handler is None:
+            err, data = T32_ERR_STD_INVALID, b""
+        else:
+            try:
+                err, data = handler(message)
+            except Exception as e:
+                # 格式错误的请求不能让服务线程退出, 否则之后的所有请求都会超时
+                self.stats["errors"] += 1
+                self.last_error = e
+                err, data = T32_ERR_STD_INVALID, b""
+        return bytes((0, (len(data) + 2) & 0xFF, cmd, err, msgid)) + data
+
+    # --------------------------------------------------------------------------
+    # note 请求处理
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _string(message: memoryview, pos: int) -> str:
+        data = bytes(message[pos:])
+        return data.split(b"\0", 1)[0].decode("GBK")
+
+    @staticmethod
+    def _ok(message) -> tuple[int, bytes]:
+        return 0, b""
+
+    def _nop(self, message) -> tuple[int, bytes]:
+        return 0, b""
+
+    def _set_state(self, state: int) -> tuple[int, bytes]:
+        if self.state == 3 and state == 2:
+            self.trigger_break()
+        self.state = state
+        return 0, b""
+
+    def _state_notifier(self, message) -> tuple[int, bytes]:
+        self.notify_mask = message[4] & ~(1 << T32_E_EDIT) | self.notify_mask & 1 << T32_E_EDIT
+        return 0, b""
+
+    def _edit_notifier(self, message) -> tuple[int, bytes]:
+        self.notify_mask |= 1 << T32_E_EDIT
+        return 0, b""
+
+    def _event_notifier(self, message) -> tuple[int, bytes]:
+        name = self._string(message, 6).encode("GBK")
+        if message[4]:
+            self.notify_events.add(name)
+        else:
+            self.notify_events.discard(name)
+        return 0, b""
+
+    def _get_state(self, message) -> tuple[int, bytes]:
+        return 0, bytes((self.state, 0))
+
+    def _reset(self, message) -> tuple[int, bytes]:
+        self.registers = dict.fromkeys(self.registers, 0)
+        return 0, b""
+
+    def _get_cpu_info(self, message) -> tuple[int, bytes]:
+        name, fpu, endian = self.cpu
+        return 0, name.encode("ascii")[:15].ljust(16, b"\0") + struct.pack("<HHH", 0, fpu, endian)
+
+    def _practice_state(self, message) -> tuple[int, bytes]:
+        return 0, bytes((self.practice_state, 0))
+
+    def _get_message(self, message) -> tuple[int, bytes]:
+        text, kind = self.message
+        return 0, U32.pack(kind) + text.encode("GBK") + b"\0"
+
+    def _cmd(self, message) -> tuple[int, bytes]:
+        command = self._string(message, 6 if message[0] == 0 else 4)
+        self.commands.append(command)
+        name, _, args = command.strip().partition(" ")
+        handler = self.command_handlers.get(name.upper())
+        if handler is None:
+            return 0, b""
+        return handler(args.strip())
+
+    def _cmd_register_set(self, args: str) -> tuple[int, bytes]:
+        name, _, value = args.partition(" ")
+        if name.upper() not in self.registers:
+            return T32_ERR_STD_INVALID, b""
+        self.registers[name.upper()] = int(value.strip(), 0)
+        return 0, b""
+
+    def _cmd_print(self, args: str) -> tuple[int, bytes]:
+        text = args.removeprefix("%CONTinue").strip().strip('"')
+        self.message = (text, 2)
+        return 0, b""
+
+    def _cmd_eval(self, args: str) -> tuple[int, bytes]:
+        if args.upper() == "DATA.SUM()":
+            self.eval_value = self.data_sum
+            return 0, b""
+        try:
+            self.eval_value = int(args, 0)
+        except ValueError:
+            self.eval_string = args.strip('"')
+        return 0, b""
+
+    def _cmd_data_sum(self, args: str) -> tuple[int, bytes]:
+        # 只支持 Data.SUM [<访问类型>:]<起始>--<结束> /CRC32
+        span, _, option = args.partition("/")
+        if option.strip().upper() != "CRC32":
+            return T32_ERR_STD_INVALID, b""
+        start, _, end = span.strip().rpartition(":")[2].partition("--")
+        try:
+            start, end = int(start, 0), int(end, 0)
+        except ValueError:
+            return T32_ERR_STD_INVALID, b""
+        self.data_sum = zlib.crc32(self.memory.read(start, end - start + 1))
+        return 0, b""
+
+    def _register_list(self) -> list[str]:
+        return list(self.registers)
+
+    def _read_register(self, message) -> tuple[int, bytes]:
+        lower, upper = struct.unpack_from("<II", message, 4)
+        mask, names = lower | upper << 32, self._register_list()
+        return 0, b"".join(
+            U32.pack(self.registers[names[i]] & 0xFFFFFFFF if i < len(names) else 0)
+            for i in range(64) if mask >> i & 1
+        )
+
+    def _write_register(self, message) -> tuple[int, bytes]:
+        lower, upper = struct.unpack_from("<II", message, 4)
+        mask, names, pos = lower | upper << 32, self._register_list(), 12
+        for i in range(64):
+            if mask >> i & 1:
+                if i < len(names):
+                    self.registers[names[i]] = U32.unpack_from(message, pos)[0]
+                pos += 4
+        return 0, b""
+
+    def _read_register_by_name(self, message) -> tuple[int, bytes]:
+        name = self._string(message, 4).upper()
+        if name not in self.registers:
+            return T32_ERR_FN1, bytes(8)
+        value = self.registers[name]
+        return 0, struct.pack("<II", value & 0xFFFFFFFF, value >> 32 & 0xFFFFFFFF)
+
+    def _write_register_by_name(self, message) -> tuple[int, bytes]:
+        lower, upper = struct.unpack_from("<II", message, 4)
+        name = self._string(message, 12).upper()
+        if name not in self.registers:
+            return T32_ERR_FN1, b""
+        self.registers[name] = lower | upper << 32
+        return 0, b""
+
+    def _register_set(self, message) -> tuple[int, bytes]:
+        # hremote.c 发送的报文比其中声明的长度少 4 字节 (LINE_Transmit(index - 4)), 缺少的部分 (最后的结束标记)
+        # 以 0 补齐, 0 与结束标记同样处理; 其他格式错误的请求返回参数错误
+        if len(message) < 8:
+            return T32_ERR_FN1, b""
+        message = bytes(message).ljust(U16.unpack_from(message, 4)[0], b"\0")
+        try:
+            return self._transfer_register_set(message)
+        except struct.error:
+            return T32_ERR_FN1, b""
+
+    def _transfer_register_set(self, message: bytes) -> tuple[int, bytes]:
+        # 寄存器 ID 为其在 registers 中的序号; 按名称访问时在应答中返回 ID, 之后客户端可以直接使用
+        write = message[2] == RAPI_DSCMD_REGISTERSET_OBJ_WRITE
+        names, pos = self._register_list(), 8
+        count = U16.unpack_from(message, 6)[0]
+        reply = bytearray(U16.pack(count))
+        for _ in range(count):
+            kind, reg_id, name = U16.unpack_from(message, pos)[0], T32_INVALID_REGID, ""
+            pos += 2
+            while (tag := U16.unpack_from(message, pos)[0]) not in (0x5858, 0):
+                if tag == 0x4944:
+                    reg_id = U32.unpack_from(message, pos + 2)[0]
+                    pos += 6
+                elif tag == 0x4D4E:
+                    length = U16.unpack_from(message, pos + 2)[0]
+                    name = bytes(message[pos + 4:pos + 4 + length]).split(b"\0", 1)[0].decode("GBK").upper()
+                    pos += 4 + length
+                else:
+                    pos += 4
+            pos += 2
+            if kind not in T32_REGTYPE_SIZES:
+                return T32_ERR_FN1, b""
+            if reg_id >= len(names):
+                if name not in self.registers:
+                    return T32_ERR_FN3, b""
+                reg_id = names.index(name)
+            size = T32_REGTYPE_SIZES[kind]
+            if write:
+                if pos + size > len(message):
+                    return T32_ERR_FN1, b""
+                self.registers[names[reg_id]] = int.from_bytes(message[pos:pos + size], "little")
+                pos += size
+            value = self.registers[names[reg_id]] & ((1 << 8 * size) - 1)
+            reply += struct.pack("<HHIH", kind, 0x4944, reg_id, 0x414C) + value.to_bytes(size, "little") + U16.pack(0x5858)
+        return 0, bytes(reply + U16.pack(0x5858))
+
+    def _read_memory(self, message) -> tuple[int, bytes]:
+        address, access, _, size = struct.unpack_from("<IBBH", message, 4)
+        if not self._accessible(address, size):
+            return 16, bytes(size)
+        return 0, self.memory.read(address, size)
+
+    def _write_memory(self, message) -> tuple[int, bytes]:
+        if len(message) < 12:
+            return 0, b""
+        address, access, _, size = struct.unpack_from("<IBBH", message, 4)
+        if not self._accessible(address, size):
+            return 16, b""
+        self.memory.write(address, bytes(message[12:12 + size]))
+        return 0, b""
+
+    @staticmethod
+    def _address_params(message, pos: int) -> tuple[int, int]:
+        """解析 streamAddressParams 生成的地址参数, 返回 (地址, 之后的位置)"""
+        kind = U16.unpack_from(message, pos)[0]
+        address = (U64 if kind == T32_ADDRTYPE_A64 else U32).unpack_from(message, pos + 2)[0]
+        pos += 10 if kind == T32_ADDRTYPE_A64 else 6
+        while (tag := U16.unpack_from(message, pos)[0]) != 0x5858:
+            if tag == 0x4341:
+                pos += 4 + U16.unpack_from(message, pos + 2)[0]
+            elif tag in (0x4953, 0x4A41):
+                pos += 6
+            else:
+                pos += 4
+        return address, pos + 2
+
+    def _bundle_transfer(self, message) -> tuple[int, bytes]:
+        count, pos, reply = U16.unpack_from(message, 6)[0], 8, bytearray()
+        for _ in range(count):
+            read, size = struct.unpack_from("<HH", message, pos)
+            address, pos = self._address_params(message, pos + 4)
+            ok = self._accessible(address, size)
+            reply += U16.pack(ok)
+            if read:
+                if ok:
+                    reply += self.memory.read(address, size)
+            else:
+                if ok:
+                    self.memory.write(address, bytes(message[pos:pos + size]))
+                pos += (size + 1) & ~1
+        return 0, bytes(reply)
+
+    def _set_breakpoint(self, message) -> tuple[int, bytes]:
+        address, access, config, size = struct.unpack_from("<IBBH", message, 4)
+        for i in range(size):
+            self.breakpoints[address + i] = self.breakpoints.get(address + i, 0) | config
+        self.notify(T32_E_BREAKPOINTCONFIG)
+        return 0, b""
+
+    def _clear_breakpoint(self, message) -> tuple[int, bytes]:
+        address, access, config, size = struct.unpack_from("<IBBH", message, 4)
+        for i in range(size):
+            if (value := self.breakpoints.get(address + i, 0) & ~config) or config == 0:
+                self.breakpoints[address + i] = value
+            else:
+                self.breakpoints.pop(address + i, None)
+                self.breakpoint_attributes.pop(address + i, None)
+        self.notify(T32_E_BREAKPOINTCONFIG)
+        return 0, b""
+
+    def _get_breakpoint(self, message) -> tuple[int, bytes]:
+        address, access, _, size = struct.unpack_from("<IBBH", message, 4)
+        return 0, b"".join(U16.pack(self.breakpoints.get(address + i, 0)) for i in range(size))
+
+    def _list_breakpoints(self, message) -> tuple[int, bytes]:
+        limit = U16.unpack_from(message, 4)[0]
+        reply = bytearray()
+        for address in sorted(self.breakpoints)[:limit]:
+            impl, disabled = self.breakpoint_attributes.get(address, (0, 0))
+            reply += struct.pack("<IBII", address, not disabled, self._breakpoint_types(address), impl)
+        return 0, U16.pack(len(reply) // 13) + bytes(reply)
+
+    # 断点对象的类型 (T32_BP_TYPE_*) 与旧式断点配置 (T32_BPCONFIG_*) 的对应关系
+    _BREAKPOINT_CONFIG = {T32_BP_TYPE_PROGRAM: 0x001, T32_BP_TYPE_READ: 0x008, T32_BP_TYPE_WRITE: 0x010}
+
+    def _breakpoint_types(self, address: int) -> int:
+        config = self.breakpoints.get(address, 0)
+        return sum(kind for kind, bit in self._BREAKPOINT_CONFIG.items() if config & bit)
+
+    def _breakpoint_obj(self, address: int) -> _BreakpointObj:
+        obj = _BreakpointObj(_AddressObj(T32_ADDRTYPE_A64 if address > 0xFFFFFFFF else T32_ADDRTYPE_A32, address))
+        obj.types = self._breakpoint_types(address)
+        obj.impl, obj.disabled = self.breakpoint_attributes.get(address, (0, 0))
+        return obj
+
+    def _read_breakpoint_obj(self, message) -> tuple[int, bytes]:
+        if message[4] == 0:
+            address = _AddressObj()
+            if address.extract(message, 6) is None:
+                return T32_ERR_FN1, U16.pack(0x6A6A)
+            address = address.address
+        else:
+            index, addresses = U32.unpack_from(message, 6)[0], sorted(self.breakpoints)
+            address = addresses[index] if index < len(addresses) else None
+        if address not in self.breakpoints:
+            return T32_ERR_FN2, U16.pack(0x6A6A)
+        return 0, self._breakpoint_obj(address).stream()
+
+    def _write_breakpoint_obj(self, message) -> tuple[int, bytes]:
+        obj = _BreakpointObj()
+        obj.extract(message, 6)
+        if obj.address.type not in (T32_ADDRTYPE_A32, T32_ADDRTYPE_A64):
+            return T32_ERR_FN1, U16.pack(0x6A6A)
+        config = sum(bit for kind, bit in self._BREAKPOINT_CONFIG.items() if obj.types & kind)
+        for address in range(obj.address.address, obj.address.address + max(obj.size, 1)):
+            if message[4]:
+                self.breakpoints[address] = self.breakpoints.get(address, 0) | config
+                self.breakpoint_attributes[address] = (obj.impl, obj.disabled)
+            elif value := self.breakpoints.get(address, 0) & ~(config or 0xFFFF):
+                self.breakpoints[address] = value
+            else:
+                self.breakpoints.pop(address, None)
+                self.breakpoint_attributes.pop(address, None)
+        self.notify(T32_E_BREAKPOINTCONFIG)
+        return 0, self._breakpoint_obj(obj.address.address).stream()
+
+    def _get_symbol(self, message) -> tuple[int, bytes]:
+        address, size = self.symbols.get(self._string(message, 4), (-1, 0))
+        return 0, struct.pack("<III", address & 0xFFFFFFFF, size, 0)
+
+    def _get_symbol_by_address(self, message) -> tuple[int, bytes]:
+        address = U32.unpack_from(message, 4)[0]
+        for name, (start, size) in self.symbols.items():
+            if start <= address < start + max(size, 1):
+                return 0, name.encode("GBK") + b"\0"
+        return 0, b"\0"
+
+    def _variable(self, name: str) -> int | None:
+        if name not in self.symbols:
+            return None
+        address, size = self.symbols[name]
+        return int.from_bytes(self.memory.read(address, min(size, 8)), "little")
+
+    def _read_variable_value(self, message) -> tuple[int, bytes]:
+        value = self._variable(self._string(message, 4))
+        if value is None:
+            return T32_ERR_FN2, bytes(8)
+        return 0, struct.pack("<II", value & 0xFFFFFFFF, value >> 32)
+
+    def _read_variable_string(self, message) -> tuple[int, bytes]:
+        value = self._variable(self._string(message, 4))
+        if value is None:
+            return T32_ERR_FN2, b"\0"
+        return 0, str(value).encode("GBK") + b"\0"
+
+    def _write_variable_value(self, message) -> tuple[int, bytes]:
+        lower, upper = struct.unpack_from("<II", message, 4)
+        name = self._string(message, 12)
+        if name not in self.symbols:
+            return T32_ERR_FN2, b""
+        address, size = self.symbols[name]
+        self.memory.write(address, (lower | upper << 32).to_bytes(8, "little")[:min(size, 8)])
+        return 0, b""
+
+    def _trace_status(self, message) -> tuple[int, bytes]:
+        count = len(self.trace)
+        return 0, bytes((self.trace_state, 0, 0, 0)) + struct.pack("<iii", count, 1 - count, 0)
+
+    def _read_trace(self, message) -> tuple[int, bytes]:
+        _, _, start, mask, records = struct.unpack_from("<BBiIH", message, 4)
+        first = start + len(self.trace) - 1
+        if first < 0 or first + records > len(self.trace):
+            return T32_ERR_STD_INVALID, b""
+        data = bytearray()
+        for cycle, address, value, timestamp in self.trace[first:first + records]:
+            words = {0: cycle, 1: address, 2: value, 6: timestamp, 7: timestamp >> 32}
+            for bit in range(32):
+                if mask >> bit & 1:
+                    data += U32.pack(words.get(bit, 0) & 0xFFFFFFFF)
+        return 0, bytes(data)
+
+    def _analyzer_record(self, message) -> tuple[int, bytes]:
+        record, length = struct.unpack_from("<iH", message, 4)
+        index = record + len(self.trace) - 1
+        if not 0 <= index < len(self.trace):
+            return T32_ERR_STD_INVALID, b""
+        cycle, address, value, timestamp = self.trace[index]
+        data = struct.pack("<IIIq", cycle & 0xFFFFFFFF, address & 0xFFFFFFFF, value & 0xFFFFFFFF, timestamp)
+        return 0, data.ljust(length or 128, b"\0")[:length or 128]
+
+    def _window_content(self, message) -> tuple[int, bytes]:
+        requested, offset, print_code = struct.unpack_from("<III", message, 4)
+        command = self._string(message, 16)
+        content = self.windows.get(command.upper())
+        if content is None and command.upper() in ("SYMBOL.LIST", "SY.LIST", "Y.LIST"):
+            content = self._symbol_list
+        if content is None:
+            return T32_ERR_STD_INVALID, bytes(4)
+        if callable(content):
+            content = content(print_code)
+        data = content.encode("GBK")[offset:offset + min(max(requested - 1, 0), LINE_SBLOCK * 2)]
+        return 0, U32.pack(len(data)) + data + b"\0"
+
+    def _symbol_list(self, print_code: int) -> str:
+        """由 add_symbol 添加的符号生成 sYmbol.List 窗口内容"""
+        lines = ["symbol,address" if print_code == 3 else "symbol                          address"]
+        for name, (address, size) in sorted(self.symbols.items(), key=lambda item: item[1]):
+            span = f"D:0x{address:08X}--0x{address + size - 1:08X}" if size else f"D:0x{address:08X}"
+            lines.append(f'"{name}","{span}"' if print_code == 3 else f"{name:<32}{span}")
+        return "\n".join(lines) + "\n"
+
+    def _fdx_by_id(self, message) -> SimulatedFdxChannel | None:
+        channel = U32.unpack_from(message, 4)[0]
+        channels = list(self.fdx.values())
+        return channels[channel - 1] if 0 < channel <= len(channels) else None
+
+    def _fdx_resolve(self, message) -> tuple[int, bytes]:
+        name = self._string(message, 4)
+        if name not in self.fdx:
+            return T32_ERR_STD_INVALID, bytes(4)
+        return 0, U32.pack(list(self.fdx).index(name) + 1)
+
+    def _fdx_open(self, message) -> tuple[int, bytes]:
+        self.fdx_channel(name := self._string(message, 4)).opened = True
+        return 0, U32.pack(list(self.fdx).index(name) + 1)
+
+    def _fdx_close(self, message) -> tuple[int, bytes]:
+        if (channel := self._fdx_by_id(message)) is None:
+            return T32_ERR_STD_INVALID, b""
+        channel.opened = False
+        return 0, b""
+
+    def _fdx_receive(self, message) -> tuple[int, bytes]:
+        if (channel := self._fdx_by_id(message)) is None:
+            return T32_ERR_STD_INVALID, b""
+        return 0, channel.to_host.popleft() if channel.to_host else b""
+
+    def _fdx_transmit(self, message) -> tuple[int, bytes]:
+        if (channel := self._fdx_by_id(message)) is None:
+            return T32_ERR_STD_INVALID, b""
+        if len(channel.from_host) >= channel.capacity:
+            return 1, b""
+        size = U16.unpack_from(message, 10)[0] - 10
+        channel.from_host.append(bytes(message[12:12 + size]))
+        return 0, b""
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="local PowerView Remote API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with PowerViewSimulator(args.host, args.port, args.latency, args.loss) as sim:
+        print(f"PowerView simulator listening on {sim.host}:{sim.port}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,352 @@
+"""
+@文件: _symbols.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 符号解析缓存 (名称 -> (地址, 大小) 映射与地址 -> 符号的区间索引) 与本地符号表
+@许可: MIT License
+@版本: Version 1.0
+"""
+import bisect
+import csv
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, Iterator
+
+# 会改变符号表的命令: Data.LOAD.*, sYmbol.RESet/Delete/NEW/CREATE/..., DO 脚本
+_RELOAD_COMMAND = re.compile(
+    r"^\s*(?:[a-z]::)?(?:d(?:ata)?\.lo(?:ad)?|sy(?:mbol)?\.(?:res|del|new|cr|ren|rel|mod|spath|list\.map)|do\s)",
+    re.IGNORECASE,
+)
+
+
+class SymbolCache:
+    """
+    有界的符号解析缓存
+
+    - 名称 -> (地址, 大小) 的 LRU 映射
+    - 地址 -> 符号 的区间索引 (按起始地址排序), 落在已知符号范围内的地址无需再查询调试器
+
+    - 可选的完整符号表 (SymbolTable), 设置后优先从中查询
+
+    每次加载新程序 (检测到 Data.LOAD 等命令或手动调用 invalidate) 时纪元 (epoch) 加一并清空缓存和符号表。
+    被替换或清空的符号表会被关闭 (释放 mmap 映射)。
+
+    :param resolve: 名称 -> (地址, 大小) 的查询函数, 符号不存在时返回 None
+    :param reverse: 地址 -> 名称 的查询函数, 没有符号时返回空字符串
+    :param maxsize: 最多缓存的符号数与地址数
+    """
+
+    def __init__(
+            self,
+            resolve: Callable[[str], tuple[int, int] | None],
+            reverse: Callable[[int], str],
+            maxsize: int = 65536,
+    ):
+        self._resolve = resolve
+        self._reverse = reverse
+        self.maxsize = maxsize
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self._table: SymbolTable | None = None
+        self._lock = threading.RLock()
+        self._names = OrderedDict()
+        self._addresses = OrderedDict()
+        self._starts = []
+        self._intervals = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def table(self) -> "SymbolTable | None":
+        """由 load_symbol_table 加载的完整符号表, 优先于逐个查询调试器"""
+        return self._table
+
+    @table.setter
+    def table(self, table: "SymbolTable | None") -> None:
+        # 旧的符号表不再使用, 立即关闭, 否则每次重新加载都会遗留一个映射 (Windows 上也无法覆盖其缓存文件)
+        with self._lock:
+            old, self._table = self._table, table
+        if old is not None and old is not table:
+            old.close()
+
+    def invalidate(self) -> int:
+        """
+        使缓存失效 (程序重新加载后调用)
+
+        :return: 新的纪元
+        """
+        with self._lock:
+            self.epoch += 1
+            self.table = None
+            self._names.clear()
+            self._addresses.clear()
+            self._starts.clear()
+            self._intervals.clear()
+            return self.epoch
+
+    def check_command(self, command: str) -> bool:
+        """
+        检查命令是否会重新加载符号, 是则使缓存失效
+
+        :param command: 发送给 TRACE32 的命令
+        :return: 缓存是否被清空
+        """
+        if _RELOAD_COMMAND.match(command):
+            self.invalidate()
+            return True
+        return False
+
+    def lookup(self, name: str) -> tuple[int, int] | None:
+        """
+        按名称查询符号
+
+        :param name: 符号名
+        :return: (地址, 大小), 符号不存在时为 None
+        """
+        if (table := self._table) is not None and (result := table.lookup(name)) is not None:
+            self.hits += 1
+            return result
+        with self._lock:
+            if name in self._names:
+                self.hits += 1
+                self._names.move_to_end(name)
+                return self._names[name]
+            self.misses += 1
+            epoch = self.epoch
+
+        result = self._resolve(name)
+
+        with self._lock:
+            if epoch == self.epoch:
+                self._insert(name, result)
+        return result
+
+    def symbolize(self, address: int) -> tuple[str, int] | None:
+        """
+        查询地址所属的符号
+
+        :param address: 地址
+        :return: (符号名, 相对符号起始地址的偏移), 没有符号时为 None
+        """
+        if (table := self._table) is not None:
+            # 完整符号表中找不到即表示地址不属于任何符号, 无需再查询调试器
+            self.hits += 1
+            return table.symbolize(address)
+        with self._lock:
+            if (result := self._find(address)) is not None:
+                self.hits += 1
+                return result
+            if address in self._addresses:
+                self.hits += 1
+                self._addresses.move_to_end(address)
+                return self._addresses[address]
+            self.misses += 1
+            epoch = self.epoch
+
+        name = self._reverse(address)
+        symbol = self.lookup(name) if name else None
+        result = (name, address - symbol[0]) if symbol else None
+
+        with self._lock:
+            if epoch == self.epoch and self._find(address) is None:
+                # 地址不在符号的大小范围内 (如大小为 0 的标号), 单独缓存
+                self._addresses[address] = result
+                if len(self._addresses) > self.maxsize:
+                    self._addresses.popitem(last=False)
+        return result
+
+    def _find(self, address: int) -> tuple[str, int] | None:
+        index = bisect.bisect_right(self._starts, address)
+        # 符号可能互相嵌套, 向前检查几个起始地址更小的区间
+        for i in range(index - 1, max(index - 9, -1), -1):
+            end, name = self._intervals[i]
+            if address < end:
+                return name, address - self._starts[i]
+        return None
+
+    def _insert(self, name: str, symbol: tuple[int, int] | None) -> None:
+        self._names[name] = symbol
+        if symbol is not None and symbol[1] > 0:
+            start, size = symbol
+            index = bisect.bisect_right(self._starts, start)
+            self._starts.insert(index, start)
+            self._intervals.insert(index, (start + size, name))
+        if len(self._names) > self.maxsize:
+            self._remove(*self._names.popitem(last=False))
+
+    def _remove(self, name: str, symbol: tuple[int, int] | None) -> None:
+        if symbol is None or symbol[1] <= 0:
+            return
+        start = symbol[0]
+        index = bisect.bisect_left(self._starts, start)
+        while index < len(self._starts) and self._starts[index] == start:
+            if self._intervals[index][1] == name:
+                del self._starts[index]
+                del self._intervals[index]
+                return
+            index += 1
+
+
+# 符号表缓存文件: 头部 + 地址数组 + 大小数组 + 名称偏移数组 + 名称数据, 数组元素均为 8 字节无符号整数
+_TABLE_MAGIC = b"T32SYMTB"
+_TABLE_HEADER = struct.Struct("<8sBxxxxxxxQQ")
+# sYmbol.List 中的地址范围, 如 "P:0x00001000--0x0000101F" 或 "D:0x20000000"
+_ADDRESS_RANGE = re.compile(r"^(?:[A-Za-z]+:)?0x([0-9A-Fa-f]+)(?:--0x([0-9A-Fa-f]+))?$")
+
+
+def parse_symbol_list(lines) -> Iterator[tuple[str, int, int]]:
+    """
+    解析 CSV 格式的 sYmbol.List 窗口内容
+
+    每行的第一个字段为符号名, 第一个形如 [访问类型:]0x起始[--0x结束] 的字段为地址范围, 无法识别的行 (表头等) 被忽略
+
+    :param lines: 按行迭代的窗口内容
+    :return: (符号名, 地址, 大小) 的迭代器
+    """
+    for row in csv.reader(lines):
+        if not row or not (name := row[0].strip()):
+            continue
+        for field in row[1:]:
+            if match := _ADDRESS_RANGE.match(field.strip()):
+                start = int(match[1], 16)
+                end = int(match[2], 16) + 1 if match[2] else start
+                yield name, start, end - start
+                break
+
+
+class SymbolTable:
+    """
+    按地址排序的只读符号表
+
+    以平行数组 (地址, 大小, 名称偏移) 和一段名称数据保存, 按地址查询为 O(log n)。
+    可以保存为缓存文件, 之后通过 mmap 直接打开而无需重新解析或查询调试器。
+    """
+
+    def __init__(self, addresses, sizes, offsets, names, mapping: mmap.mmap = None):
+        self._addresses = addresses
+        self._sizes = sizes
+        self._offsets = offsets
+        self._names = names
+        self._mapping = mapping
+        self._index = None
+
+    @classmethod
+    def from_symbols(cls, symbols) -> "SymbolTable":
+        """
+        由 (符号名, 地址, 大小) 序列创建符号表
+
+        :param symbols: (符号名, 地址, 大小) 的可迭代对象
+        :return: 符号表
+        """
+        entries = sorted(symbols, key=lambda entry: entry[1])
+        addresses, sizes, offsets = array("Q"), array("Q"), array("Q", [0])
+        names = bytearray()
+        for name, address, size in entries:
+            addresses.append(address)
+            sizes.append(size)
+            names += name.encode("utf-8")
+            offsets.append(len(names))
+        return cls(addresses, sizes, offsets, bytes(names))
+
+    @classmethod
+    def open(cls, path: str) -> "SymbolTable":
+        """
+        通过 mmap 打开缓存文件
+
+        :param path: 缓存文件路径
+        :return: 符号表
+        """
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, byteorder, count, length = _TABLE_HEADER.unpack_from(mapping)
+            if magic != _TABLE_MAGIC or byteorder != (sys.byteorder == "little"):
+                raise ValueError(f"{path} 不是本机可用的符号表缓存文件")
+            if len(mapping) != _TABLE_HEADER.size + (3 * count + 1) * 8 + length:
+                raise ValueError(f"{path} 已损坏")
+            view = memoryview(mapping)
+            start = _TABLE_HEADER.size
+            addresses = view[start:start + count * 8].cast("Q")
+            sizes = view[start + count * 8:start + count * 16].cast("Q")
+            offsets = view[start + count * 16:start + count * 24 + 8].cast("Q")
+            names = view[start + count * 24 + 8:]
+        except Exception:
+            mapping.close()
+            raise
+        return cls(addresses, sizes, offsets, names, mapping)
+
+    def save(self, path: str) -> None:
+        """
+        保存为缓存文件 (先写入临时文件再替换, 避免其他进程读到不完整的文件)
+
+        :param path: 缓存文件路径
+        """
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(_TABLE_HEADER.pack(_TABLE_MAGIC, sys.byteorder == "little", len(self), len(self._names)))
+            for values in (self._addresses, self._sizes, self._offsets):
+                f.write(values)
+            f.write(self._names)
+        os.replace(temp, path)
+
+    def close(self) -> None:
+        """释放 mmap 映射, 之后不能再使用该符号表 (符号缓存替换或清空符号表时自动调用)"""
+        if self._mapping is not None:
+            for view in (self._addresses, self._sizes, self._offsets, self._names):
+                view.release()
+            self._addresses = self._sizes = self._offsets = self._names = None
+            self._index = None
+            self._mapping.close()
+            self._mapping = None
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __iter__(self) -> Iterator[tuple[str, int, int]]:
+        for i in range(len(self)):
+            yield self.name(i), self._addresses[i], self._sizes[i]
+
+    def name(self, index: int) -> str:
+        """
+        获取第 index 个符号的名称
+
+        :param index: 符号序号 (按地址排序)
+        :return: 符号名
+        """
+        return bytes(self._names[self._offsets[index]:self._offsets[index + 1]]).decode("utf-8")
+
+    def lookup(self, name: str) -> tuple[int, int] | None:
+        """
+        按名称查询符号, 首次调用时建立名称索引
+
+        :param name: 符号名
+        :return: (地址, 大小), 符号不存在时为 None
+        """
+        if self._index is None:
+            self._index = {self.name(i): i for i in range(len(self))}
+        if (index := self._index.get(name)) is None:
+            return None
+        return self._addresses[index], self._sizes[index]
+
+    def symbolize(self, address: int) -> tuple[str, int] | None:
+        """
+        查询地址所属的符号
+
+        :param address: 地址
+        :return: (符号名, 相对符号起始地址的偏移), 没有符号时为 None
+        """
+        index = bisect.bisect_right(self._addresses, address)
+        # 符号可能互相嵌套, 向前检查几个起始地址更小的符号
+        for i in range(index - 1, max(index - 9, -1), -1):
+            start = self._addresses[i]
+            if address < start + max(self._sizes[i], 1):
+                return self.name(i), address - start
+        return None
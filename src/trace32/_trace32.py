@@ -7,28 +7,80 @@
 @版本: Version 1.0
 """
 
+import bisect
+import codecs
+import hashlib
+import mmap
 import sys
 import os
 import platform
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from array import array
+from collections import namedtuple
 from ctypes import *
-from enum import Enum
-
+from dataclasses import dataclass
+from enum import Enum, IntEnum, IntFlag
+from typing import Iterator
+
+from ._cache import BreakpointCache, MemoryCache, RegisterCache
+from ._remote import BREAKPOINT_LIST_MAX, EMU_CBMAXDATASIZE, LINE_SBLOCK, MAX_PACKET_SIZE, RemoteApi
+from ._symbols import SymbolCache, SymbolTable, parse_symbol_list
+from ._window import iter_csv, iter_lines, iter_xml
 from .errors import *
 
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-match (platform.system(), sizeof(c_void_p)):
-    case ("Windows" | "CYGWIN"), 4:
-        __t32__ = CDLL(os.path.join(CURRENT_DIR, 'lib', 't32api.dll'))
-    case ("Windows" | "CYGWIN"), _:
-        __t32__ = CDLL(os.path.join(CURRENT_DIR, 'lib', 't32api64.dll'))
-    case "Darwin", 4:
-        __t32__ = CDLL(os.path.join(CURRENT_DIR, 'lib', 't32api.dylib'))
-    case _, 4:
-        __t32__ = CDLL(os.path.join(CURRENT_DIR, 'lib', 't32api64.so'))
-    case _, _:
-        __t32__ = CDLL(os.path.join(CURRENT_DIR, 'lib', 't32api64.so'))
+
+def load_library() -> CDLL:
+    """
+    按平台加载 t32api 动态库
+
+    :return: 动态库对象, 不存在或无法加载时抛出 OSError
+    """
+    match (platform.system(), sizeof(c_void_p)):
+        case ("Windows" | "CYGWIN"), 4:
+            name = 't32api.dll'
+        case ("Windows" | "CYGWIN"), _:
+            name = 't32api64.dll'
+        case "Darwin", 4:
+            name = 't32api.dylib'
+        case _, 4:
+            name = 't32api64.so'
+        case _, _:
+            name = 't32api64.so'
+    library = CDLL(os.path.join(CURRENT_DIR, 'lib', name))
+    # void *T32_GetChannel0(void), 默认的 int 返回类型会截断 64 位指针
+    library.T32_GetChannel0.restype = c_void_p
+    return library
+
+
+def create_backend(backend: str = 'auto'):
+    """
+    创建 Remote API 后端
+
+    :param backend: 'dll' 使用 t32api 动态库 | 'python' 使用纯 python 实现 | 'auto' 优先动态库, 失败时使用 python
+    :return: 后端对象, 与 t32api 动态库具有相同的函数接口
+    """
+    match backend:
+        case 'dll':
+            return load_library()
+        case 'python':
+            return RemoteApi()
+        case 'auto':
+            try:
+                return load_library()
+            except OSError:
+                return RemoteApi()
+    raise ValueError(f"unknown backend: {backend}")
+
+
+# 可通过环境变量 T32_BACKEND 强制选择后端
+__t32__ = create_backend(os.environ.get('T32_BACKEND', 'auto'))
 
 
 def set_error_hook() -> None:
@@ -37,6 +89,7 @@ def set_error_hook() -> None:
     防止与 TRACE32 socket 出现问题. 
     """
     def handler(exc_type, exc_value, exc_traceback):
+        _release_register_sets()
         __t32__.T32_Exit()
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
 
@@ -45,7 +98,35 @@ def set_error_hook() -> None:
 
 set_error_hook()
 
-_channels = {}
+def _forward(name: str) -> staticmethod:
+    """
+    转发到当前后端同名函数的静态方法, 在调用时才查找 __t32__, set_backend 之后调用的仍是新的后端
+
+    :param name: Remote API 函数名, 如 "T32_ExecuteLua"
+    :return: 可直接作为 T32 类属性的静态方法
+    """
+    def call(*args):
+        return getattr(__t32__, name)(*args)
+
+    call.__name__ = call.__qualname__ = name
+    return staticmethod(call)
+
+
+# 当前选中的通道缓冲区 (T32_SetChannel), None 表示默认通道
+_current_channel = None
+
+
+def _lookup_symbol(symbol: str) -> tuple[int, int] | None:
+    address, size, _ = T32.get_symbol(symbol)
+    if size == 0 and address == 0xFFFFFFFF:
+        return None
+    return address, size
+
+
+_symbols = SymbolCache(_lookup_symbol, lambda address: T32.get_symbol_from_address(address))
+_registers = RegisterCache(lambda: T32.get_state())
+_memory = MemoryCache(_registers.halt_epoch)
+_breakpoints = BreakpointCache(lambda: T32._read_breakpoint_table())
 
 
 class DeviceType(Enum):
@@ -62,6 +143,370 @@ class DeviceType(Enum):
         return type_names[self]
 
 
+@dataclass
+class TransferStats:
+    """
+    一次批量传输的统计信息
+
+    :param size: 传输的字节数
+    :param elapsed: 耗时, 单位秒
+    :param chunks: 调用 Remote API 的次数
+    """
+    size: int
+    elapsed: float
+    chunks: int
+
+    @property
+    def throughput(self) -> float:
+        """吞吐量, 单位 字节/秒"""
+        return self.size / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+@dataclass
+class WaitResult:
+    """
+    wait_for_halt / wait_for_practice_done 的结果
+
+    :param state: 最后一次查询到的状态
+    :param elapsed: 等待的时间, 单位秒
+    :param timed_out: 是否因超时而返回
+    """
+    state: int
+    elapsed: float
+    timed_out: bool = False
+
+
+def _wait_until(probe, done, timeout: float | None, min_interval: float, max_interval: float,
+                event: threading.Event = None) -> WaitResult:
+    """
+    反复调用 probe() 直到 done(状态) 为真或超时
+
+    轮询间隔从 min_interval 开始按 1.5 倍递增到 max_interval; 指定 event 时在两次查询之间等待该事件,
+    事件被设置 (如收到通知) 后立即再次查询。
+    """
+    start = time.perf_counter()
+    deadline = None if timeout is None else start + timeout
+    interval = min_interval
+    while True:
+        state = probe()
+        now = time.perf_counter()
+        if done(state):
+            return WaitResult(state, now - start)
+        if deadline is not None and now >= deadline:
+            return WaitResult(state, now - start, True)
+        delay = interval if deadline is None else min(interval, deadline - now)
+        if event is None:
+            time.sleep(delay)
+        elif event.wait(delay):
+            event.clear()
+        interval = min(interval * 1.5, max_interval)
+
+
+class BufferSyncStatus(IntEnum):
+    """T32_BufferSynchStatus, 内存块与目标的同步状态"""
+    NOT_SYNCHED = 0
+    READ = 1
+    WRITTEN = 2
+    ERROR = 3
+
+
+@dataclass
+class BundleEntry:
+    """
+    内存包 (MemoryBundle) 中一个区域的传输结果
+
+    :param address: 地址
+    :param length: 字节数
+    :param data: 读取到的数据, 失败时为 None
+    :param status: 同步状态
+    """
+    address: int
+    length: int
+    data: bytes | None
+    status: BufferSyncStatus
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (BufferSyncStatus.READ, BufferSyncStatus.WRITTEN)
+
+
+class BreakpointType(IntFlag):
+    """T32_BP_TYPE_*, 断点类型"""
+    PROGRAM = 0x01
+    READ = 0x02
+    WRITE = 0x04
+    RW = READ | WRITE
+
+
+class BreakpointImpl(IntFlag):
+    """T32_BP_IMPL_*, 断点的实现方式"""
+    AUTO = 0x00
+    SOFT = 0x01
+    ONCHIP = 0x02
+    HARD = 0x04
+    MARK = 0x08
+
+
+@dataclass
+class Breakpoint:
+    """
+    一个断点
+
+    :param address: 地址
+    :param type: 断点类型
+    :param impl: 实现方式, AUTO 由调试器选择
+    :param enabled: 是否启用
+    :param access: 访问类型字符串, 如 "P" | "D", 空字符串表示不指定
+    """
+    address: int
+    type: BreakpointType = BreakpointType.PROGRAM
+    impl: BreakpointImpl = BreakpointImpl.AUTO
+    enabled: bool = True
+    access: str = ""
+
+
+class _BreakpointStruct(Structure):
+    """t32.h 中的 T32_Breakpoint (T32_GetBreakpointList 的输出)"""
+    _fields_ = [("address", c_uint32), ("enabled", c_uint8), ("type", c_uint32), ("auxtype", c_uint32)]
+
+
+class NotifyEvent(IntEnum):
+    """T32_E_*, 可通过 T32.notify_state_enable 订阅的通知类型"""
+    BREAK = 0x00
+    EDIT = 0x01
+    BREAKPOINT_CONFIG = 0x02
+    ON_EVENT = 0x03
+    RTS_TRIGGER = 0x04
+    ERROR = 0x05
+
+
+# 各类通知回调的 C 函数类型 (见 hremote.c T32_CheckStateNotify), 第一个参数均为 T32_CheckStateNotify 的参数
+_NOTIFY_CALLBACK_TYPES = {
+    NotifyEvent.BREAK: CFUNCTYPE(None, c_uint, c_uint64, c_uint64),
+    NotifyEvent.EDIT: CFUNCTYPE(None, c_uint, c_int, c_char_p),
+    NotifyEvent.BREAKPOINT_CONFIG: CFUNCTYPE(None, c_uint),
+    NotifyEvent.ON_EVENT: CFUNCTYPE(None, c_uint),
+    NotifyEvent.RTS_TRIGGER: CFUNCTYPE(None, c_uint, c_uint64, c_uint64, c_uint64),
+    NotifyEvent.ERROR: CFUNCTYPE(None, c_uint, c_int, c_char_p),
+}
+
+# 已注册的回调, 持有引用以免 C 函数指针被回收: 通知类型或 ON 事件名 -> CFUNCTYPE 对象
+_notify_callbacks = {}
+
+
+class TraceField(IntFlag):
+    """T32_ReadTrace 的字段掩码, 每个位对应记录中的一个 4 字节字"""
+    CYCLE = 0x01
+    ADDRESS = 0x02
+    DATA = 0x04
+    # 时间戳占两个字: 低 32 位 (bit 6) 和高 32 位 (bit 7)
+    TIMESTAMP = 0xC0
+    ALL = CYCLE | ADDRESS | DATA | TIMESTAMP
+
+
+@dataclass
+class TraceState:
+    """
+    跟踪缓冲区状态
+
+    :param state: 跟踪状态 (0 关闭, 1 Arm, 2 触发, 3 断点...)
+    :param size: 缓冲区大小
+    :param min: 最早的记录编号
+    :param max: 最新的记录编号
+    """
+    state: int
+    size: int
+    min: int
+    max: int
+
+
+def _trace_layout(mask: int) -> list[tuple[str, str]]:
+    """由字段掩码得到 T32_ReadTrace 输出的记录布局: (字段名, struct 格式) 列表"""
+    names = {0: "cycle", 1: "address", 2: "data"}
+    fields, bit = [], 0
+    while bit < 32:
+        if mask >> bit & 1:
+            if bit == 6 and mask >> 7 & 1:
+                fields.append(("timestamp", "q"))
+                bit += 2
+                continue
+            fields.append((names.get(bit, f"word{bit}"), "I"))
+        bit += 1
+    return fields
+
+
+def _trace_dtype(mask: int):
+    """由字段掩码生成与 T32_ReadTrace 输出布局一致的 numpy 结构化类型"""
+    import numpy as np
+
+    return np.dtype([(name, "<u4" if fmt == "I" else "<i8") for name, fmt in _trace_layout(mask)])
+
+
+# 分析器记录文件: 头部 (魔数, 字段掩码, 第一条记录的编号) 之后为连续的记录, 布局与 T32_ReadTrace 的输出一致
+_ANALYZER_MAGIC = b"T32ANREC"
+_ANALYZER_HEADER = struct.Struct("<8sIi")
+
+# dump_memory 的进度文件: 魔数, 起始地址, 总字节数, 已完成的字节数
+_DUMP_MAGIC = b"T32DUMP1"
+_DUMP_PROGRESS = struct.Struct("<8sQQQ")
+# dump_memory 每读取这么多字节把映射的页写回磁盘并记录一次进度
+_DUMP_CHECKPOINT = 1 << 22
+
+# read_variables / write_variables 合并后单个内存区域的最大长度: 内存包单个区域的上限 EMU_CBMAXDATASIZE
+# 扣除报文头 (10 字节) 与区域参数 (地址类型, 64 位地址, 长度等) 的开销
+_BUNDLE_REGION_LIMIT = EMU_CBMAXDATASIZE - 32
+
+
+class _RegisterSetStruct(Structure):
+    """t32.h 中的 T32_RegisterSetObj, regs 为变长数组"""
+    _fields_ = [("next", c_void_p), ("nregs", c_int), ("regs", c_void_p * 1)]
+
+
+class RegisterSet:
+    """
+    一组寄存器, 基于 T32_RegisterSetObj, 一次往返读取或写入集合中的全部寄存器
+
+    第一次读写时 TRACE32 按名称查找寄存器, 并把寄存器 ID 写回集合中的寄存器对象, 之后的读写直接使用 ID。
+    因此应当创建一次并在每次停止时复用 (T32.read_registers 会自动缓存)。
+
+    :param names: 寄存器名序列 (每个最长 15 个字符, 最多 200 个)
+    :param width: 寄存器宽度 32 | 64, 须与目标的寄存器宽度一致
+    """
+
+    def __init__(self, names, width: int = 32):
+        if width not in (32, 64):
+            raise ValueError(f"寄存器宽度必须为 32 或 64, 而不是 {width}")
+        self.names = tuple(names)
+        self.width = width
+        self._api = __t32__
+        self._values = ((c_uint32 if width == 32 else c_uint64) * len(self.names))()
+        self._handle = c_void_p()
+
+        request = self._api.T32_RequestRegisterSetObjR32 if width == 32 else self._api.T32_RequestRegisterSetObjR64
+        err = request(byref(self._handle), c_int(len(self.names)))
+        if error_mapping(err):
+            raise error_mapping(err)()
+        _live_register_sets.add(self)
+        names = (c_char_p * len(self.names))(*(name.encode('GBK') for name in self.names))
+        err = self._api.T32_SetRegisterSetObjNames(self._handle, names, c_int(len(self.names)))
+        if error_mapping(err):
+            self.close()
+            raise error_mapping(err)()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def closed(self) -> bool:
+        return not self._handle
+
+    def close(self) -> None:
+        """释放 T32_RegisterSetObj"""
+        _live_register_sets.discard(self)
+        if self._handle:
+            self._api.T32_ReleaseRegisterSetObj(byref(self._handle))
+            self._handle = c_void_p()
+
+    def _check_open(self) -> None:
+        if not self._handle:
+            raise RuntimeError("RegisterSet 已关闭 (T32.exit 会关闭全部寄存器集合)")
+
+    def _transfer_values(self, store: bool) -> None:
+        """在 self._values 与集合中的寄存器对象之间复制值"""
+        count = c_int(len(self.names))
+        if self.width == 32:
+            func = self._api.T32_SetRegisterSetObjValues32 if store else self._api.T32_GetRegisterSetObjValues32
+            err = func(self._handle, self._values, count)
+        elif isinstance(self._api, RemoteApi):
+            func = self._api.T32_SetRegisterSetObjValues64 if store else self._api.T32_GetRegisterSetObjValues64
+            err = func(self._handle, self._values, count)
+        else:
+            # t32api 动态库没有 64 位的批量函数, 逐个访问集合中的寄存器对象 (纯本地操作, 不产生通信)
+            regs = (c_void_p * len(self.names)).from_address(self._handle.value + _RegisterSetStruct.regs.offset)
+            err = 0
+            for i, reg in enumerate(regs):
+                if store:
+                    err = self._api.T32_SetRegisterObjValue64(c_void_p(reg), c_uint64(self._values[i]))
+                else:
+                    value = c_uint64()
+                    err = self._api.T32_GetRegisterObjValue64(c_void_p(reg), byref(value))
+                    self._values[i] = value.value
+                if err:
+                    break
+        if error_mapping(err):
+            raise error_mapping(err)()
+
+    def read_array(self, out: array = None) -> array:
+        """
+        读取全部寄存器
+
+        :param out: 用于存放结果的 array('Q'), 长度须与集合相同, 默认新建
+        :return: 与 names 顺序一致的 array('Q')
+        """
+        self._check_open()
+        err = self._api.T32_ReadRegisterSetObj(self._handle)
+        if error_mapping(err):
+            raise error_mapping(err)()
+        self._transfer_values(store=False)
+        if out is None:
+            return array('Q', self._values)
+        if len(out) != len(self.names):
+            raise ValueError(f"out 的长度 {len(out)} 与寄存器数 {len(self.names)} 不一致")
+        out[:] = array('Q', self._values)
+        return out
+
+    def read(self) -> dict[str, int]:
+        """
+        读取全部寄存器
+
+        :return: {寄存器名: 值}
+        """
+        return dict(zip(self.names, self.read_array()))
+
+    def write(self, values) -> None:
+        """
+        写入全部寄存器
+
+        :param values: 与 names 顺序一致的值序列, 或包含全部寄存器名的 {寄存器名: 值}
+        """
+        self._check_open()
+        if isinstance(values, dict):
+            values = [values[name] for name in self.names]
+        if len(values) != len(self.names):
+            raise ValueError(f"值的个数 {len(values)} 与寄存器数 {len(self.names)} 不一致")
+        for i, value in enumerate(values):
+            self._values[i] = value
+        self._transfer_values(store=True)
+        err = self._api.T32_WriteRegisterSetObj(self._handle)
+        if error_mapping(err):
+            raise error_mapping(err)()
+
+
+# T32.read_registers / write_registers 使用的寄存器集合: (寄存器名, 宽度, 通道) -> RegisterSet
+_register_sets = {}
+
+# 尚未关闭的全部寄存器集合 (含用户创建的)
+_live_register_sets = weakref.WeakSet()
+
+
+def _release_register_sets() -> None:
+    """
+    关闭全部寄存器集合并清空缓存
+
+    t32api 动态库的 T32_Exit 在释放全部对象时错误地遍历寄存器对象链表而不是寄存器集合链表,
+    仍存在的寄存器集合会导致崩溃, 因此每次 T32_Exit 之前都必须先关闭它们; 断开后句柄也不再有效。
+    """
+    for register_set in list(_live_register_sets):
+        register_set.close()
+    _register_sets.clear()
+
+
 class T32:
     # --------------------------------------------------------------------------
     # note 基本 API 函数
@@ -97,9 +542,12 @@ class T32:
         """
         此函数初始化驱动程序并建立与 TRACE32 显示驱动程序的连接。如果返回零，则表示连接设置成功。
         """
+        _release_register_sets()
         err = __t32__.T32_Init()
         if error_mapping(err):
             raise error_mapping(err)()
+        _registers.invalidate()
+        _breakpoints.invalidate()
 
     @staticmethod
     def attach(device_specifier: int | DeviceType) -> None:
@@ -134,6 +582,7 @@ class T32:
         """
         关闭 python 与 TRACE32 的 socket 连结
         """
+        _release_register_sets()
         err = __t32__.T32_Exit()
         if error_mapping(err):
             raise error_mapping(err)()
@@ -191,6 +640,9 @@ class T32:
         err = __t32__.T32_Cmd(commands.encode("GBK"))
         if error_mapping(err):
             raise error_mapping(err)()
+        _symbols.check_command(commands)
+        _breakpoints.check_command(commands)
+        _registers.invalidate()
 
     @staticmethod
     def cmd_f(commands: str, *args) -> None:
@@ -212,6 +664,9 @@ class T32:
         )
         if error_mapping(err):
             raise error_mapping(err)()
+        _symbols.check_command(commands)
+        _breakpoints.check_command(commands)
+        _registers.invalidate()
 
     @staticmethod
     def cmd_win() -> None:
@@ -264,6 +719,21 @@ class T32:
             raise error_mapping(err)()
         return state.value
 
+    @staticmethod
+    def wait_for_practice_done(timeout: float = None, min_interval: float = 0.0005,
+                               max_interval: float = 0.05) -> WaitResult:
+        """
+        等待通过 cmd("DO ...") 启动的 PRACTICE 脚本结束运行 (状态不再为 1)
+
+        轮询间隔从 min_interval 开始逐渐增大到 max_interval, 短脚本能很快返回, 长脚本也不会频繁占用链路
+
+        :param timeout: 最长等待时间, 单位秒, None 表示一直等待
+        :param min_interval: 最短轮询间隔, 单位秒
+        :param max_interval: 最长轮询间隔, 单位秒
+        :return: 最终的 PRACTICE 状态 (0 未运行 | 2 打开对话窗口) 和等待时间; 超时时 timed_out 为 True
+        """
+        return _wait_until(T32.get_practice_state, lambda state: state != 1, timeout, min_interval, max_interval)
+
     @staticmethod
     def eval_get() -> int:
         """
@@ -354,34 +824,38 @@ class T32:
         """
         设置或切换通道连接到不同的仿真器
 
-        比如：多核调试
+        比如：多核调试。首次使用某个地址时创建通道, 设置 NODE/PORT 并连接; 之后只需一次 T32_SetChannel 即可切换。
+        同时与多个仿真器通信时建议直接使用 T32Session。
+
+        :param ip: PowerView 所在主机
+        :param port: Remote API 端口
         """
-        if (ip, port) in _channels:
-            err = __t32__.T32_SetChannel(_channels[(ip, port)])
-            if error_mapping(err):
-                raise error_mapping(err)()
-            return
+        from ._session import T32Session
+
+        T32Session.shared(ip, port).activate()
 
-        # 1. 获取结构体大小
+    @staticmethod
+    def _new_channel() -> Array:
+        """创建并初始化为默认值的通道缓冲区"""
         size = __t32__.T32_GetChannelSize()
         if size <= 0:
             raise error_mapping(size)()
-
-        # 2. 分配内存
         buffer = create_string_buffer(size)
-
-        # 3. 初始化为默认值
         err = __t32__.T32_GetChannelDefaults(buffer)
         if error_mapping(err):
             raise error_mapping(err)()
+        return buffer
 
-        # 4. 切换到新 channel
-        err = __t32__.T32_SetChannel(buffer)
+    @staticmethod
+    def _select_channel(buffer: Array | None) -> None:
+        """切换到通道缓冲区 buffer (None 为默认通道, 即 T32_GetChannel0), 已是当前通道时不做任何事"""
+        global _current_channel
+        if _current_channel is buffer:
+            return
+        err = __t32__.T32_SetChannel(c_void_p(__t32__.T32_GetChannel0()) if buffer is None else buffer)
         if error_mapping(err):
             raise error_mapping(err)()
-
-        # 5. 缓存这个 channel，后续可复用
-        _channels[(ip, port)] = buffer
+        _current_channel = buffer
 
     @staticmethod
     def api_lock(wait: int) -> bool:
@@ -441,6 +915,30 @@ class T32:
             raise error_mapping(err)()
         return handle.value
 
+    @staticmethod
+    def set_backend(backend: str = 'auto') -> None:
+        """
+        切换 Remote API 后端, 需要在 init 之前调用
+
+        :param backend: 'dll' 使用 t32api 动态库 | 'python' 使用纯 python 实现 (无需动态库, 可在任意平台运行)
+            | 'auto' 优先动态库, 失败时使用 python | 也可以直接传入已创建的后端对象
+        """
+        global __t32__, _current_channel
+        __t32__ = create_backend(backend) if isinstance(backend, str) else backend
+        _current_channel = None
+        _registers.invalidate()
+        _breakpoints.invalidate()
+        _release_register_sets()
+
+    @staticmethod
+    def get_backend() -> str:
+        """
+        获取当前使用的 Remote API 后端
+
+        :return: 'dll' | 'python'
+        """
+        return 'python' if isinstance(__t32__, RemoteApi) else 'dll'
+
     # --------------------------------------------------------------------------
     # note 调试器相关函数
     # --------------------------------------------------------------------------
@@ -457,6 +955,7 @@ class T32:
         err = __t32__.T32_Go()
         if error_mapping(err):
             raise error_mapping(err)()
+        _registers.invalidate()
 
     @staticmethod
     def break_target() -> None:
@@ -468,6 +967,7 @@ class T32:
         err = __t32__.T32_Break()
         if error_mapping(err):
             raise error_mapping(err)()
+        _registers.invalidate()
 
     @staticmethod
     def step() -> None:
@@ -477,6 +977,7 @@ class T32:
         err = __t32__.T32_Step()
         if error_mapping(err):
             raise error_mapping(err)()
+        _registers.invalidate(still_halted=True)
 
     @staticmethod
     def set_step_mode(mode: str, jump_func: bool) -> None:
@@ -525,6 +1026,7 @@ class T32:
         err = __t32__.T32_ResetCPU()
         if error_mapping(err):
             raise error_mapping(err)()
+        _registers.invalidate()
 
     @staticmethod
     def set_mode(mode) -> None:
@@ -563,7 +1065,7 @@ class T32:
             has_fpu: 是否有浮点单元
             endian: 大端 | 小端
         """
-        cpu_str = c_char(b"")
+        cpu_str = c_char_p()
         has_fpu, endian, tmp = c_uint16(0), c_uint16(0), c_uint16(0)
 
         err = __t32__.T32_GetCpuInfo(
@@ -573,7 +1075,7 @@ class T32:
             raise error_mapping(err)()
 
         return (
-            cpu_str.value.decode("ascii"),
+            (cpu_str.value or b"").decode("ascii"),
             bool(has_fpu.value),
             "little" if endian.value else "big",
         )
@@ -596,18 +1098,50 @@ class T32:
         err = __t32__.T32_GetState(byref(state))
         if error_mapping(err):
             raise error_mapping(err)()
+        _registers.observe(state.value)
         return state.value
 
+    @staticmethod
+    def wait_for_halt(timeout: float = None, dispatcher=None, min_interval: float = 0.0005,
+                      max_interval: float = 0.05) -> WaitResult:
+        """
+        等待目标停止运行 (状态不再为 3)
+
+        指定 dispatcher (已启动的 NotificationDispatcher) 时由 break 通知唤醒, 并以 max_interval 为间隔查询状态
+        作为兜底; 否则轮询间隔从 min_interval 开始逐渐增大到 max_interval。
+
+        :param timeout: 最长等待时间, 单位秒, None 表示一直等待
+        :param dispatcher: 通知分发器
+        :param min_interval: 最短轮询间隔, 单位秒
+        :param max_interval: 最长轮询间隔, 单位秒
+        :return: 最终的目标状态和等待时间; 超时时 timed_out 为 True
+        """
+        if dispatcher is None:
+            return _wait_until(T32.get_state, lambda state: state != 3, timeout, min_interval, max_interval)
+
+        halted = threading.Event()
+        callback = dispatcher.on_break(lambda pc, reason: halted.set())
+        try:
+            return _wait_until(T32.get_state, lambda state: state != 3, timeout, max_interval, max_interval, halted)
+        finally:
+            dispatcher.remove(callback)
+
     @staticmethod
     def read_memory(address: int, access: int, size: int) -> bytes:
         """
-        从目标CPU读取内存
+        从目标CPU读取内存, 启用内存缓存 (enable_memory_cache) 时经过缓存
 
         :param address: 字节地址（需根据架构预处理：字寻址需×字长，寄存器需×宽度）
         :param access: 访问类型（若已用T32_SetMemoryAccessClass设置，此参数被忽略）
         :param size: 要读取的字节数
         :return: 读取的字节数据
         """
+        if _memory.enabled:
+            return _memory.read(address, access, size, T32._read_memory)
+        return T32._read_memory(address, access, size)
+
+    @staticmethod
+    def _read_memory(address: int, access: int, size: int) -> bytes:
         buffer = (c_ubyte * size)()
         err = __t32__.T32_ReadMemory(
             c_uint32(address), c_int(access), buffer, c_size_t(size)
@@ -617,21 +1151,252 @@ class T32:
         return bytes(buffer)
 
     @staticmethod
-    def write_memory(address: int, access: int, content: int) -> None:
+    def read_memory_into(address: int, access: int, buf, size: int = None) -> int:
         """
-        向目标CPU写入内存
+        从目标CPU读取内存, 直接写入调用者提供的缓冲区, 不产生中间对象和拷贝
+
+        大块内存可以先分配一次缓冲区, 再对其切片分段读取::
+
+            dump = bytearray(0x100000)
+            view = memoryview(dump)
+            for offset in range(0, len(dump), 0x10000):
+                T32.read_memory_into(base + offset, 0, view[offset:offset + 0x10000])
 
         :param address: 字节地址（需根据架构预处理：字寻址需×字长，寄存器需×宽度）
         :param access: 访问类型（若已用T32_SetMemoryAccessClass设置，此参数被忽略）
-        :param content: 要写入的整数值，写入值与输入样式相同。0b...
-        """
-        size = (content.bit_length() + 7) // 8 or 1
-        buffer = content.to_bytes(size, byteorder="big", signed=False)
-        err = __t32__.T32_WriteMemory(
-            c_uint32(address), c_int(access), (c_ubyte * size)(*buffer), c_size_t(size)
+        :param buf: 可写且连续的 buffer 协议对象, 如 bytearray, memoryview (及其切片), mmap, numpy 数组
+        :param size: 要读取的字节数, 默认为 buf 的字节数
+        :return: 读取的字节数
+        """
+        view = memoryview(buf).cast("B")
+        if view.readonly:
+            raise TypeError("缓冲区必须可写")
+        size = view.nbytes if size is None else size
+        if size > view.nbytes:
+            raise ValueError(f"缓冲区大小 {view.nbytes} 小于读取大小 {size}")
+        if size <= 0:
+            return 0
+        if _memory.enabled:
+            view[:size] = _memory.read(address, access, size, T32._read_memory)
+            return size
+        return T32._read_memory_into(address, access, view, size)
+
+    @staticmethod
+    def _read_memory_into(address: int, access: int, view: memoryview, size: int) -> int:
+        buffer = (c_ubyte * size).from_buffer(view)
+        err = __t32__.T32_ReadMemory(
+            c_uint32(address), c_int(access), buffer, c_size_t(size)
         )
         if error_mapping(err):
             raise error_mapping(err)()
+        return size
+
+    @staticmethod
+    def dump_memory(address: int, size: int, path: str, access: int = 0, chunk_size: int = 0x10000,
+                    resume: bool = True, retries: int = 3, progress=None) -> TransferStats:
+        """
+        把大块目标内存流式写入文件
+
+        输出文件预先分配为 size 字节并以 mmap 映射, 每块读入一个复用的缓冲区后复制到映射的页中,
+        内存占用与 size 无关; 脏页由操作系统在后台写回磁盘, 与后续的读取重叠进行。不经过内存缓存。
+
+        进度记录在 path + ".progress" 中, 链路中断等失败后以相同的参数再次调用时从断点继续, 完成后删除该文件。
+
+        :param address: 起始地址
+        :param size: 字节数
+        :param path: 输出文件路径
+        :param access: 访问类型
+        :param chunk_size: 每次读取的字节数, 向下取整为 MaxPacketSize (2048) 的整数倍
+        :param resume: 存在与本次参数相同的进度文件时从断点继续, 否则重新开始
+        :param retries: 单块读取失败时的重试次数
+        :param progress: 进度回调 progress(已完成的字节数, 总字节数)
+        :return: 本次调用的传输统计
+        """
+        chunk_size = max(chunk_size // MAX_PACKET_SIZE, 1) * MAX_PACKET_SIZE
+        state_path = path + ".progress"
+        done = 0
+        if resume and os.path.exists(state_path) and os.path.exists(path) and os.path.getsize(path) == size:
+            with open(state_path, "rb") as f:
+                state = f.read(_DUMP_PROGRESS.size)
+            if len(state) == _DUMP_PROGRESS.size:
+                magic, start, total, finished = _DUMP_PROGRESS.unpack(state)
+                if magic == _DUMP_MAGIC and (start, total) == (address, size):
+                    done = min(finished, size)
+
+        chunks, resumed, start = 0, done, time.perf_counter()
+        with open(path, "r+b" if done else "w+b") as f, open(state_path, "wb") as state:
+            def checkpoint() -> None:
+                if size:
+                    mapped.flush()
+                state.seek(0)
+                state.write(_DUMP_PROGRESS.pack(_DUMP_MAGIC, address, size, done))
+                state.flush()
+
+            f.truncate(size)
+            mapped = mmap.mmap(f.fileno(), size) if size else None
+            buffer = bytearray(chunk_size)
+            try:
+                saved = done
+                while done < size:
+                    length = min(chunk_size, size - done)
+                    for attempt in range(retries + 1):
+                        try:
+                            T32._read_memory_into(address + done, access, memoryview(buffer), length)
+                            break
+                        except Exception:
+                            if attempt == retries:
+                                raise
+                            time.sleep(0.1 * (attempt + 1))
+                    mapped[done:done + length] = buffer[:length]
+                    done += length
+                    chunks += 1
+                    if done - saved >= _DUMP_CHECKPOINT:
+                        checkpoint()
+                        saved = done
+                    if progress is not None:
+                        progress(done, size)
+            finally:
+                checkpoint()
+                if mapped is not None:
+                    mapped.close()
+        os.remove(state_path)
+        return TransferStats(size - resumed, time.perf_counter() - start, chunks)
+
+    @staticmethod
+    def diff_dump(first: str, second: str, base_address: int = 0, merge_gap: int = 0,
+                  chunk_size: int = 1 << 24) -> list[tuple[int, int]]:
+        """
+        比较两个内存转储文件 (如 dump_memory 的输出), 返回内容不同的区域 (需要安装 numpy)
+
+        两个文件以 numpy.memmap 映射后分块向量化比较, 内存占用与文件大小无关。长度不同时较长文件多出的部分视为不同。
+
+        :param first: 第一个文件
+        :param second: 第二个文件
+        :param base_address: 文件开头对应的目标地址
+        :param merge_gap: 两个不同区域之间相同的字节不超过该数时合并为一个区域
+        :param chunk_size: 每次比较的字节数
+        :return: (地址, 字节数) 列表, 按地址排序
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("diff_dump 需要安装 numpy") from e
+
+        sizes = os.path.getsize(first), os.path.getsize(second)
+        common = min(sizes)
+        ranges = []
+
+        def add(begin: int, end: int) -> None:
+            if ranges and begin - ranges[-1][1] <= merge_gap:
+                ranges[-1][1] = end
+            else:
+                ranges.append([begin, end])
+
+        if common:
+            a = np.memmap(first, dtype=np.uint8, mode="r", shape=(common,))
+            b = np.memmap(second, dtype=np.uint8, mode="r", shape=(common,))
+            for offset in range(0, common, chunk_size):
+                changed = np.flatnonzero(a[offset:offset + chunk_size] != b[offset:offset + chunk_size])
+                if not changed.size:
+                    continue
+                # 相邻两个不同字节的间隔超过 merge_gap 处为区域边界
+                breaks = np.flatnonzero(np.diff(changed) > merge_gap + 1)
+                begins = changed[np.r_[0, breaks + 1]] + offset
+                ends = changed[np.r_[breaks, changed.size - 1]] + offset + 1
+                for begin, end in zip(begins.tolist(), ends.tolist()):
+                    add(begin, end)
+            del a, b
+        if sizes[0] != sizes[1]:
+            add(common, max(sizes))
+        return [(base_address + begin, end - begin) for begin, end in ranges]
+
+    @staticmethod
+    def checksum_memory(address: int, size: int, memory_class: str = None) -> int:
+        """
+        由调试器计算目标内存的 CRC-32 校验和 (Data.SUM /CRC32), 数据不经过 Remote API 传输
+
+        结果与 zlib.crc32 对相同数据的计算结果一致, 可用于校验下载的数据而无需读回。
+        计算不改变目标状态, 寄存器, 内存, 符号和断点缓存均保持有效。
+
+        :param address: 起始地址
+        :param size: 字节数, 须大于 0
+        :param memory_class: 访问类型字符串 (TRACE32 的 memory class), 如 "D" | "P" | "SD", 默认不指定
+        :return: CRC-32 校验和
+        """
+        if size <= 0:
+            raise ValueError("size 必须大于 0")
+        prefix = f"{memory_class}:" if memory_class else ""
+        # 直接调用 T32_Cmd 而不是 cmd(), 后者每次都会使所有缓存失效, Image.verify 逐个区域校验时缓存将被反复清空
+        for command in (f"Data.SUM {prefix}{address:#x}--{address + size - 1:#x} /CRC32", "Eval Data.SUM()"):
+            err = __t32__.T32_Cmd(command.encode("GBK"))
+            if error_mapping(err):
+                raise error_mapping(err)()
+        return T32.eval_get()
+
+    @staticmethod
+    def write_memory(
+            address: int, access: int, content: int | bytes | bytearray | memoryview,
+            size: int = None, byteorder: str = "big"
+    ) -> None:
+        """
+        向目标CPU写入内存
+
+        :param address: 字节地址（需根据架构预处理：字寻址需×字长，寄存器需×宽度）
+        :param access: 访问类型（若已用T32_SetMemoryAccessClass设置，此参数被忽略）
+        :param content: 要写入的整数值，写入值与输入样式相同。0b...
+            也可以是 bytes 或任意 buffer 协议对象, 此时按原样写入 (见 write_memory_buffer)
+        :param size: 整数值写入的字节数, 默认为容纳该值的最小字节数 (负数按补码, 含符号位)
+        :param byteorder: 整数值的字节序 big | little, 小端目标写入标量时应使用 little
+        """
+        if isinstance(content, int):
+            # 负数按补码计算所需的位数 (含符号位): -128 为 1 字节, -129 为 2 字节
+            width = (~content).bit_length() + 1 if content < 0 else content.bit_length()
+            size = size or (width + 7) // 8 or 1
+            content = content.to_bytes(size, byteorder=byteorder, signed=content < 0)
+        T32.write_memory_buffer(address, access, content)
+
+    @staticmethod
+    def write_memory_buffer(address: int, access: int, data, chunk_size: int = 0x10000) -> TransferStats:
+        """
+        向目标CPU批量写入内存, 数据直接从调用者的缓冲区传给 Remote API, 不经过整数转换
+
+        数据按 chunk_size 分块调用 T32_WriteMemory, 分块大小向下取整为 MaxPacketSize (2048) 的整数倍,
+        大于 MaxPacketSize 的分块在 API 内部以流水线方式 (WriteMemoryPipe) 发送, 每块只需一次最终同步。
+
+        :param address: 字节地址（需根据架构预处理：字寻址需×字长，寄存器需×宽度）
+        :param access: 访问类型（若已用T32_SetMemoryAccessClass设置，此参数被忽略）
+        :param data: bytes, bytearray, memoryview, mmap, numpy 数组等连续的 buffer 协议对象
+            (只读的 memoryview 切片等无法直接取得地址的对象, 每个分块会拷贝一次)
+        :param chunk_size: 每次调用写入的最大字节数
+        :return: 传输统计 (字节数, 耗时, 吞吐量)
+        """
+        view = memoryview(data).cast("B")
+        size = view.nbytes
+        chunk_size = max(chunk_size // MAX_PACKET_SIZE, 1) * MAX_PACKET_SIZE
+
+        # bytes 对象可以直接取得其内部缓冲区的地址, 不需要拷贝
+        base = None
+        if view.readonly and isinstance(view.obj, bytes) and len(view.obj) == size:
+            base = cast(c_char_p(view.obj), c_void_p).value
+
+        chunks, start = 0, time.perf_counter()
+        for offset in range(0, size, chunk_size):
+            length = min(chunk_size, size - offset)
+            if base is not None:
+                buffer = c_void_p(base + offset)
+            elif not view.readonly:
+                buffer = (c_ubyte * length).from_buffer(view, offset)
+            else:
+                buffer = (c_ubyte * length).from_buffer_copy(view, offset)
+            err = __t32__.T32_WriteMemory(
+                c_uint32(address + offset), c_int(access), buffer, c_size_t(length)
+            )
+            if error_mapping(err):
+                _memory.invalidate(address, size)
+                raise error_mapping(err)()
+            chunks += 1
+        _memory.write(address, access, view)
+        return TransferStats(size, time.perf_counter() - start, chunks)
 
     @staticmethod
     def write_memory_pipe() -> None:
@@ -719,7 +1484,7 @@ class T32:
         :return: (地址, 大小, 保留值)
         """
         address, size, reserved = c_uint32(0), c_uint32(0), c_uint32(0)
-        err = __t32__.T32_GetSymbol(byref(symbol), byref(address), byref(size), byref(reserved))
+        err = __t32__.T32_GetSymbol(symbol.encode("GBK"), byref(address), byref(size), byref(reserved))
         if error_mapping(err):
             raise error_mapping(err)()
         return address.value, size.value, reserved.value
@@ -737,7 +1502,146 @@ class T32:
         if error_mapping(err):
             raise error_mapping(err)()
         return symbol.value.decode("GBK")
-    
+
+    @staticmethod
+    def lookup_symbol(symbol: str) -> tuple[int, int] | None:
+        """
+        根据符号名获取其地址和大小 (带缓存)
+
+        结果缓存在有界的符号缓存中, 执行 Data.LOAD 等重新加载程序的命令后自动失效
+
+        :param symbol: 符号名
+        :return: (地址, 大小), 符号不存在时为 None
+        """
+        return _symbols.lookup(symbol)
+
+    @staticmethod
+    def symbolize(address: int) -> tuple[str, int] | None:
+        """
+        获取地址所属的符号 (带缓存)
+
+        已查询过的符号按地址区间建立索引, 落在其范围内的地址直接从缓存中返回;
+        通过 load_symbol_table() 加载了完整符号表后只在本地查询
+
+        :param address: 要查询的地址
+        :return: (符号名, 相对符号起始地址的偏移), 没有符号时为 None
+        """
+        return _symbols.symbolize(address)
+
+    @staticmethod
+    def invalidate_symbols() -> int:
+        """
+        使符号缓存失效
+
+        通过 cmd()/cmd_f() 执行的 Data.LOAD, sYmbol.RESet, DO 等命令会自动使缓存失效,
+        其他方式 (如 TRACE32 界面) 加载程序后需要手动调用
+
+        :return: 新的缓存纪元
+        """
+        return _symbols.invalidate()
+
+    @staticmethod
+    def symbol_cache() -> SymbolCache:
+        """
+        获取符号缓存, 用于查看命中统计或调整容量
+
+        :return: 符号缓存
+        """
+        return _symbols
+
+    @staticmethod
+    def enable_memory_cache(page_size: int = 0x1000, max_pages: int = 1024, uncacheable=()) -> MemoryCache:
+        """
+        启用内存缓存, read_memory / read_memory_into 按页缓存读取的内存 (目标停止期间有效)
+
+        写内存时同时更新缓存; 目标运行, 单步, 复位或执行命令后缓存自动失效。
+        关闭缓存: T32.memory_cache().enabled = False
+
+        :param page_size: 页大小 (字节), 须为 2 的幂; 每次缺页至少读取一整页
+        :param max_pages: 最多缓存的页数, 超出时淘汰最久未使用的页
+        :param uncacheable: 不可缓存的区域 (地址, 字节数) 序列, 如外设寄存器
+        :return: 内存缓存
+        """
+        _memory.configure(page_size, max_pages)
+        for address, size in uncacheable:
+            _memory.add_uncacheable(address, size)
+        _memory.enabled = True
+        return _memory
+
+    @staticmethod
+    def memory_cache() -> MemoryCache:
+        """
+        获取内存缓存, 用于查看命中统计, 标记不可缓存区域或关闭缓存
+
+        :return: 内存缓存
+        """
+        return _memory
+
+    @staticmethod
+    def invalidate_registers() -> int:
+        """
+        使寄存器缓存失效
+
+        通过 T32 的函数运行目标, 单步, 复位, 写寄存器或执行命令时会自动失效,
+        通过其他方式 (如 TRACE32 界面) 改变目标状态后需要手动调用
+
+        :return: 新的停止纪元
+        """
+        return _registers.invalidate()
+
+    @staticmethod
+    def register_cache() -> RegisterCache:
+        """
+        获取寄存器缓存, 用于查看命中统计或关闭缓存 (enabled = False)
+
+        :return: 寄存器缓存
+        """
+        return _registers
+
+    @staticmethod
+    def load_symbol_table(elf: str = None, cache_dir: str = None, command: str = "sYmbol.List",
+                          chunk_size: int = EMU_CBMAXDATASIZE) -> SymbolTable:
+        """
+        一次性导出完整符号表并建立本地索引
+
+        通过 get_window_content 以 CSV 格式分块读取 command 的输出, 按地址排序后保存为平行数组。
+        指定 elf 时以其 SHA-256 为键把符号表缓存到 cache_dir, 之后直接 mmap 打开缓存文件而不再查询调试器。
+        加载的符号表同时被符号缓存使用, lookup_symbol()/symbolize() 优先从中查询。
+
+        :param elf: 已加载到调试器的 ELF 文件路径, 为 None 时不使用缓存文件
+        :param cache_dir: 缓存目录, 默认为 $XDG_CACHE_HOME/trace32 (或 ~/.cache/trace32)
+        :param command: 列出符号的窗口命令
+        :param chunk_size: 每次读取窗口内容的字节数
+        :return: 符号表
+        """
+        path = None
+        if elf is not None:
+            digest = hashlib.sha256()
+            with open(elf, "rb") as f:
+                while chunk := f.read(0x100000):
+                    digest.update(chunk)
+            if cache_dir is None:
+                cache_dir = os.path.join(
+                    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "trace32"
+                )
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, f"{digest.hexdigest()}.t32sym")
+            try:
+                table = SymbolTable.open(path)
+            except (OSError, ValueError):
+                table = None
+            if table is not None:
+                _symbols.table = table
+                return table
+
+        lines = iter_lines(T32.iter_window_content(command, "csv", chunk_size))
+        table = SymbolTable.from_symbols(parse_symbol_list(lines))
+        # 先替换 (并关闭) 旧的符号表, 它可能映射着同一个缓存文件
+        _symbols.table = table
+        if path is not None:
+            table.save(path)
+        return table
+
     @staticmethod
     def read_variable_string(symbol: str) -> str:
         """
@@ -778,7 +1682,8 @@ class T32:
         if not (0 <= value <= 0xFFFFFFFFFFFFFFFF):
             raise ValueError("值超出64位整形范围")
         l_value, h_value = c_uint32(value & 0xFFFFFFFF), c_uint32(value >> 32)
-        err = __t32__.T32_WriteVariableValue(symbol.encode('GBK'), byref(l_value), byref(h_value))
+        err = __t32__.T32_WriteVariableValue(symbol.encode('GBK'), l_value, h_value)
+        _memory.invalidate()
         if error_mapping(err):
             raise error_mapping(err)()
 
@@ -789,36 +1694,130 @@ class T32:
 
         :param cmd: 要执行的命令
         :param fmt: 输出格式 asc | asce | ascp | csv | xml
+        :param size: 每次读取的字节数
+        :return: 完整的窗口内容
         """
-        offset, content = 0, bytearray()
-        buffer = create_string_buffer(size)
+        return "".join(T32.iter_window_content(cmd, fmt, size))
+
+    @staticmethod
+    def iter_window_content(cmd: str, fmt: str = 'csv', chunk_size: int = 4096) -> Iterator[str]:
+        """
+        分块读取 TRACE32 的窗口内容, 每读到一块立即返回
+
+        跨越分块边界的多字节字符会被正确拼接
+
+        :param cmd: 要执行的命令
+        :param fmt: 输出格式 asc | asce | ascp | csv | xml
+        :param chunk_size: 每次读取的字节数
+        :return: 文本分块的迭代器, 读取失败时抛出包含命令的 T32WindowContentError (T32_GetWindowContent 不区分失败原因)
+        """
+        command = cmd.encode('GBK')
+        print_code = c_uint32({'asc': 0, 'asce': 1, 'ascp': 2, 'csv': 3, 'xml': 4}[fmt])
+        decoder = codecs.getincrementaldecoder("GBK")(errors="replace")
+        buffer = create_string_buffer(chunk_size)
+        offset = 0
         while True:
-            byte_read = __t32__.T32_GetWindowContent(
-                cmd.encode('GBK'), buffer, c_uint32(size), c_uint32(offset), 
-                c_uint32({'asc': 0, 'asce': 1, 'ascp': 2, 'csv': 3, 'xml': 4}[fmt])
-                )
-            if byte_read == -1:
-                return buffer.value.decode("GBK")
-            if byte_read < 0 and error_mapping(byte_read):
-                raise error_mapping(byte_read)()
-            content += buffer.raw[:byte_read]
+            byte_read = __t32__.T32_GetWindowContent(command, buffer, c_uint32(chunk_size), c_uint32(offset), print_code)
+            if byte_read < 0:
+                raise T32WindowContentError(f"获取窗口内容失败 (偏移 {offset}): {cmd}")
+            if byte_read == 0:
+                break
+            offset += byte_read
+            if text := decoder.decode(buffer.raw[:byte_read]):
+                yield text
+        if text := decoder.decode(b"", final=True):
+            yield text
 
     @staticmethod
-    def read_register_by_name() -> int:
-        """ 
-        
+    def iter_window_rows(cmd: str, fmt: str = 'csv', chunk_size: int = 4096) -> Iterator:
         """
-        err = __t32__.T32_ReadRegisterByName()
-        if error_mapping(err):
-            raise error_mapping(err)()
+        分块读取 TRACE32 的窗口内容并增量解析
+
+        内存占用只与分块大小和单条记录的大小有关, 可用于处理数百 MB 的 Trace.List 等窗口
+
+        :param cmd: 要执行的命令
+        :param fmt: 输出格式: csv 返回每行的字段列表, xml 返回根元素下的每个子元素, 其他格式返回每一行文本
+        :param chunk_size: 每次读取的字节数
+        :return: 记录的迭代器
+        """
+        chunks = T32.iter_window_content(cmd, fmt, chunk_size)
+        if fmt == 'csv':
+            return iter_csv(chunks)
+        if fmt == 'xml':
+            return iter_xml(chunks)
+        return (line.rstrip("\r\n") for line in iter_lines(chunks))
 
     @staticmethod
-    def write_register_by_name() -> int:
-        """ """
-        err = __t32__.T32_WriteRegisterByName()
+    def read_register_by_name(name: str) -> int:
+        """
+        按名称读取一个寄存器, 目标停止期间重复读取时使用寄存器缓存
+
+        :param name: 寄存器名, 如 "PC" | "R0"
+        :return: 寄存器的值 (最多 64 位)
+        """
+        def read() -> list[int]:
+            lower, upper = c_uint32(), c_uint32()
+            err = __t32__.T32_ReadRegisterByName(name.encode('GBK'), byref(lower), byref(upper))
+            if error_mapping(err):
+                raise error_mapping(err)()
+            return [upper.value << 32 | lower.value]
+
+        return _registers.get(((name.upper(), 64),), read)[0]
+
+    @staticmethod
+    def write_register_by_name(name: str, value: int) -> None:
+        """
+        按名称写入一个寄存器
+
+        :param name: 寄存器名, 如 "PC" | "R0"
+        :param value: 要写入的值 (最多 64 位)
+        """
+        if not (0 <= value <= 0xFFFFFFFFFFFFFFFF):
+            raise ValueError("值超出64位整形范围")
+        err = __t32__.T32_WriteRegisterByName(
+            name.encode('GBK'), c_uint32(value & 0xFFFFFFFF), c_uint32(value >> 32)
+        )
+        _registers.invalidate(still_halted=True)
         if error_mapping(err):
             raise error_mapping(err)()
 
+    @staticmethod
+    def read_registers(names, width: int = 32, as_array: bool = False) -> dict[str, int] | array:
+        """
+        一次往返读取多个寄存器, 基于 T32_RegisterSetObj
+
+        每组寄存器名对应的 RegisterSet 按通道缓存, 寄存器 ID 只在第一次读取时解析。
+        目标停止期间再次读取已读过的寄存器时使用寄存器缓存, 不与调试器通信。
+
+        :param names: 寄存器名序列
+        :param width: 寄存器宽度 32 | 64
+        :param as_array: 返回与 names 顺序一致的 array('Q') 而不是字典
+        :return: {寄存器名: 值} 或 array('Q')
+        """
+        register_set = T32._register_set(names, width)
+        values = _registers.get([(name.upper(), width) for name in register_set.names], register_set.read_array)
+        return array('Q', values) if as_array else dict(zip(register_set.names, values))
+
+    @staticmethod
+    def write_registers(values: dict[str, int], width: int = 32) -> None:
+        """
+        一次往返写入多个寄存器, 基于 T32_RegisterSetObj
+
+        :param values: {寄存器名: 值}
+        :param width: 寄存器宽度 32 | 64
+        """
+        try:
+            T32._register_set(values, width).write(values)
+        finally:
+            _registers.invalidate(still_halted=True)
+
+    @staticmethod
+    def _register_set(names, width: int) -> RegisterSet:
+        key = (tuple(names), width, id(_current_channel))
+        if (register_set := _register_sets.get(key)) is None:
+            register_set = _register_sets[key] = RegisterSet(key[0], width)
+        return register_set
+
     @staticmethod
     def read_pp() -> int:
         """ 
@@ -830,60 +1829,322 @@ class T32:
 
         :return: 当前程序在内存中所指向位置
         """
-        pointer = c_uint32(0)
-        err = __t32__.T32_ReadPP(byref(pointer))
+        def read() -> list[int]:
+            pointer = c_uint32(0)
+            err = __t32__.T32_ReadPP(byref(pointer))
+            if error_mapping(err):
+                raise error_mapping(err)()
+            return [pointer.value]
+
+        # 程序指针不是寄存器名, 用不会与寄存器名冲突的键缓存
+        return _registers.get(("@PP",), read)[0]
+
+    @staticmethod
+    def read_register(mask: int) -> list[int]:
+        """
+        按掩码读取寄存器 (32 位), 寄存器编号与位的对应关系取决于处理器
+
+        :param mask: 64 位掩码, 第 i 位为 1 时读取第 i 个寄存器
+        :return: 64 个元素的列表, 第 i 个元素为第 i 个寄存器的值, 未读取的为 0
+        """
+        buffer = (c_uint32 * 64)()
+        err = __t32__.T32_ReadRegister(c_uint32(mask & 0xFFFFFFFF), c_uint32(mask >> 32 & 0xFFFFFFFF), buffer)
         if error_mapping(err):
             raise error_mapping(err)()
-        return pointer.value
+        return list(buffer)
 
     @staticmethod
-    def read_register() -> int:
-        """ """
-        err = __t32__.T32_ReadRegister()
+    def write_register(mask: int, values) -> None:
+        """
+        按掩码写入寄存器 (32 位), 寄存器编号与位的对应关系取决于处理器
+
+        :param mask: 64 位掩码, 第 i 位为 1 时写入第 i 个寄存器
+        :param values: 按寄存器编号索引的值序列 (如 read_register 的返回值), 未选中的元素被忽略
+        """
+        buffer = (c_uint32 * 64)(*values)
+        err = __t32__.T32_WriteRegister(c_uint32(mask & 0xFFFFFFFF), c_uint32(mask >> 32 & 0xFFFFFFFF), buffer)
+        _registers.invalidate(still_halted=True)
         if error_mapping(err):
             raise error_mapping(err)()
 
     @staticmethod
-    def write_register() -> int:
-        """ """
-        err = __t32__.T32_WriteRegister()
+    def read_breakpoint(address: int, access: int = 0, size: int = 1) -> list[int]:
+        """
+        读取一段地址上的断点配置
+
+        :param address: 起始地址
+        :param access: 访问类型
+        :param size: 地址数
+        :return: 每个地址的断点配置 (T32_BPCONFIG_* 的组合), 没有断点的地址为 0
+        """
+        config = (c_uint16 * size)()
+        err = __t32__.T32_ReadBreakpoint(c_uint32(address), c_int(access), config, c_int(size))
         if error_mapping(err):
             raise error_mapping(err)()
+        return list(config)
 
     @staticmethod
-    def read_breakpoint() -> int:
-        """ """
-        err = __t32__.T32_ReadBreakpoint()
+    def write_breakpoint(address: int, access: int, config: int, size: int = 1) -> None:
+        """
+        设置或清除一段地址上的断点
+
+        :param address: 起始地址
+        :param access: 访问类型
+        :param config: T32_BPCONFIG_* 的组合, 含 0x100 (DELETE) 时清除其余位对应的断点
+        :param size: 地址数
+        """
+        err = __t32__.T32_WriteBreakpoint(c_uint32(address), c_int(access), c_int(config), c_int(size))
+        # 断点表镜像不记录旧式接口的配置, 无论成败都重新读取
+        _breakpoints.invalidate()
         if error_mapping(err):
             raise error_mapping(err)()
 
     @staticmethod
-    def write_breakpoint() -> int:
-        """ """
-        err = __t32__.T32_WriteBreakpoint()
+    def get_breakpoint_list(limit: int = BREAKPOINT_LIST_MAX) -> list[Breakpoint]:
+        """
+        一次往返读取断点列表, 不经过断点表镜像
+
+        调试器一次最多返回 BREAKPOINT_LIST_MAX (119) 个断点, 更多的断点请使用 list_breakpoints()。
+
+        :param limit: 预先分配的断点数, 调试器返回的断点更多时以实际数量重新读取一次
+        :return: 断点列表, type 与 impl 为调试器报告的原始值
+        """
+        settings = (_BreakpointStruct * limit)()
+        number = c_int()
+        err = __t32__.T32_GetBreakpointList(byref(number), settings, c_int(limit))
         if error_mapping(err):
             raise error_mapping(err)()
+        if number.value > limit:
+            return T32.get_breakpoint_list(number.value)
+        return [
+            Breakpoint(item.address, BreakpointType(item.type), BreakpointImpl(item.auxtype), bool(item.enabled))
+            for item in settings[:number.value]
+        ]
 
     @staticmethod
-    def get_breakpoint_list() -> int:
-        """ """
-        err = __t32__.T32_GetBreakpointList()
+    def set_breakpoints(targets, type: int = BreakpointType.PROGRAM, impl: int = BreakpointImpl.AUTO,
+                        enabled: bool = True, access: str = None) -> list[Breakpoint]:
+        """
+        批量设置断点
+
+        全部断点复用同一个断点对象和地址对象, 每个断点一次 T32_WriteBreakpointObj 往返。
+        设置成功的断点同时记入断点表镜像, 之后 list_breakpoints() 无需查询调试器。
+
+        :param targets: 地址或符号名的序列, 也可以是单个地址或符号名
+        :param type: 断点类型
+        :param impl: 实现方式
+        :param enabled: 是否启用
+        :param access: 访问类型字符串, 如 "P" | "D", 默认不指定
+        :return: 设置的断点, 与 targets 的顺序一致
+        """
+        breakpoints = [
+            Breakpoint(address, BreakpointType(type), BreakpointImpl(impl), enabled, access or "")
+            for address in T32._breakpoint_addresses(targets)
+        ]
+        T32._write_breakpoints(breakpoints, True)
+        return breakpoints
+
+    @staticmethod
+    def clear_breakpoints(targets=None, access: str = None) -> int:
+        """
+        批量清除断点
+
+        每个地址按断点表镜像中记录的类型 (该地址上全部类型的合并) 清除, 镜像中没有的地址清除全部类型的断点。
+
+        :param targets: 地址或符号名的序列, 也可以是单个地址或符号名; 默认清除全部断点
+        :param access: 访问类型字符串, 镜像中没有记录访问类型时使用
+        :return: 清除的断点数
+        """
+        if targets is None:
+            breakpoints = _breakpoints.list()
+        else:
+            breakpoints = [
+                _breakpoints.get(address) or Breakpoint(address, BreakpointType.PROGRAM | BreakpointType.RW,
+                                                        access=access or "")
+                for address in T32._breakpoint_addresses(targets)
+            ]
+        T32._write_breakpoints(breakpoints, False)
+        return len(breakpoints)
+
+    @staticmethod
+    def list_breakpoints(refresh: bool = False) -> list[Breakpoint]:
+        """
+        列出全部断点
+
+        第一次调用 (或镜像失效后) 通过 T32_QueryBreakpointObjCount 和 T32_ReadBreakpointObjByIndex 读取完整的断点表,
+        之后直接返回本地镜像。
+
+        :param refresh: 忽略镜像, 重新从调试器读取
+        :return: 按地址排序的断点列表
+        """
+        if refresh:
+            _breakpoints.invalidate()
+        return _breakpoints.list()
+
+    @staticmethod
+    def invalidate_breakpoints() -> None:
+        """
+        使断点表镜像失效
+
+        执行 Break.* 等命令后会自动失效, 通过其他方式 (如 TRACE32 界面) 修改断点后需要手动调用
+        """
+        _breakpoints.invalidate()
+
+    @staticmethod
+    def breakpoint_cache() -> BreakpointCache:
+        """
+        获取断点表镜像, 用于查看命中统计
+
+        :return: 断点表镜像
+        """
+        return _breakpoints
+
+    @staticmethod
+    def _breakpoint_addresses(targets) -> list[int]:
+        if isinstance(targets, (int, str)):
+            targets = [targets]
+        return [T32._resolve_variable(target)[0] if isinstance(target, str) else int(target) for target in targets]
+
+    @staticmethod
+    def _write_breakpoints(breakpoints: list[Breakpoint], add: bool) -> None:
+        done = []
+        bp, handle = c_void_p(), c_void_p()
+        err = __t32__.T32_RequestBreakpointObj(byref(bp))
+        if error_mapping(err):
+            raise error_mapping(err)()
+        try:
+            err = __t32__.T32_RequestAddressObjA32(byref(handle), c_uint32(0))
+            for breakpoint in breakpoints:
+                if err:
+                    break
+                if breakpoint.address > 0xFFFFFFFF:
+                    err = __t32__.T32_SetAddressObjAddr64(handle, c_uint64(breakpoint.address))
+                else:
+                    err = __t32__.T32_SetAddressObjAddr32(handle, c_uint32(breakpoint.address))
+                err = err or __t32__.T32_SetAddressObjAccessString(handle, breakpoint.access.encode("GBK"))
+                err = err or __t32__.T32_SetBreakpointObjAddress(bp, handle)
+                err = err or __t32__.T32_SetBreakpointObjType(bp, c_uint32(breakpoint.type))
+                err = err or __t32__.T32_SetBreakpointObjImpl(bp, c_uint32(breakpoint.impl))
+                err = err or __t32__.T32_SetBreakpointObjEnable(bp, c_uint8(breakpoint.enabled))
+                err = err or __t32__.T32_WriteBreakpointObj(bp, c_int(add))
+                if not err:
+                    done.append(breakpoint)
+            if error_mapping(err):
+                raise error_mapping(err)()
+        finally:
+            if add:
+                _breakpoints.update(done)
+            else:
+                _breakpoints.remove(done)
+            if handle:
+                __t32__.T32_ReleaseAddressObj(byref(handle))
+            __t32__.T32_ReleaseBreakpointObj(byref(bp))
+
+    @staticmethod
+    def _read_breakpoint_table() -> list[Breakpoint]:
+        count = c_uint32()
+        err = __t32__.T32_QueryBreakpointObjCount(byref(count))
         if error_mapping(err):
             raise error_mapping(err)()
 
-    @staticmethod
-    def get_trace_state() -> int:
-        """ """
-        err = __t32__.T32_GetTraceState()
+        breakpoints = []
+        bp, handle = c_void_p(), c_void_p()
+        err = __t32__.T32_RequestBreakpointObj(byref(bp))
         if error_mapping(err):
             raise error_mapping(err)()
+        try:
+            err = __t32__.T32_RequestAddressObj(byref(handle))
+            address, types, impl, enabled = c_uint64(), c_uint32(), c_uint32(), c_uint8()
+            access = create_string_buffer(16)
+            for index in range(count.value):
+                if err:
+                    break
+                err = __t32__.T32_ReadBreakpointObjByIndex(bp, c_uint32(index))
+                err = err or __t32__.T32_GetBreakpointObjAddress(bp, byref(handle))
+                err = err or __t32__.T32_GetAddressObjAddr64(handle, byref(address))
+                err = err or __t32__.T32_GetAddressObjAccessString(handle, access, c_uint8(len(access)))
+                err = err or __t32__.T32_GetBreakpointObjType(bp, byref(types))
+                err = err or __t32__.T32_GetBreakpointObjImpl(bp, byref(impl))
+                err = err or __t32__.T32_GetBreakpointObjEnable(bp, byref(enabled))
+                if not err:
+                    breakpoints.append(Breakpoint(
+                        address.value, BreakpointType(types.value), BreakpointImpl(impl.value), bool(enabled.value),
+                        access.value.decode("GBK"),
+                    ))
+            if error_mapping(err):
+                raise error_mapping(err)()
+        finally:
+            if handle:
+                __t32__.T32_ReleaseAddressObj(byref(handle))
+            __t32__.T32_ReleaseBreakpointObj(byref(bp))
+        return breakpoints
 
     @staticmethod
-    def read_trace() -> int:
-        """ """
-        err = __t32__.T32_ReadTrace()
+    def get_trace_state(trace_type: int = 0) -> TraceState:
+        """
+        获取跟踪缓冲区的状态
+
+        :param trace_type: 跟踪类型 0 Trace | 1 Integrator | 2 Port Analyzer
+        :return: 跟踪状态, 大小以及有效记录的编号范围
+        """
+        state, size, min_, max_ = c_int(0), c_int32(0), c_int32(0), c_int32(0)
+        err = __t32__.T32_GetTraceState(c_int(trace_type), byref(state), byref(size), byref(min_), byref(max_))
         if error_mapping(err):
             raise error_mapping(err)()
+        return TraceState(state.value, size.value, min_.value, max_.value)
+
+    @staticmethod
+    def read_trace(start: int = None, count: int = None, fields: int = TraceField.ALL, trace_type: int = 0,
+                   block: int = 0x4000, out: str = None, max_memory: int = 1 << 30):
+        """
+        批量读取跟踪记录到 numpy 结构化数组 (需要安装 numpy)
+
+        每次调用读取 block 条记录, 直接写入结果数组的内存中, 不经过中间缓冲区。
+        数组的字段由 fields 决定: cycle, address, data (uint32) 和 timestamp (int64), 其他位为 word<n> (uint32)。
+        指定 out 或结果超过 max_memory 字节时写入内存映射的 .npy 文件 (未指定 out 时为临时文件, 路径见返回值的 filename)。
+
+        :param start: 第一条记录的编号, 默认为最早的记录
+        :param count: 记录数, 默认读到最新的记录
+        :param fields: 字段掩码, 见 TraceField
+        :param trace_type: 跟踪类型 0 Trace | 1 Integrator | 2 Port Analyzer
+        :param block: 每次调用读取的记录数
+        :param out: .npy 文件路径
+        :param max_memory: 在内存中保存结果的最大字节数
+        :return: numpy 结构化数组或 numpy.memmap
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("read_trace 需要安装 numpy") from e
+        if not fields:
+            raise ValueError("至少需要选择一个字段")
+        if start is None or count is None:
+            state = T32.get_trace_state(trace_type)
+            start = state.min if start is None else start
+            count = state.max - start + 1 if count is None else count
+        count = max(count, 0)
+        dtype = _trace_dtype(fields)
+
+        if out is None and count * dtype.itemsize > max_memory:
+            fd, out = tempfile.mkstemp(suffix=".npy")
+            os.close(fd)
+        if out is None:
+            records = np.empty(count, dtype)
+        else:
+            records = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=(count,))
+
+        address = records.ctypes.data
+        for first in range(0, count, block):
+            n = min(block, count - first)
+            err = __t32__.T32_ReadTrace(
+                c_int(trace_type), c_int32(start + first), c_int(n), c_uint32(fields),
+                c_void_p(address + first * dtype.itemsize),
+            )
+            if error_mapping(err):
+                raise error_mapping(err)()
+        if out is not None:
+            records.flush()
+        return records
 
     @staticmethod
     def get_last_error_message() -> int:
@@ -893,44 +2154,164 @@ class T32:
             raise error_mapping(err)()
 
     @staticmethod
-    def notify_state_enable() -> int:
-        """ """
-        err = __t32__.T32_NotifyStateEnable()
+    def notify_state_enable(event: int, callback) -> None:
+        """
+        启用 (或在 callback 为 None 时停用) 一类状态通知
+
+        通知在调用 check_state_notify() 时才会被分发, 回调参数见 hremote.c:
+
+        - BREAK: (parameter, pc, reason)
+        - EDIT: (parameter, line, file: bytes)
+        - BREAKPOINT_CONFIG: (parameter)
+        - RTS_TRIGGER: (parameter, time, code, param)
+        - ERROR: (parameter, code, message: bytes)
+
+        :param event: 通知类型, 见 NotifyEvent
+        :param callback: 回调函数
+        """
+        event = NotifyEvent(event)
+        function = _NOTIFY_CALLBACK_TYPES[event](callback) if callback is not None else None
+        err = __t32__.T32_NotifyStateEnable(c_int(event), function)
         if error_mapping(err):
             raise error_mapping(err)()
+        if function is None:
+            _notify_callbacks.pop(event, None)
+        else:
+            _notify_callbacks[event] = function
 
     @staticmethod
-    def notify_event_enable() -> int:
-        """ """
-        err = __t32__.T32_NotifyEventEnable()
+    def notify_event_enable(event: str, callback) -> None:
+        """
+        启用 (或在 callback 为 None 时停用) PRACTICE ON 事件的通知, 回调参数为 (parameter)
+
+        :param event: 事件名
+        :param callback: 回调函数
+        """
+        function = _NOTIFY_CALLBACK_TYPES[NotifyEvent.ON_EVENT](callback) if callback is not None else None
+        err = __t32__.T32_NotifyEventEnable(event.encode("GBK"), function)
         if error_mapping(err):
             raise error_mapping(err)()
+        if function is None:
+            _notify_callbacks.pop(event, None)
+        else:
+            _notify_callbacks[event] = function
 
     @staticmethod
-    def check_state_notify() -> int:
-        """ """
-        err = __t32__.T32_CheckStateNotify()
+    def check_state_notify(parameter: int = 0) -> None:
+        """
+        检查并分发所有已收到的通知, 回调在调用线程上执行
+
+        :param parameter: 传给回调的第一个参数
+        """
+        err = __t32__.T32_CheckStateNotify(c_uint(parameter))
         if error_mapping(err):
             raise error_mapping(err)()
 
     @staticmethod
-    def notification_pending() -> int:
-        """ """
-        err = __t32__.T32_NotificationPending()
-        if error_mapping(err):
-            raise error_mapping(err)()
+    def notification_pending() -> bool:
+        """
+        是否有已收到但尚未分发的通知 (只检查本地队列, 不与 TRACE32 通信)
+
+        :return: 有待分发的通知时为 True
+        """
+        return __t32__.T32_NotificationPending() > 0
 
     @staticmethod
-    def get_analyzer_status() -> int:
-        """ """
-        err = __t32__.T32_AnaStatusGet()
+    def get_analyzer_status() -> TraceState:
+        """
+        获取分析器 (Analyzer) 的状态
+
+        :return: 分析器状态, 大小以及有效记录的编号范围
+        """
+        state, size, min_, max_ = c_uint8(0), c_int32(0), c_int32(0), c_int32(0)
+        err = __t32__.T32_AnaStatusGet(byref(state), byref(size), byref(min_), byref(max_))
         if error_mapping(err):
             raise error_mapping(err)()
+        return TraceState(state.value, size.value, min_.value, max_.value)
 
     @staticmethod
-    def get_analyzer_record() -> int:
-        """ """
-        err = __t32__.T32_AnaRecordGet
+    def get_analyzer_record(record: int, length: int = 128) -> bytes:
+        """
+        读取单条分析器记录的原始数据
+
+        每条记录需要一次往返, 读取大量记录请使用 iter_analyzer_records()
+
+        :param record: 记录编号
+        :param length: 读取的字节数
+        :return: 记录的原始数据
+        """
+        buffer = create_string_buffer(max(length, 1))
+        err = __t32__.T32_AnaRecordGet(c_int32(record), buffer, c_int(length))
+        if error_mapping(err):
+            raise error_mapping(err)()
+        return buffer.raw[:length]
+
+    @staticmethod
+    def iter_analyzer_records(start: int = None, count: int = None, fields: int = TraceField.ALL,
+                              batch: int = 1024, file=None, trace_type: int = 0) -> Iterator[tuple]:
+        """
+        按记录范围流式读取分析器记录
+
+        记录以 T32_ReadTrace 成批读取, 每批 batch 条, 逐条以具名元组 (record, 字段...) 返回。
+        默认的记录范围取自同一跟踪类型的 T32_GetTraceState, 与读取使用的跟踪缓冲区一致。
+        指定 file 时每批原始数据到达后立即追加到文件中, 可以用 iter_analyzer_file() 读回。
+
+        :param start: 第一条记录的编号, 默认为最早的记录
+        :param count: 记录数, 默认读到最新的记录
+        :param fields: 字段掩码, 见 TraceField
+        :param batch: 每次调用读取的记录数
+        :param file: 文件路径或以二进制方式打开的文件对象
+        :param trace_type: 跟踪类型 0 Trace (当前选择的跟踪方式) | 1 Integrator | 2 Port Analyzer
+        :return: 记录的迭代器
+        """
+        if not fields:
+            raise ValueError("至少需要选择一个字段")
+        if start is None or count is None:
+            state = T32.get_trace_state(trace_type)
+            start = state.min if start is None else start
+            count = state.max - start + 1 if count is None else count
+        layout = _trace_layout(fields)
+        record = struct.Struct("<" + "".join(fmt for _, fmt in layout))
+        Record = namedtuple("AnalyzerRecord", ["record"] + [name for name, _ in layout])
+        buffer = create_string_buffer(batch * record.size)
+
+        f = open(file, "wb") if isinstance(file, (str, os.PathLike)) else file
+        try:
+            if f is not None:
+                f.write(_ANALYZER_HEADER.pack(_ANALYZER_MAGIC, fields, start))
+            for first in range(0, max(count, 0), batch):
+                n = min(batch, count - first)
+                err = __t32__.T32_ReadTrace(c_int(trace_type), c_int32(start + first), c_int(n), c_uint32(fields), buffer)
+                if error_mapping(err):
+                    raise error_mapping(err)()
+                data = memoryview(buffer)[:n * record.size]
+                if f is not None:
+                    f.write(data)
+                for i, values in enumerate(record.iter_unpack(data), start + first):
+                    yield Record(i, *values)
+        finally:
+            if f is not file:
+                f.close()
+
+    @staticmethod
+    def iter_analyzer_file(file) -> Iterator[tuple]:
+        """
+        读取 iter_analyzer_records() 写入的记录文件
+
+        :param file: 文件路径
+        :return: 与 iter_analyzer_records() 相同的记录的迭代器
+        """
+        with open(file, "rb") as f:
+            magic, fields, start = _ANALYZER_HEADER.unpack(f.read(_ANALYZER_HEADER.size))
+            if magic != _ANALYZER_MAGIC:
+                raise ValueError(f"{file} 不是分析器记录文件")
+            layout = _trace_layout(fields)
+            record = struct.Struct("<" + "".join(fmt for _, fmt in layout))
+            Record = namedtuple("AnalyzerRecord", ["record"] + [name for name, _ in layout])
+            while data := f.read(record.size * 1024):
+                for values in record.iter_unpack(data[:len(data) - len(data) % record.size]):
+                    yield Record(start, *values)
+                    start += 1
 
     # --------------------------------------------------------------------------
     # note 面向对象风格的函数
@@ -964,39 +2345,341 @@ class T32:
             向 TRACE32 发送对象信息：T32_Send<objtype>Obj
     """
 
+    @staticmethod
+    def read_memory_bundle(regions, length: int = None, access: str = None) -> list[BundleEntry]:
+        """
+        一次往返读取多个分散的内存区域 (scatter-gather), 基于 T32_MemoryBundleObj
+
+        所有区域打包进一个内存包一起传输。单次传输的数据量受 EMU_CBMAXDATASIZE (15 KiB) 限制,
+        超出时自动拆分为尽可能少的几次传输。
+
+        :param regions: (地址, 长度) 序列; 指定 length 时为地址序列 (如 numpy 地址数组)
+        :param length: 每个地址读取的字节数
+        :param access: 访问类型字符串, 如 "D" | "P" | "SD", 默认不指定
+        :return: 与输入顺序一致的结果, 读取失败的区域 data 为 None, status 为 BufferSyncStatus.ERROR
+        """
+        if length is not None:
+            regions = [(int(address), length, None) for address in regions]
+        else:
+            regions = [(int(address), int(size), None) for address, size in regions]
+        return T32._transfer_bundles(regions, access)
+
+    @staticmethod
+    def write_memory_bundle(blocks, access: str = None) -> list[BundleEntry]:
+        """
+        一次往返写入多个分散的内存区域, 基于 T32_MemoryBundleObj
+
+        :param blocks: (地址, 数据) 序列, 数据为 bytes-like 对象
+        :param access: 访问类型字符串, 如 "D" | "P" | "SD", 默认不指定
+        :return: 与输入顺序一致的结果, 写入失败的区域 status 为 BufferSyncStatus.ERROR
+        """
+        blocks = [(int(address), len(data), bytes(data)) for address, data in blocks]
+        try:
+            return T32._transfer_bundles(blocks, access)
+        finally:
+            for address, size, _ in blocks:
+                _memory.invalidate(address, size)
+
+    @staticmethod
+    def _transfer_bundles(regions: list[tuple[int, int, bytes | None]], access: str | None) -> list[BundleEntry]:
+        access = access.encode("GBK") if access else b""
+        results = []
+        for batch in T32._bundle_batches(regions, access):
+            results += T32._transfer_bundle(batch, access)
+        return results
+
+    @staticmethod
+    def _bundle_batches(regions: list[tuple[int, int, bytes | None]], access: bytes):
+        """按请求和应答报文的大小上限 (EMU_CBMAXDATASIZE) 将区域列表切分成若干批"""
+        params = 2 + 2 + (4 + ((len(access) + 2) & ~1) if access else 0)
+        batch, request, reply = [], 10, 4
+        for address, size, data in regions:
+            entry_request = 4 + params + (8 if address > 0xFFFFFFFF else 4)
+            entry_reply = 2
+            if data is None:
+                entry_reply += size
+            else:
+                entry_request += (size + 1) & ~1
+            if 10 + entry_request > EMU_CBMAXDATASIZE or 4 + entry_reply > EMU_CBMAXDATASIZE:
+                raise ValueError(f"区域 {address:#x} 长度 {size} 超出单次传输上限, 请使用 read_memory_into/write_memory_buffer")
+            if batch and (request + entry_request > EMU_CBMAXDATASIZE or reply + entry_reply > EMU_CBMAXDATASIZE):
+                yield batch
+                batch, request, reply = [], 10, 4
+            batch.append((address, size, data))
+            request += entry_request
+            reply += entry_reply
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _transfer_bundle(batch: list[tuple[int, int, bytes | None]], access: bytes) -> list[BundleEntry]:
+        bundle, handle = c_void_p(), c_void_p()
+        err = __t32__.T32_RequestMemoryBundleObj(byref(bundle), c_int(len(batch)))
+        if error_mapping(err):
+            raise error_mapping(err)()
+        try:
+            # 地址对象在加入内存包时会被复制, 因此只需一个对象反复修改地址
+            err = __t32__.T32_RequestAddressObjA32(byref(handle), c_uint32(0))
+            if not err and access:
+                err = __t32__.T32_SetAddressObjAccessString(handle, access)
+            for address, size, data in batch:
+                if err:
+                    break
+                if address > 0xFFFFFFFF:
+                    err = __t32__.T32_SetAddressObjAddr64(handle, c_uint64(address))
+                else:
+                    err = __t32__.T32_SetAddressObjAddr32(handle, c_uint32(address))
+                if err:
+                    break
+                if data is None:
+                    err = __t32__.T32_AddToBundleObjAddrLength(bundle, handle, c_uint32(size))
+                else:
+                    err = __t32__.T32_AddToBundleObjAddrLengthByteArray(bundle, handle, c_uint32(size), data)
+            if error_mapping(err):
+                raise error_mapping(err)()
+
+            # 个别区域失败时返回 TransferFailed, 具体结果由各区域的同步状态给出
+            err = __t32__.T32_TransferMemoryBundleObj(bundle)
+            if err != T32TransferMemoryBundleObjTransferFailedError.code and error_mapping(err):
+                raise error_mapping(err)()
+
+            results, status = [], c_int()
+            for index, (address, size, data) in enumerate(batch):
+                err = __t32__.T32_GetBundleObjSyncStatusByIndex(bundle, byref(status), c_uint32(index))
+                if error_mapping(err):
+                    raise error_mapping(err)()
+                if status.value == BufferSyncStatus.READ:
+                    buffer = create_string_buffer(size)
+                    err = __t32__.T32_CopyDataFromBundleObjByIndex(buffer, c_int(size), bundle, c_uint32(index))
+                    if error_mapping(err):
+                        raise error_mapping(err)()
+                    data = buffer.raw
+                elif data is None or status.value != BufferSyncStatus.WRITTEN:
+                    data = None
+                results.append(BundleEntry(address, size, data, BufferSyncStatus(status.value)))
+            return results
+        finally:
+            if handle:
+                __t32__.T32_ReleaseAddressObj(byref(handle))
+            __t32__.T32_ReleaseMemoryBundleObj(byref(bundle))
+
+    @staticmethod
+    def _resolve_variable(symbol: str) -> tuple[int, int]:
+        """查询并缓存变量的地址和大小"""
+        if (result := _symbols.lookup(symbol)) is None:
+            raise ValueError(f"符号 {symbol} 不存在")
+        return result
+
+    @staticmethod
+    def read_variables(symbols, byteorder: str = "little", max_gap: int = 64, as_record: bool = False):
+        """
+        批量读取多个变量的值
+
+        每个变量的地址和大小只查询一次 (之后使用缓存), 相邻的变量合并成连续的内存区域
+        (单个区域不超过内存包的区域上限), 所有区域通过尽可能少的内存包传输读取, 最后在本地解码。
+
+        :param symbols: 变量名序列
+        :param byteorder: 目标字节序 little | big
+        :param max_gap: 两个变量之间的间隔不超过该字节数时合并为一次读取
+        :param as_record: 返回 numpy 记录 (需要安装 numpy), 每个变量为一个字段
+        :return: {变量名: 值}, 不超过 8 字节的变量为无符号整数, 更大的变量 (数组, 结构体) 为 bytes
+        """
+        symbols = list(symbols)
+        layout = {symbol: T32._resolve_variable(symbol) for symbol in symbols}
+
+        regions = []
+        for symbol, (address, size) in sorted(layout.items(), key=lambda item: item[1][0]):
+            if (regions and regions[-1][0] <= address <= regions[-1][1] + max_gap
+                    and max(regions[-1][1], address + size) - regions[-1][0] <= _BUNDLE_REGION_LIMIT):
+                regions[-1][1] = max(regions[-1][1], address + size)
+            else:
+                regions.append([address, address + size])
+
+        memory = {}
+        for (start, end), entry in zip(regions, T32.read_memory_bundle([(s, e - s) for s, e in regions])):
+            if not entry.ok:
+                raise T32TransferMemoryBundleObjTransferFailedError(f"读取 {start:#x}-{end:#x} 失败")
+            memory[start] = entry.data
+
+        values, starts = {}, [start for start, _ in regions]
+        for symbol in symbols:
+            address, size = layout[symbol]
+            start = starts[bisect.bisect_right(starts, address) - 1]
+            data = memory[start][address - start:address - start + size]
+            values[symbol] = int.from_bytes(data, byteorder) if size <= 8 else data
+
+        if not as_record:
+            return values
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("as_record=True 需要安装 numpy") from e
+        order = "<" if byteorder == "little" else ">"
+        dtype = np.dtype([
+            (symbol, f"{order}u{layout[symbol][1]}" if layout[symbol][1] in (1, 2, 4, 8) else f"V{layout[symbol][1]}")
+            for symbol in symbols
+        ])
+        return np.rec.array(
+            [tuple(v if isinstance(v, bytes) or layout[k][1] in (1, 2, 4, 8) else v.to_bytes(layout[k][1], byteorder)
+                   for k, v in values.items())],
+            dtype=dtype,
+        )[0]
+
+    @staticmethod
+    def write_variables(values: dict, byteorder: str = "little") -> None:
+        """
+        批量写入多个变量的值
+
+        每个变量的地址和大小只查询一次 (之后使用缓存), 地址连续的变量合并成一个内存区域
+        (单个区域不超过内存包的区域上限), 所有区域通过尽可能少的内存包传输写入。
+
+        :param values: {变量名: 值}, 值为整数 (按变量大小截断) 或 bytes-like 对象
+        :param byteorder: 目标字节序 little | big
+        """
+        blocks = []
+        for symbol, value in values.items():
+            address, size = T32._resolve_variable(symbol)
+            if isinstance(value, int):
+                data = (value & ((1 << size * 8) - 1)).to_bytes(size, byteorder)
+            else:
+                data = bytes(value)
+                if len(data) > size:
+                    raise ValueError(f"变量 {symbol} 的大小为 {size} 字节, 写入数据为 {len(data)} 字节")
+            blocks.append((address, data))
+
+        merged = []
+        for address, data in sorted(blocks, key=lambda block: block[0]):
+            if (merged and merged[-1][0] + len(merged[-1][1]) == address
+                    and len(merged[-1][1]) + len(data) <= _BUNDLE_REGION_LIMIT):
+                merged[-1][1] += data
+            else:
+                merged.append([address, bytearray(data)])
+
+        for entry in T32.write_memory_bundle(merged):
+            if not entry.ok:
+                raise T32TransferMemoryBundleObjTransferFailedError(f"写入 {entry.address:#x} 失败")
+
     # --------------------------------------------------------------------------
     # note 高速调试（FDX）相关函数
     # --------------------------------------------------------------------------
+    @staticmethod
+    def fdx_resolve(name: str) -> int:
+        """
+        获取目标程序中 FDX 缓冲区的地址
+
+        :param name: FDX 缓冲区的符号名
+        :return: 缓冲区地址
+        """
+        address = __t32__.T32_Fdx_Resolve(name.encode("GBK"))
+        if address == -1:
+            raise T32FdxBufferError(f"FDX 缓冲区 {name} 不存在")
+        return address
+
+    @staticmethod
+    def fdx_open(name: str, mode: str = "r") -> int:
+        """
+        打开 FDX 通道
+
+        :param name: FDX 缓冲区的符号名, 如 "FdxTestSendBuffer"
+        :param mode: r 接收 (目标 -> 主机) | w 发送 (主机 -> 目标)
+        :return: 通道号
+        """
+        channel = __t32__.T32_Fdx_Open(name.encode("GBK"), mode.encode("GBK"))
+        if channel == -1:
+            raise T32FdxBufferError(f"打开 FDX 缓冲区 {name} 失败")
+        return channel
+
+    @staticmethod
+    def fdx_close(channel: int) -> None:
+        """
+        关闭 FDX 通道
+
+        :param channel: 通道号
+        """
+        if __t32__.T32_Fdx_Close(c_int(channel)) == -1:
+            raise T32FdxBufferError(f"关闭 FDX 通道 {channel} 失败")
+
+    @staticmethod
+    def fdx_receive(channel: int, buf, width: int = 1, wait: bool = True) -> int:
+        """
+        从 FDX 通道接收一个数据包到 buf 中
+
+        :param channel: 通道号
+        :param buf: 可写且连续的 buffer 协议对象, 单次最多接收 LINE_SBLOCK (4096) 字节
+        :param width: 元素宽度 (字节)
+        :param wait: True 时等待直到收到数据; False 时没有数据立即返回 0
+        :return: 接收的字节数
+        """
+        view = memoryview(buf).cast("B")
+        if view.readonly:
+            raise TypeError("缓冲区必须可写")
+        count = min(view.nbytes, LINE_SBLOCK) // width
+        if count <= 0:
+            raise ValueError(f"缓冲区至少需要 {width} 字节")
+        func = __t32__.T32_Fdx_Receive if wait else __t32__.T32_Fdx_ReceivePoll
+        received = func(c_int(channel), (c_ubyte * (count * width)).from_buffer(view), c_int(width), c_int(count))
+        if received == -1:
+            raise T32FdxBufferError(f"FDX 通道 {channel} 接收失败")
+        return received * width if width > 1 else received
+
+    @staticmethod
+    def fdx_send(channel: int, data, width: int = 1, wait: bool = True) -> int:
+        """
+        向 FDX 通道发送数据, 超过 LINE_SBLOCK (4096) 字节时分多个数据包发送
+
+        :param channel: 通道号
+        :param data: bytes 或其他连续的 buffer 协议对象, 长度须为 width 的整数倍
+        :param width: 元素宽度 (字节)
+        :param wait: True 时目标缓冲区满则等待; False 时目标缓冲区满则立即返回
+        :return: 已发送的字节数
+        """
+        view = memoryview(data).cast("B")
+        if view.nbytes % width:
+            raise ValueError(f"数据长度 {view.nbytes} 不是元素宽度 {width} 的整数倍")
+        func = __t32__.T32_Fdx_Send if wait else __t32__.T32_Fdx_SendPoll
+        step = LINE_SBLOCK // width * width
+        sent = 0
+        while sent < view.nbytes:
+            chunk = view[sent:sent + step]
+            count = len(chunk) // width
+            result = func(c_int(channel), (c_ubyte * len(chunk)).from_buffer_copy(chunk), c_int(width), c_int(count))
+            if result == -1:
+                raise T32FdxBufferError(f"FDX 通道 {channel} 发送失败")
+            if result == 0:
+                break
+            sent += len(chunk)
+        return sent
+
 
     # --------------------------------------------------------------------------
     # note 直接和测试（JTAG）访问端口相关函数
     # --------------------------------------------------------------------------
-    param_from_uint32 = __t32__.T32_ParamFromUint32
-    bundled_access_alloc = __t32__.T32_BundledAccessAlloc
-    bundled_access_execute = __t32__.T32_BundledAccessExecute
-    bundled_access_free = __t32__.T32_BundledAccessFree
-    direct_access_release = __t32__.T32_DirectAccessRelease
-    direct_access_reset_all = __t32__.T32_DirectAccessResetAll
-    direct_access_set_info = __t32__.T32_DirectAccessSetInfo
-    direct_access_get_info = __t32__.T32_DirectAccessGetInfo
-    direct_access_get_timestamp = __t32__.T32_DirectAccessGetTimestamp
-    direct_access_user_signal = __t32__.T32_DirectAccessUserSignal
-    tap_access_set_info = __t32__.T32_TAPAccessSetInfo
-    tap_access_set_info2 = __t32__.T32_TAPAccessSetInfo2
-    tap_access_shift_raw = __t32__.T32_TAPAccessShiftRaw
-    tap_access_shift_ir = __t32__.T32_TAPAccessShiftIR
-    tap_access_shift_dr = __t32__.T32_TAPAccessShiftDR
-    tap_access_jtag_reset_with_tms = __t32__.T32_TAPAccessJTAGResetWithTMS
-    tap_access_jtag_reset_with_trst = __t32__.T32_TAPAccessJTAGResetWithTRST
-    tap_access_set_shift_pattern = __t32__.T32_TAPAccessSetShiftPattern
-    tap_access_direct = __t32__.T32_TAPAccessDirect
-    dap_access_scan = __t32__.T32_DAPAccessScan
-    dap_access_init_swd = __t32__.T32_DAPAccessInitSWD
-    dap_ap_access_read_write = __t32__.T32_DAPAPAccessReadWrite
-    i2c_access = __t32__.T32_I2CAccess
-    direct_access_execute_lua = __t32__.T32_DirectAccessExecuteLua
+    param_from_uint32 = _forward("T32_ParamFromUint32")
+    bundled_access_alloc = _forward("T32_BundledAccessAlloc")
+    bundled_access_execute = _forward("T32_BundledAccessExecute")
+    bundled_access_free = _forward("T32_BundledAccessFree")
+    direct_access_release = _forward("T32_DirectAccessRelease")
+    direct_access_reset_all = _forward("T32_DirectAccessResetAll")
+    direct_access_set_info = _forward("T32_DirectAccessSetInfo")
+    direct_access_get_info = _forward("T32_DirectAccessGetInfo")
+    direct_access_get_timestamp = _forward("T32_DirectAccessGetTimestamp")
+    direct_access_user_signal = _forward("T32_DirectAccessUserSignal")
+    tap_access_set_info = _forward("T32_TAPAccessSetInfo")
+    tap_access_set_info2 = _forward("T32_TAPAccessSetInfo2")
+    tap_access_shift_raw = _forward("T32_TAPAccessShiftRaw")
+    tap_access_shift_ir = _forward("T32_TAPAccessShiftIR")
+    tap_access_shift_dr = _forward("T32_TAPAccessShiftDR")
+    tap_access_jtag_reset_with_tms = _forward("T32_TAPAccessJTAGResetWithTMS")
+    tap_access_jtag_reset_with_trst = _forward("T32_TAPAccessJTAGResetWithTRST")
+    tap_access_set_shift_pattern = _forward("T32_TAPAccessSetShiftPattern")
+    tap_access_direct = _forward("T32_TAPAccessDirect")
+    dap_access_scan = _forward("T32_DAPAccessScan")
+    dap_access_init_swd = _forward("T32_DAPAccessInitSWD")
+    dap_ap_access_read_write = _forward("T32_DAPAPAccessReadWrite")
+    i2c_access = _forward("T32_I2CAccess")
+    direct_access_execute_lua = _forward("T32_DirectAccessExecuteLua")
 
     # --------------------------------------------------------------------------
     # note lua 脚本相关函数
     # --------------------------------------------------------------------------
-    Execute_lua = __t32__.T32_ExecuteLua
+    Execute_lua = _forward("T32_ExecuteLua")
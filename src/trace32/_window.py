@@ -0,0 +1,66 @@
+"""
+@文件: _window.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 窗口内容的增量解析, 把分块到达的文本逐行 / 逐记录地解析出来
+@许可: MIT License
+@版本: Version 1.0
+"""
+import csv
+from typing import Iterable, Iterator
+from xml.etree.ElementTree import Element, XMLPullParser
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    把分块的文本按 \n 切分成行, 行可以跨越分块边界
+
+    :param chunks: 文本分块
+    :return: 含行尾换行符的行的迭代器
+    """
+    pending = ""
+    for chunk in chunks:
+        # 只按 \n 切分: str.splitlines 还会在 \x0c, \x1c, \u2028 等字符处断行, 而它们可能出现在窗口内容中
+        *lines, pending = (pending + chunk).split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def iter_csv(chunks: Iterable[str]) -> Iterator[list[str]]:
+    """
+    增量解析 CSV 格式的窗口内容
+
+    :param chunks: 文本分块
+    :return: 每行字段列表的迭代器, 空行被忽略
+    """
+    for row in csv.reader(iter_lines(chunks)):
+        if row:
+            yield row
+
+
+def iter_xml(chunks: Iterable[str]) -> Iterator[Element]:
+    """
+    增量解析 XML 格式的窗口内容
+
+    根元素的每个子元素作为一条记录, 在其结束标签到达后返回并随即从树中移除, 内存占用与窗口大小无关
+
+    :param chunks: 文本分块
+    :return: 记录元素的迭代器
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    root, depth = None, 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = element
+            else:
+                depth -= 1
+                if depth == 1:
+                    yield element
+                    root.remove(element)
+    parser.close()
@@ -468,15 +468,27 @@ class T32QueryAddressObjMmuTranslationFailedError(T32MmuTranslationError):
     message = "MMU 地址转换失败"
 
 
+# ----------------------------------------------------------------------------
+# Window 相关错误
+# ----------------------------------------------------------------------------
+
+class T32WindowContentError(T32FunctionError):
+    """T32_GetWindowContent: 获取窗口内容失败 (命令错误, 窗口无法打开或通信失败时该函数都只返回 -1)"""
+    message = "获取窗口内容失败"
+
+
 # ============================================================================
 # note 错误码映射字典
 # ============================================================================
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
 @lru_cache(maxsize=16)
 def error_mapping(error_code: int):
-    for cls in T32Error.__subclasses__():
-        for subclass in cls.__subclasses__():
-            if getattr(subclass, "code", None) == error_code:
-                return subclass
+    for cls in _subclasses(T32Error):
         if getattr(cls, "code", None) == error_code:
             return cls
     return None
@@ -0,0 +1,28 @@
+"""
+@文件: conftest.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 测试公共夹具, 以本地 PowerView 模拟服务器作为调试器
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import PowerViewSimulator, T32
+
+
+@pytest.fixture
+def sim():
+    """启动模拟服务器并通过纯 python 后端连接, 结束时断开并复位全局缓存"""
+    T32.set_backend("python")
+    with PowerViewSimulator() as simulator:
+        T32.config("NODE", simulator.host)
+        T32.config("PORT", str(simulator.port))
+        T32.init()
+        try:
+            yield simulator
+        finally:
+            T32.exit()
+            T32.memory_cache().enabled = False
+            T32.memory_cache().invalidate()
+            T32.invalidate_symbols()
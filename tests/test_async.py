@@ -0,0 +1,73 @@
+"""
+@文件: test_async.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: asyncio 客户端的超时, 取消与异步迭代
+@许可: MIT License
+@版本: Version 1.0
+"""
+import asyncio
+import threading
+
+import pytest
+
+from trace32 import AsyncT32
+
+
+def test_async_calls_run_in_order(sim):
+    sim.memory.write(0x1000, b"\x11\x22\x33\x44")
+
+    async def main():
+        async with AsyncT32(timeout=5.0) as t32:
+            return await asyncio.gather(t32.read_memory(0x1000, 0, 2), t32.ping(), t32.read_memory(0x1002, 0, 2))
+
+    first, _, second = asyncio.run(main())
+    assert (first, second) == (b"\x11\x22", b"\x33\x44")
+
+
+def test_async_call_timeout_and_queued_call_cancelled(sim):
+    release = threading.Event()
+    calls = []
+
+    async def main():
+        async with AsyncT32() as t32:
+            with pytest.raises(asyncio.TimeoutError):
+                await t32.call(release.wait, 5.0, timeout=0.05)
+            # 排在阻塞调用之后的调用超时后从队列中移除, 不再执行
+            with pytest.raises(asyncio.TimeoutError):
+                await t32.call(calls.append, "queued", timeout=0.05)
+            release.set()
+            await t32.call(calls.append, "after", timeout=5.0)
+
+    asyncio.run(main())
+    assert calls == ["after"]
+
+
+def test_async_call_cancelled_by_task(sim):
+    release = threading.Event()
+
+    async def main():
+        async with AsyncT32() as t32:
+            task = asyncio.create_task(t32.call(release.wait, 5.0))
+            await asyncio.sleep(0.02)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+            return await t32.ping(timeout=5.0)
+
+    asyncio.run(main())
+
+
+def test_async_window_iterator_closed_after_shutdown(sim):
+    sim.add_window("Register.view", "R0 0\n" * 100)
+
+    async def main():
+        t32 = AsyncT32(timeout=5.0)
+        rows = t32.iter_window_rows("Register.view", "asc", 64)
+        first = await rows.__anext__()
+        t32.close()
+        await rows.aclose()
+        return first
+
+    assert asyncio.run(main()) == "R0 0"
@@ -0,0 +1,32 @@
+"""
+@文件: test_benchmark.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: t32-bench 基准测试
+@许可: MIT License
+@版本: Version 1.0
+"""
+import json
+
+from trace32 import T32
+from trace32._benchmark import main
+
+
+def test_bench_against_simulator(tmp_path):
+    output = tmp_path / "bench.json"
+    assert main(["--simulator", "--backend", "python", "-n", "3", "--warmup", "1", "-o", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["meta"]["target"] == "simulator"
+    assert report["meta"]["backend"] == "python"
+
+    results = report["results"]
+    assert {"nop", "nop_ex", "read_memory", "read_memory_into", "write_memory", "cmd"} <= {r["name"] for r in results}
+    assert not [r for r in results if "error" in r]
+    for result in results:
+        assert result["iterations"] == 3
+        assert result["min_us"] <= result["median_us"] <= result["max_us"]
+        assert "overhead_us" in result and result["wire_us"] >= 0
+        if result["bytes"]:
+            assert result["bytes_per_sec"] > 0
+    # 测量封装开销时临时替换的后端已经恢复
+    assert T32.get_backend() == "python"
@@ -0,0 +1,55 @@
+"""
+@文件: test_breakpoints.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 断点对象接口与断点表镜像
+@许可: MIT License
+@版本: Version 1.0
+"""
+from trace32 import BreakpointType, T32
+
+
+def test_set_list_clear(sim):
+    sim.add_symbol("main", 0x400, 4)
+    T32.set_breakpoints([0x100, "main"])
+    assert set(sim.breakpoints) == {0x100, 0x400}
+    assert [breakpoint.address for breakpoint in T32.list_breakpoints()] == [0x100, 0x400]
+
+    assert T32.clear_breakpoints(0x100) == 1
+    assert set(sim.breakpoints) == {0x400}
+    assert T32.clear_breakpoints() == 1
+    assert not sim.breakpoints
+
+
+def test_listing_uses_mirror(sim):
+    T32.list_breakpoints()
+    T32.set_breakpoints([0x200, 0x204])
+    cache = T32.breakpoint_cache()
+    misses, requests = cache.misses, sim.stats["requests"]
+    assert len(T32.list_breakpoints()) == 2
+    assert cache.misses == misses and sim.stats["requests"] == requests
+
+    T32.cmd("Break.Delete")
+    assert not cache.valid
+
+
+def test_types_merge_per_address(sim):
+    T32.list_breakpoints()
+    T32.set_breakpoints(0x300, BreakpointType.PROGRAM)
+    T32.set_breakpoints(0x300, BreakpointType.WRITE)
+    expected = BreakpointType.PROGRAM | BreakpointType.WRITE
+    assert [breakpoint.type for breakpoint in T32.list_breakpoints()] == [expected]
+    assert [breakpoint.type for breakpoint in T32.list_breakpoints(refresh=True)] == [expected]
+
+    T32.clear_breakpoints(0x300)
+    assert not sim.breakpoints
+    assert T32.list_breakpoints() == []
+
+
+def test_breakpoint_list_not_truncated_by_limit(sim):
+    T32.set_breakpoints([0x500 + 4 * i for i in range(5)])
+    requests = sim.stats["requests"]
+    breakpoints = T32.get_breakpoint_list(limit=2)
+    assert [breakpoint.address for breakpoint in breakpoints] == [0x500 + 4 * i for i in range(5)]
+    assert sim.stats["requests"] - requests == 2
+    assert len(T32.get_breakpoint_list()) == 5
@@ -0,0 +1,36 @@
+"""
+@文件: test_broker.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 请求代理的读请求合并
+@许可: MIT License
+@版本: Version 1.0
+"""
+from trace32 import RequestBroker, T32
+
+
+def test_overlapping_reads_are_coalesced(sim):
+    sim.memory.write(0x1000, bytes(range(64)))
+    with RequestBroker(window=0.05) as broker:
+        futures = [broker.submit_read_memory(0x1000 + 8 * i, 0, 16) for i in range(4)]
+        assert [future.result(5) for future in futures] == [bytes(range(8 * i, 8 * i + 16)) for i in range(4)]
+        assert broker.stats.transfers < broker.stats.requests
+
+
+def test_inaccessible_neighbour_fails_only_its_reader(sim):
+    sim.add_inaccessible(0x2010, 0x10)
+    with RequestBroker(window=0.05) as broker:
+        good = broker.submit_read_memory(0x2000, 0, 16)
+        bad = broker.submit_read_memory(0x2008, 0, 16)
+        other = broker.submit_read_memory(0x3000, 0, 4)
+        assert good.result(5) == bytes(16)
+        assert other.result(5) == bytes(4)
+        assert isinstance(bad.exception(5), Exception)
+
+
+def test_calls_keep_submission_order(sim):
+    with RequestBroker() as broker:
+        broker.submit(T32.write_memory, 0x4000, 0, b"\x01")
+        assert broker.read_memory(0x4000, 0, 1, timeout=5) == b"\x01"
+        sim.add_symbol("v", 0x4000, 1)
+        assert broker.read_variable_value("v", timeout=5) == 1
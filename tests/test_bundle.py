@@ -0,0 +1,38 @@
+"""
+@文件: test_bundle.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 内存包 (scatter-gather) 读写
+@许可: MIT License
+@版本: Version 1.0
+"""
+from trace32 import BufferSyncStatus, T32
+
+
+def test_read_write_bundle(sim):
+    sim.memory.write(0x1000, b"\x11" * 16)
+    sim.memory.write(0x8000, b"\x22" * 8)
+    entries = T32.read_memory_bundle([(0x1000, 16), (0x8000, 8)])
+    assert [entry.data for entry in entries] == [b"\x11" * 16, b"\x22" * 8]
+
+    entries = T32.write_memory_bundle([(0x2000, b"abc"), (0x3000, b"defg")])
+    assert all(entry.status == BufferSyncStatus.WRITTEN for entry in entries)
+    assert sim.memory.read(0x2000, 3) == b"abc"
+    assert sim.memory.read(0x3000, 4) == b"defg"
+
+
+def test_bundle_split_and_inaccessible(sim):
+    sim.add_inaccessible(0x5000, 0x10)
+    addresses = [0x10000 + 0x1000 * i for i in range(8)] + [0x5000]
+    entries = T32.read_memory_bundle(addresses, length=4000)
+    assert [entry.ok for entry in entries] == [True] * 8 + [False]
+    assert entries[-1].data is None
+
+
+def test_many_regions_in_one_transfer(sim):
+    sim.memory.write(0x6000, bytes(range(64)))
+    requests = sim.stats["requests"]
+    entries = T32.read_memory_bundle(range(0x6000, 0x6040, 8), length=4)
+    assert [entry.data for entry in entries] == [bytes(range(i, i + 4)) for i in range(0, 64, 8)]
+    # 申请对象, 加入区域等都是本地操作, 只有传输本身与调试器通信
+    assert sim.stats["requests"] - requests == 1
@@ -0,0 +1,61 @@
+"""
+@文件: test_cache.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 寄存器缓存与内存缓存
+@许可: MIT License
+@版本: Version 1.0
+"""
+from trace32 import T32
+
+
+def test_register_cache_hits_while_halted(sim):
+    sim.registers["R0"] = 7
+    assert T32.read_register_by_name("R0") == 7
+    requests = sim.stats["requests"]
+    assert T32.read_register_by_name("R0") == 7
+    assert sim.stats["requests"] == requests
+
+    T32.go()
+    T32.break_target()
+    sim.registers["R0"] = 8
+    assert T32.read_register_by_name("R0") == 8
+
+
+def test_register_cache_keys_width(sim):
+    T32.write_register_by_name("R1", 0x1234567890)
+    assert T32.read_registers(["R1"], 32)["R1"] == 0x34567890
+    assert T32.read_registers(["R1"], 64)["R1"] == 0x1234567890
+    assert T32.read_register_by_name("R1") == 0x1234567890
+
+
+def test_memory_cache(sim):
+    sim.memory.write(0x4000, bytes(range(256)))
+    cache = T32.enable_memory_cache(page_size=0x100)
+    assert T32.read_memory(0x4010, 0, 4) == bytes(range(16, 20))
+    requests = sim.stats["requests"]
+    assert T32.read_memory(0x4020, 0, 4) == bytes(range(32, 36))
+    assert sim.stats["requests"] == requests
+    assert cache.hits >= 1
+
+    T32.write_memory(0x4020, 0, b"\xff\xff")
+    assert T32.read_memory(0x4020, 0, 2) == b"\xff\xff"
+    assert sim.memory.read(0x4020, 2) == b"\xff\xff"
+
+
+def test_memory_cache_dropped_after_command(sim):
+    T32.enable_memory_cache(page_size=0x100)
+    assert T32.read_memory(0x6000, 0, 1) == b"\0"
+    sim.memory.write(0x6000, b"\x01")
+    T32.cmd("Data.Set 0x6000 0x01")
+    assert T32.read_memory(0x6000, 0, 1) == b"\x01"
+
+
+def test_memory_cache_not_stale_after_reenable(sim):
+    cache = T32.enable_memory_cache(page_size=0x100)
+    assert T32.read_memory(0x5000, 0, 1) == b"\0"
+    cache.enabled = False
+    T32.write_memory(0x5000, 0, b"\x05")
+    sim.memory.write(0x5001, b"\x06")
+    cache.enabled = True
+    assert T32.read_memory(0x5000, 0, 2) == b"\x05\x06"
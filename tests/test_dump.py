@@ -0,0 +1,62 @@
+"""
+@文件: test_dump.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 大块内存转储的断点续传与转储文件比较
+@许可: MIT License
+@版本: Version 1.0
+"""
+import os
+
+import pytest
+
+from trace32 import T32
+from trace32.errors import T32BusError
+
+_SIZE = 0x8000
+_DATA = bytes(i * 7 & 0xFF for i in range(_SIZE))
+
+
+def test_dump_memory_resumes_after_failure(sim, tmp_path):
+    sim.memory.write(0x10000, _DATA)
+    path = str(tmp_path / "dump.bin")
+    sim.add_inaccessible(0x16000, 0x10)
+    with pytest.raises(T32BusError):
+        T32.dump_memory(0x10000, _SIZE, path, chunk_size=0x2000, retries=0)
+    assert os.path.exists(path + ".progress")
+
+    sim.inaccessible.clear()
+    calls = []
+    stats = T32.dump_memory(0x10000, _SIZE, path, chunk_size=0x2000, progress=lambda done, total: calls.append(done))
+    # 前三块已完成, 只需读取最后一块
+    assert (stats.size, stats.chunks) == (0x2000, 1)
+    assert calls == [_SIZE]
+    assert not os.path.exists(path + ".progress")
+    with open(path, "rb") as f:
+        assert f.read() == _DATA
+
+
+def test_dump_memory_restarts_without_resume(sim, tmp_path):
+    sim.memory.write(0x10000, _DATA)
+    path = str(tmp_path / "dump.bin")
+    sim.add_inaccessible(0x16000, 0x10)
+    with pytest.raises(T32BusError):
+        T32.dump_memory(0x10000, _SIZE, path, chunk_size=0x2000, retries=0)
+    sim.inaccessible.clear()
+    stats = T32.dump_memory(0x10000, _SIZE, path, chunk_size=0x2000, resume=False)
+    assert stats.size == _SIZE
+
+
+def test_diff_dump(sim, tmp_path):
+    pytest.importorskip("numpy")
+    first, second = tmp_path / "first.bin", tmp_path / "second.bin"
+    changed = bytearray(_DATA)
+    changed[0x10] ^= 1
+    changed[0x12] ^= 1
+    changed[0x4000:0x4004] = b"\xff" * 4
+    first.write_bytes(_DATA)
+    second.write_bytes(bytes(changed) + b"tail")
+    assert T32.diff_dump(str(first), str(second), 0x10000, chunk_size=0x1000) == [
+        (0x10010, 1), (0x10012, 1), (0x14000, 4), (0x10000 + _SIZE, 4),
+    ]
+    assert T32.diff_dump(str(first), str(second), 0x10000, merge_gap=1)[:2] == [(0x10010, 3), (0x14000, 4)]
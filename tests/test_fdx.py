@@ -0,0 +1,59 @@
+"""
+@文件: test_fdx.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: FDX 通道的后台接收与环形缓冲区
+@许可: MIT License
+@版本: Version 1.0
+"""
+import time
+
+from trace32 import FdxChannel
+from trace32._remote import LINE_SBLOCK
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def test_fdx_channel_reads_packets_in_order(sim):
+    target = sim.fdx_channel("fdx_out")
+    target.to_host.extend([b"abc", b"def", b"ghi"])
+    with FdxChannel("fdx_out", capacity=LINE_SBLOCK) as channel:
+        data = b""
+        while len(data) < 9:
+            data += channel.read(timeout=2.0)
+    assert data == b"abcdefghi"
+    assert channel.stats.packets == 3 and channel.stats.received == 9
+    assert not target.opened
+
+
+def test_fdx_block_mode_fills_the_whole_ring(sim):
+    target = sim.fdx_channel("fdx_out")
+    target.to_host.extend(bytes([i]) * 100 for i in range(100))
+    with FdxChannel("fdx_out", capacity=2 * LINE_SBLOCK, overflow="block") as channel:
+        # 81 个数据包 (8100 字节) 写入环形缓冲区, 第 82 个已取出并等待读取方腾出空间
+        assert _wait_until(lambda: channel.stats.stalls == 1)
+        assert len(channel) == 8100
+        assert channel.read(150) == bytes([0]) * 100 + bytes([1]) * 50
+        data = b""
+        while len(data) < 100 * 100 - 150:
+            data += channel.read(timeout=2.0)
+        assert data == bytes([1]) * 50 + b"".join(bytes([i]) * 100 for i in range(2, 100))
+        assert channel.stats.dropped == 0
+        assert channel.stats.high_water >= 8100
+
+
+def test_fdx_drop_mode_counts_dropped_packets(sim):
+    target = sim.fdx_channel("fdx_out")
+    target.to_host.extend(bytes([i]) * LINE_SBLOCK for i in range(3))
+    with FdxChannel("fdx_out", capacity=LINE_SBLOCK, overflow="drop") as channel:
+        assert _wait_until(lambda: channel.stats.packets == 3)
+        assert channel.read() == bytes([0]) * LINE_SBLOCK
+        assert channel.stats.dropped == 2 * LINE_SBLOCK
+        assert channel.stats.stalls == 0
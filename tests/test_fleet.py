@@ -0,0 +1,50 @@
+"""
+@文件: test_fleet.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 多目标并行执行
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import Fleet, PowerViewSimulator, T32
+
+
+class _UnpicklableError(Exception):
+    """构造参数与 args 不一致, pickle 之后无法还原"""
+
+    def __init__(self, code, detail):
+        super().__init__(code)
+
+
+def _read_first_byte(endpoint):
+    return T32.read_memory(0x100, 0, 1)
+
+
+def _raise_unpicklable(endpoint):
+    raise _UnpicklableError(1, "detail")
+
+
+@pytest.fixture
+def fleet():
+    with PowerViewSimulator() as first, PowerViewSimulator() as second:
+        first.memory.write(0x100, b"\x01")
+        second.memory.write(0x100, b"\x02")
+        yield Fleet([(first.host, first.port), (second.host, second.port)], backend="python")
+
+
+def test_run_on_all_targets(fleet):
+    results = fleet.run(_read_first_byte, timeout=30)
+    assert [result.value for result in results] == [b"\x01", b"\x02"]
+
+
+def test_unpicklable_error_is_reported_per_target(fleet):
+    results = fleet.run(_raise_unpicklable, timeout=30)
+    assert all(not result.ok and isinstance(result.error, RuntimeError) for result in results)
+    assert "_UnpicklableError" in str(results[0].error)
+
+
+def test_duplicate_endpoints_rejected():
+    with pytest.raises(ValueError, match="127.0.0.1:20000"):
+        Fleet([("127.0.0.1", 20000), ("127.0.0.1", "20000"), ("127.0.0.1", 20001)])
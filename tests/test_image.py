@@ -0,0 +1,59 @@
+"""
+@文件: test_image.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 镜像解析, 下载与校验
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import Image, T32
+from trace32.errors import T32VerifyError
+
+
+def _ihex(address: int, data: bytes) -> str:
+    record = bytes((len(data),)) + address.to_bytes(2, "big") + b"\0" + data
+    return ":" + (record + bytes(((-sum(record)) & 0xFF,))).hex().upper()
+
+
+def test_segments_are_merged():
+    image = Image([(0x10, b"cd"), (0x0, b"ab"), (0x2, b"xy"), (0x12, b"ef")])
+    assert [(region.address, region.data) for region in image] == [(0x0, b"abxy"), (0x10, b"cdef")]
+    with pytest.raises(ValueError):
+        Image([(0x0, b"ab"), (0x1, b"z")])
+
+
+def test_open_intel_hex(tmp_path):
+    path = tmp_path / "app.hex"
+    path.write_text("\n".join([_ihex(0x100, b"\x01\x02"), _ihex(0x102, b"\x03"), ":00000001FF"]))
+    image = Image.open(str(path))
+    assert [(region.address, region.data) for region in image] == [(0x100, b"\x01\x02\x03")]
+
+
+def test_download_and_verify(sim):
+    image = Image([(0x8000, bytes(range(200))), (0x9000, b"tail")])
+    progress = []
+    stats = image.download(progress=lambda done, total: progress.append((done, total)))
+    assert stats.size == image.size
+    assert progress[-1] == (image.size, image.size)
+    assert sim.memory.read(0x8000, 200) == bytes(range(200))
+
+    sim.memory.write(0x9000, b"T")
+    with pytest.raises(T32VerifyError):
+        image.verify()
+
+
+def test_verify_keeps_caches(sim):
+    image = Image([(0x8000, b"abcd"), (0x9000, b"efgh")])
+    image.download()
+    cache = T32.enable_memory_cache(page_size=0x100)
+    assert T32.read_memory(0x8000, 0, 4) == b"abcd"
+    epoch = T32.register_cache().halt_epoch()
+    image.verify("D")
+    assert sim.commands[-1] == "Eval Data.SUM()"
+    assert T32.register_cache().halt_epoch() == epoch
+    requests = sim.stats["requests"]
+    assert T32.read_memory(0x8000, 0, 4) == b"abcd"
+    assert sim.stats["requests"] == requests
+    assert len(cache) == 1
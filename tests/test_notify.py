@@ -0,0 +1,61 @@
+"""
+@文件: test_notify.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 通知分发器的回调注册与分发
+@许可: MIT License
+@版本: Version 1.0
+"""
+import threading
+import time
+
+from trace32 import NotificationDispatcher
+
+
+def _poll_until(dispatcher: NotificationDispatcher, predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        dispatcher.poll(0.05)
+    return True
+
+
+def test_break_notification_dispatched_by_poll(sim):
+    dispatcher = NotificationDispatcher()
+    breaks = []
+    dispatcher.on_break(lambda pc, reason: breaks.append((pc, reason)))
+    sim.trigger_break(0x1234, 1)
+    assert _poll_until(dispatcher, lambda: breaks)
+    assert breaks == [(0x1234, 1)]
+
+
+def test_failing_callback_does_not_stop_dispatch(sim, monkeypatch):
+    monkeypatch.setattr("sys.__excepthook__", lambda *args: None)
+    dispatcher = NotificationDispatcher()
+    calls = []
+
+    @dispatcher.on_break
+    def failing(pc, reason):
+        calls.append("failing")
+        raise RuntimeError("callback failed")
+
+    second = dispatcher.on_break(lambda pc, reason: calls.append("second"))
+    sim.trigger_break(0x1000)
+    assert _poll_until(dispatcher, lambda: len(calls) == 2)
+    assert calls == ["failing", "second"]
+
+    # 注销全部回调后停用该通知, 服务器不再发送
+    dispatcher.remove(failing)
+    dispatcher.remove(second)
+    sim.trigger_break(0x2000)
+    assert not _poll_until(dispatcher, lambda: len(calls) > 2, timeout=0.2)
+
+
+def test_event_notification_dispatched_by_listener_thread(sim):
+    fired = threading.Event()
+    with NotificationDispatcher(interval=0.01) as dispatcher:
+        dispatcher.on_event("done", fired.set)
+        sim.trigger_event("other")
+        sim.trigger_event("done")
+        assert fired.wait(2.0)
@@ -0,0 +1,41 @@
+"""
+@文件: test_read_memory_into.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 零拷贝读取到调用者的缓冲区
+@许可: MIT License
+@版本: Version 1.0
+"""
+from array import array
+
+import pytest
+
+from trace32 import T32
+
+
+def test_read_into_slices(sim):
+    sim.memory.write(0x1000, bytes(range(256)) * 64)
+    dump = bytearray(0x4000)
+    view = memoryview(dump)
+    for offset in range(0, len(dump), 0x1000):
+        assert T32.read_memory_into(0x1000 + offset, 0, view[offset:offset + 0x1000]) == 0x1000
+    assert dump == bytes(range(256)) * 64
+
+
+def test_read_into_partial_and_typed_buffers(sim):
+    sim.memory.write(0x2000, bytes(range(16)))
+    buffer = bytearray(b"\xff" * 8)
+    assert T32.read_memory_into(0x2000, 0, buffer, 4) == 4
+    assert buffer == bytes(range(4)) + b"\xff" * 4
+
+    words = array("I", [0] * 4)
+    T32.read_memory_into(0x2000, 0, words)
+    assert words.tobytes() == bytes(range(16))
+
+
+def test_read_into_rejects_bad_buffers(sim):
+    with pytest.raises(TypeError):
+        T32.read_memory_into(0x2000, 0, b"read-only")
+    with pytest.raises(ValueError):
+        T32.read_memory_into(0x2000, 0, bytearray(4), 8)
+    assert T32.read_memory_into(0x2000, 0, bytearray(4), 0) == 0
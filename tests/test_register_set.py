@@ -0,0 +1,69 @@
+"""
+@文件: test_register_set.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 寄存器集合, 分别使用纯 python 后端和由 capi/src 编译的 t32api 动态库
+@许可: MIT License
+@版本: Version 1.0
+"""
+import shutil
+import subprocess
+from ctypes import CDLL
+from pathlib import Path
+
+import pytest
+
+from trace32 import PowerViewSimulator, RegisterSet, T32
+
+_CAPI = Path(__file__).resolve().parent.parent / "capi" / "src"
+
+
+@pytest.fixture(scope="session")
+def t32api(tmp_path_factory):
+    """用 capi/src 中的源码编译 t32api 动态库, 没有 C 编译器时跳过"""
+    compiler = shutil.which("gcc") or shutil.which("cc")
+    if compiler is None:
+        pytest.skip("没有 C 编译器")
+    library = tmp_path_factory.mktemp("t32api") / "t32api.so"
+    subprocess.run(
+        [compiler, "-shared", "-fPIC", "-O2", "-DENABLE_NOTIFICATION", "-o", str(library),
+         str(_CAPI / "hremote.c"), str(_CAPI / "hlinknet.c")],
+        check=True, capture_output=True,
+    )
+    return str(library)
+
+
+@pytest.fixture(params=["python", "dll"])
+def backend_sim(request):
+    T32.set_backend("python" if request.param == "python" else CDLL(request.getfixturevalue("t32api")))
+    with PowerViewSimulator() as simulator:
+        T32.config("NODE", simulator.host)
+        T32.config("PORT", str(simulator.port))
+        T32.init()
+        try:
+            yield simulator
+        finally:
+            T32.exit()
+            T32.set_backend("python")
+
+
+def test_read_write_registers(backend_sim):
+    backend_sim.registers.update(R0=1, R1=2, PC=0x8000)
+    assert T32.read_registers(["R0", "R1", "PC"]) == {"R0": 1, "R1": 2, "PC": 0x8000}
+
+    T32.write_registers({"R0": 0x11, "R1": 0x22})
+    assert backend_sim.registers["R0"] == 0x11
+    assert T32.read_registers(["R0", "R1"]) == {"R0": 0x11, "R1": 0x22}
+    assert backend_sim.stats["errors"] == 0
+
+
+def test_exit_with_live_register_set(backend_sim):
+    # 动态库的 T32_Exit 在寄存器集合未释放时会崩溃, T32.exit 必须先关闭全部集合
+    register_set = RegisterSet(["R0", "R1"])
+    assert list(register_set.read_array()) == [0, 0]
+    T32.exit()
+    assert register_set.closed
+    with pytest.raises(RuntimeError):
+        register_set.read_array()
+    T32.init()
+    assert T32.read_registers(["R0"]) == {"R0": 0}
@@ -0,0 +1,51 @@
+"""
+@文件: test_remote.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 纯 python 后端的对象表与通道管理
+@许可: MIT License
+@版本: Version 1.0
+"""
+import gc
+from ctypes import addressof, byref, c_void_p, create_string_buffer
+
+import pytest
+
+from trace32 import RemoteApi
+from trace32.errors import T32NotImplementedError
+
+
+def test_exit_releases_objects():
+    api = RemoteApi()
+    handle = c_void_p()
+    assert api.T32_RequestBreakpointObj(byref(handle)) == 0
+    assert api._objects
+    api.T32_Exit()
+    assert not api._objects
+
+    # 断开前的句柄不会指向之后申请的对象
+    stale = handle.value
+    api.T32_RequestBreakpointObj(byref(handle))
+    assert handle.value != stale
+
+
+def test_exit_drops_channels_of_collected_buffers():
+    api = RemoteApi()
+    kept = create_string_buffer(api.T32_GetChannelSize())
+    api.T32_GetChannelDefaults(kept)
+    for _ in range(10):
+        buffer = create_string_buffer(api.T32_GetChannelSize())
+        api.T32_GetChannelDefaults(buffer)
+        api.T32_SetChannel(buffer)
+        api.T32_Exit()
+    del buffer
+    gc.collect()
+    api.T32_Exit()
+    assert list(api._channels) == [api.T32_GetChannel0(), addressof(kept)]
+
+
+def test_unknown_function_raises_attribute_error():
+    api = RemoteApi()
+    assert api.T32_ExecuteLua() == T32NotImplementedError.code
+    with pytest.raises(AttributeError):
+        api.T32_NoSuchFunction
@@ -0,0 +1,66 @@
+"""
+@文件: test_session.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 多会话之间的通道与缓存隔离
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import PowerViewSimulator, T32, T32Session
+
+
+@pytest.fixture
+def sims():
+    T32.set_backend("python")
+    with PowerViewSimulator() as first, PowerViewSimulator() as second:
+        yield first, second
+
+
+def test_sessions_are_isolated(sims):
+    first, second = sims
+    with T32Session(first.host, first.port) as a, T32Session(second.host, second.port) as b:
+        a.write_memory(0x100, 0, b"A")
+        b.write_memory(0x100, 0, b"B")
+        assert first.memory.read(0x100, 1) == b"A"
+        assert second.memory.read(0x100, 1) == b"B"
+        assert a.read_memory(0x100, 0, 1) == b"A"
+        assert b.read_memory(0x100, 0, 1) == b"B"
+
+
+def test_session_caches_are_per_session(sims):
+    first, second = sims
+    first.registers["R0"], second.registers["R0"] = 1, 2
+    with T32Session(first.host, first.port) as a, T32Session(second.host, second.port) as b:
+        assert a.read_register_by_name("R0") == 1
+        assert b.read_register_by_name("R0") == 2
+        assert a.read_register_by_name("R0") == 1
+        assert a.registers is not b.registers
+
+
+def test_session_close_releases_register_sets(sims):
+    first, _ = sims
+    first.registers.update(R2=5, R3=6)
+    with T32Session(first.host, first.port) as session:
+        assert session.read_registers(["R2", "R3"]) == {"R2": 5, "R3": 6}
+    session.open()
+    try:
+        assert session.read_registers(["R2", "R3"]) == {"R2": 5, "R3": 6}
+    finally:
+        session.close()
+
+
+def test_default_connection_restored_after_session_call(sim):
+    sim.memory.write(0x200, b"D")
+    with PowerViewSimulator() as other:
+        other.memory.write(0x200, b"S")
+        with T32Session(other.host, other.port) as session:
+            assert session.read_memory(0x200, 0, 1) == b"S"
+            assert T32.read_memory(0x200, 0, 1) == b"D"
+            assert T32.register_cache() is not session.registers
+            rows = session.iter_window_rows("Register.view")
+            other.add_window("Register.view", "R0 0\nR1 1\n")
+            assert next(rows) == ["R0 0"]
+            assert T32.read_memory(0x200, 0, 1) == b"D"
+            rows.close()
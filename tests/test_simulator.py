@@ -0,0 +1,29 @@
+"""
+@文件: test_simulator.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 模拟服务器本身的健壮性
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import T32
+from trace32._remote import RAPI_CMD_PING
+from trace32.errors import T32NotImplementedError
+
+
+def test_handler_exception_replies_invalid(sim):
+    def broken(message):
+        raise IndexError("请求格式错误")
+
+    handler = sim.handlers[RAPI_CMD_PING, None]
+    sim.handlers[RAPI_CMD_PING, None] = broken
+    with pytest.raises(T32NotImplementedError):
+        T32.ping()
+    assert sim.stats["errors"] == 1
+    assert isinstance(sim.last_error, IndexError)
+
+    # 服务线程仍在运行, 之后的请求正常应答
+    sim.handlers[RAPI_CMD_PING, None] = handler
+    T32.ping()
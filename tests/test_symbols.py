@@ -0,0 +1,74 @@
+"""
+@文件: test_symbols.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 符号缓存与完整符号表测试
+@许可: MIT License
+@版本: Version 1.0
+"""
+from trace32 import T32
+
+
+def test_symbol_lookup_is_cached(sim):
+    sim.add_symbol("counter", 0x1000, 4)
+    cache = T32.symbol_cache()
+    hits, misses = cache.hits, cache.misses
+    assert T32.lookup_symbol("counter") == (0x1000, 4)
+    requests = sim.stats["requests"]
+    assert T32.lookup_symbol("counter") == (0x1000, 4)
+    assert sim.stats["requests"] == requests
+    assert (cache.hits - hits, cache.misses - misses) == (1, 1)
+
+
+def test_symbolize_uses_symbol_ranges(sim):
+    sim.add_symbol("buffer", 0x2000, 0x100)
+    assert T32.symbolize(0x2000) == ("buffer", 0)
+    requests = sim.stats["requests"]
+    # 落在已知符号范围内的地址不再查询调试器
+    assert T32.symbolize(0x2080) == ("buffer", 0x80)
+    assert sim.stats["requests"] == requests
+
+
+def test_reload_command_invalidates_symbols(sim):
+    sim.add_symbol("counter", 0x1000, 4)
+    cache = T32.symbol_cache()
+    T32.lookup_symbol("counter")
+    epoch = cache.epoch
+    T32.cmd("PRINT 1")
+    assert cache.epoch == epoch
+    sim.symbols["counter"] = (0x3000, 4)
+    T32.cmd("Data.LOAD.Elf app.elf")
+    assert cache.epoch == epoch + 1
+    assert T32.lookup_symbol("counter") == (0x3000, 4)
+
+
+def test_load_symbol_table_reuses_cache_file(sim, tmp_path):
+    elf = tmp_path / "app.elf"
+    elf.write_bytes(b"\x7fELF" + bytes(64))
+    sim.add_symbol("main", 0x1000, 0x40)
+    sim.add_symbol("counter", 0x2000, 4)
+    table = T32.load_symbol_table(str(elf), str(tmp_path))
+    assert len(table) == 2
+    assert len(list(tmp_path.glob("*.t32sym"))) == 1
+
+    # 第二次加载直接打开缓存文件, 不再读取窗口内容
+    requests = sim.stats["requests"]
+    cached = T32.load_symbol_table(str(elf), str(tmp_path))
+    assert sim.stats["requests"] == requests
+    assert T32.symbol_cache().table is cached
+    assert T32.lookup_symbol("counter") == (0x2000, 4)
+    assert T32.symbolize(0x1010) == ("main", 0x10)
+
+
+def test_replaced_symbol_table_is_closed(sim, tmp_path):
+    elf = tmp_path / "app.elf"
+    elf.write_bytes(b"\x7fELF" + bytes(64))
+    sim.add_symbol("main", 0x1000, 0x40)
+    T32.load_symbol_table(str(elf), str(tmp_path))
+    first = T32.load_symbol_table(str(elf), str(tmp_path))
+    assert first._mapping is not None
+    second = T32.load_symbol_table(str(elf), str(tmp_path))
+    assert first._mapping is None
+    T32.invalidate_symbols()
+    assert second._mapping is None
+    assert T32.symbol_cache().table is None
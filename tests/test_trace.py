@@ -0,0 +1,45 @@
+"""
+@文件: test_trace.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 跟踪与分析器记录的流式读取
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import T32, TraceField
+
+
+def test_analyzer_records_follow_trace_state(sim, tmp_path):
+    sim.add_trace((1, 0x1000 + 4 * i, i, 100 * i) for i in range(10))
+    state = T32.get_trace_state(0)
+    path = tmp_path / "records.bin"
+    fields = TraceField.ADDRESS | TraceField.DATA
+    records = list(T32.iter_analyzer_records(fields=fields, batch=4, file=str(path)))
+    assert [record.record for record in records] == list(range(state.min, state.max + 1))
+    assert records[0].address == 0x1000 and records[-1].data == 9
+    assert list(T32.iter_analyzer_file(str(path))) == records
+
+
+def test_read_trace_into_structured_array(sim):
+    np = pytest.importorskip("numpy")
+    sim.add_trace((1, 0x1000 + 4 * i, i, 100 * i) for i in range(10))
+    records = T32.read_trace(block=3)
+    assert records.dtype.names == ("cycle", "address", "data", "timestamp")
+    assert len(records) == 10
+    assert list(records["address"]) == [0x1000 + 4 * i for i in range(10)]
+    assert list(records["timestamp"]) == [100 * i for i in range(10)]
+
+    subset = T32.read_trace(start=-2, fields=TraceField.DATA)
+    assert subset.dtype.names == ("data",)
+    assert list(subset["data"]) == [7, 8, 9]
+
+
+def test_read_trace_to_npy_file(sim, tmp_path):
+    np = pytest.importorskip("numpy")
+    sim.add_trace((1, 0x2000 + i, i, i) for i in range(5))
+    path = tmp_path / "trace.npy"
+    records = T32.read_trace(fields=TraceField.ADDRESS, out=str(path))
+    assert isinstance(records, np.memmap)
+    assert list(np.load(path)["address"]) == [0x2000 + i for i in range(5)]
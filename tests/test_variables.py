@@ -0,0 +1,38 @@
+"""
+@文件: test_variables.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 按符号名批量读写变量
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import T32
+
+
+def test_variables_merge_within_bundle_limit(sim):
+    # 300 个相邻的 64 字节变量合并后超过单个区域的上限, 需要拆成多个区域
+    for i in range(300):
+        sim.add_symbol(f"g{i}", 0x20000 + 64 * i, 64, bytes([i & 0xFF]) * 64)
+    names = [f"g{i}" for i in range(300)]
+    values = T32.read_variables(names)
+    assert values["g299"] == bytes([299 & 0xFF]) * 64
+
+    T32.write_variables({name: b"\x5a" * 64 for name in names})
+    assert sim.memory.read(0x20000, 64 * 300) == b"\x5a" * 64 * 300
+
+
+def test_read_variables_scalars(sim):
+    sim.add_symbol("a", 0x100, 4, 0x12345678)
+    sim.add_symbol("b", 0x104, 2, 0xBEEF)
+    assert T32.read_variables(["a", "b"]) == {"a": 0x12345678, "b": 0xBEEF}
+
+
+def test_read_variables_as_record(sim):
+    pytest.importorskip("numpy")
+    sim.add_symbol("counter", 0x200, 4, 7)
+    sim.add_symbol("buffer", 0x210, 3, b"abc")
+    record = T32.read_variables(["counter", "buffer"], as_record=True)
+    assert record.counter == 7
+    assert bytes(record.buffer) == b"abc"
@@ -0,0 +1,51 @@
+"""
+@文件: test_wait.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 等待目标停止与 PRACTICE 脚本结束的退避轮询
+@许可: MIT License
+@版本: Version 1.0
+"""
+import threading
+
+from trace32 import NotificationDispatcher, T32
+
+
+def _later(delay: float, func) -> threading.Timer:
+    timer = threading.Timer(delay, func)
+    timer.start()
+    return timer
+
+
+def test_wait_for_halt_returns_when_target_stops(sim):
+    T32.go()
+    _later(0.05, lambda: setattr(sim, "state", 2))
+    result = T32.wait_for_halt(timeout=2.0)
+    assert result.state == 2 and not result.timed_out
+    assert result.elapsed >= 0.05
+
+
+def test_wait_backoff_limits_polling(sim):
+    T32.go()
+    requests = sim.stats["requests"]
+    result = T32.wait_for_halt(timeout=0.3, min_interval=0.001, max_interval=0.05)
+    assert result.timed_out and result.state == 3
+    # 间隔按 1.5 倍增长到 50 ms, 0.3 s 内只有十几次查询 (固定 1 ms 间隔时约为 300 次)
+    assert sim.stats["requests"] - requests < 25
+
+
+def test_wait_for_halt_woken_by_break_notification(sim):
+    T32.go()
+    with NotificationDispatcher(interval=0.01) as dispatcher:
+        _later(0.05, lambda: sim.trigger_break(0x1000))
+        result = T32.wait_for_halt(timeout=5.0, dispatcher=dispatcher, max_interval=2.0)
+    assert result.state == 2 and not result.timed_out
+    assert result.elapsed < 1.0
+
+
+def test_wait_for_practice_done(sim):
+    sim.practice_state = 1
+    _later(0.05, lambda: setattr(sim, "practice_state", 0))
+    result = T32.wait_for_practice_done(timeout=2.0)
+    assert result.state == 0 and not result.timed_out
+    assert T32.wait_for_practice_done(timeout=0.0).elapsed < 0.1
@@ -0,0 +1,29 @@
+"""
+@文件: test_window.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 窗口内容的分块读取
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import T32
+from trace32._window import iter_lines
+from trace32.errors import T32WindowContentError
+
+
+def test_window_content_in_chunks(sim):
+    sim.add_window("Register.view", "R0 0\nR1 1\n" * 100)
+    assert T32.get_window_content("Register.view", "asc", 64) == "R0 0\nR1 1\n" * 100
+    assert list(T32.iter_window_rows("Register.view", "asc", 64))[:2] == ["R0 0", "R1 1"]
+
+
+def test_window_content_error_names_command(sim):
+    with pytest.raises(T32WindowContentError, match="Unknown.view"):
+        T32.get_window_content("Unknown.view")
+
+
+def test_iter_lines_splits_on_newline_only():
+    chunks = ["a\x0cb\n", "c ", "d\r\n", "tail"]
+    assert list(iter_lines(chunks)) == ["a\x0cb\n", "c d\r\n", "tail"]
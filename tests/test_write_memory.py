@@ -0,0 +1,48 @@
+"""
+@文件: test_write_memory.py
+@作者: 雷小鸥
+@日期: 2026/10/17
+@描述: 基于缓冲区的批量写内存
+@许可: MIT License
+@版本: Version 1.0
+"""
+import pytest
+
+from trace32 import T32
+
+
+def test_write_buffer_in_chunks(sim):
+    data = bytes(range(256)) * 40
+    stats = T32.write_memory_buffer(0x10000, 0, data, chunk_size=4096)
+    assert stats.size == len(data)
+    assert stats.chunks == (len(data) + 4095) // 4096
+    assert sim.memory.read(0x10000, len(data)) == data
+
+
+def test_write_buffer_chunk_rounded_to_packet_size(sim):
+    stats = T32.write_memory_buffer(0x20000, 0, bytearray(5000), chunk_size=3000)
+    assert stats.chunks == 3
+
+
+def test_write_buffer_from_readonly_slice(sim):
+    data = memoryview(bytes(range(100)))[10:90]
+    T32.write_memory_buffer(0x30000, 0, data)
+    assert sim.memory.read(0x30000, 80) == bytes(range(10, 90))
+
+
+@pytest.mark.parametrize("value, expected", [
+    (0x1234, b"\x12\x34"),
+    (0, b"\x00"),
+    (-1, b"\xff"),
+    (-128, b"\x80"),
+    (-129, b"\xff\x7f"),
+    (-32768, b"\x80\x00"),
+])
+def test_write_int_minimal_size(sim, value, expected):
+    T32.write_memory(0x40000, 0, value)
+    assert sim.memory.read(0x40000, len(expected)) == expected
+
+
+def test_write_int_explicit_size_and_order(sim):
+    T32.write_memory(0x40000, 0, -2, size=4, byteorder="little")
+    assert sim.memory.read(0x40000, 4) == b"\xfe\xff\xff\xff"